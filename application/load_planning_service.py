@@ -0,0 +1,107 @@
+# application/load_planning_service.py
+
+from contextlib import nullcontext
+
+from logistica.domain.load_plan import LoadPlan
+
+class LoadPlanningService:
+    """
+    Servicio de aplicación que planifica y aplica la carga de los envíos en espera de un centro.
+
+    Responsabilidades:
+    - Reunir los envíos en espera de un centro y las rutas activas que salen de él
+    - Calcular un plan de carga por carril, prioridad y capacidad (`LoadPlan`)
+    - Aplicar el plan completo en una única unidad de trabajo
+
+    Sustituye a llamar a `RouteService.assign_shipment_to_route` envío a envío: el plan
+    se calcula de una vez para todo el centro y se persiste con una escritura en bloque.
+    """
+
+    def __init__(self, route_repo, shipment_repo, center_repo, unit_of_work=None):
+        """
+        Inicializa el servicio con los repositorios necesarios.
+
+        Args:
+            route_repo: Instancia del repositorio de rutas.
+            shipment_repo: Instancia del repositorio de envíos.
+            center_repo: Instancia del repositorio de centros logísticos.
+            unit_of_work (UnitOfWork, opcional): Agrupa la aplicación del plan en una sola
+                transacción. Sin ella, cada repositorio confirma por su cuenta.
+        """
+        self._route_repo = route_repo
+        self._shipment_repo = shipment_repo
+        self._center_repo = center_repo
+        self._unit_of_work = unit_of_work if unit_of_work is not None else nullcontext()
+
+
+    def plan_center(self, center_id, capacity, capacities=None):
+        """
+        Calcula el plan de carga de los envíos que esperan en un centro.
+
+        Args:
+            center_id (str): ID del centro de origen.
+            capacity (int): Capacidad de cada ruta (envíos en el manifiesto, incluidos los ya cargados).
+            capacities (dict, opcional): route_id -> capacidad, para las rutas con una capacidad distinta.
+
+        Returns:
+            LoadPlan: Plan sin aplicar; no modifica rutas ni envíos.
+
+        Raises:
+            ValueError: Si el ID está vacío, `capacity` no es positiva o alguna capacidad es negativa.
+            EntityNotFoundError: Si el centro no existe.
+        """
+        if not center_id.strip():
+            raise ValueError("El ID del centro no puede estar vacío.")
+        if capacity < 1:
+            raise ValueError("La capacidad de las rutas debe ser positiva.")
+        overrides = {route_id.strip().upper(): limit for route_id, limit in (capacities or {}).items()}
+        if any(limit < 0 for limit in overrides.values()):
+            raise ValueError("La capacidad de una ruta no puede ser negativa.")
+
+        center = self._center_repo.get_by_center_id(center_id)
+        routes = [route for route in self._route_repo.list_by_origin(center.center_id) if route.is_active]
+        route_capacities = {route.route_id: overrides.get(route.route_id, capacity) for route in routes}
+        return LoadPlan.pack(center, routes, route_capacities)
+
+
+    def apply_plan(self, plan):
+        """
+        Carga en sus rutas los envíos del plan y lo persiste en una única unidad de trabajo.
+
+        Antes de modificar nada se comprueba que el plan sigue siendo válido: si una ruta
+        ya no está activa o no le quedan plazas, o un envío ya no espera en el centro (se
+        despachó, se asignó a otra ruta...), no se aplica ninguna carga.
+
+        Args:
+            plan (LoadPlan): Plan calculado con `plan_center`.
+
+        Returns:
+            dict: route_id -> códigos de seguimiento cargados.
+
+        Raises:
+            ValueError: Si el plan ha quedado desfasado.
+        """
+        loads = plan.loads()
+        for route, shipments in loads:
+            if not route.is_active:
+                raise ValueError(f"El plan de carga ya no es válido: la ruta '{route.route_id}' no está activa.")
+            if len(route.shipments_view()) + len(shipments) > plan.capacity(route.route_id):
+                raise ValueError(f"El plan de carga ya no es válido: la ruta '{route.route_id}' no tiene plazas suficientes.")
+            origin_center = route.origin_center
+            for shipment in shipments:
+                if (shipment.is_assigned_to_route() or shipment.is_delivered()
+                        or not origin_center.has_shipment(shipment.tracking_code)):
+                    raise ValueError(f"El plan de carga ya no es válido: el envío '{shipment.tracking_code}' "
+                                     f"ya no espera en el centro '{plan.center_id}'.")
+
+        for route, shipments in loads:
+            for shipment in shipments:
+                route.load_waiting_shipment(shipment)
+
+        # El inventario del centro no cambia: se guardan las rutas y todos los envíos en bloque
+        with self._unit_of_work:
+            for route, _shipments in loads:
+                self._route_repo.update(route)
+            self._shipment_repo.update_many([shipment for _route, shipments in loads for shipment in shipments])
+
+        return plan.assignments()
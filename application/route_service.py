@@ -1,5 +1,7 @@
 # application/route_service.py
 
+from contextlib import nullcontext
+
 from logistica.domain.route import Route
 
 class RouteService:
@@ -15,10 +17,11 @@ class RouteService:
     Complejidad: Este es el servicio más complejo porque:
     1. Coordina tres repositorios diferentes
     2. Maneja relaciones bidireccionales
-    3. Implementa operaciones transaccionales sin mecanismo explícito
+    3. Implementa operaciones que escriben en varios repositorios; cada una se
+       persiste dentro de una única unidad de trabajo (un solo commit)
     """
 
-    def __init__(self, route_repo, shipment_repo, center_repo):
+    def __init__(self, route_repo, shipment_repo, center_repo, unit_of_work=None, routing_service=None):
         """
         Inicializa el servicio con los repositorios necesarios.
 
@@ -35,10 +38,16 @@ class RouteService:
             route_repo: Instancia del repositorio de rutas.
             shipment_repo: Instancia del repositorio de envíos.
             center_repo: Instancia del repositorio de centros logísticos.
+            unit_of_work (UnitOfWork, opcional): Agrupa las escrituras de cada caso de uso
+                en una sola transacción. Sin ella, cada repositorio confirma por su cuenta.
+            routing_service (RoutingService, opcional): Red de caminos entre centros que se
+                actualiza al crear y completar rutas.
         """
         self._route_repo = route_repo
         self._shipment_repo = shipment_repo
         self._center_repo = center_repo
+        self._unit_of_work = unit_of_work if unit_of_work is not None else nullcontext()
+        self._routing_service = routing_service
 
 
     def create_route(self, route_id, origin_center_id, destination_center_id):
@@ -83,6 +92,10 @@ class RouteService:
         # Persistir: guardar en repositorio
         self._route_repo.add(route)
 
+        # La red de caminos solo se actualiza con rutas ya persistidas
+        if self._routing_service is not None:
+            self._routing_service.route_created(route)
+
 
     def list_routes(self):
         """
@@ -142,9 +155,9 @@ class RouteService:
         - RN-015: Solo rutas activas aceptan envíos
         - Existencia de envío y ruta (validación de aplicación)
 
-        Operación transaccional implícita:
-        Actualiza dos entidades (Route y Shipment) que deben mantenerse consistentes.
-        En un sistema con BD, esto requeriría transacción explícita.
+        Operación transaccional:
+        Actualiza tres entidades (Route, Shipment y el centro origen) que deben mantenerse
+        consistentes; las tres escrituras se confirman juntas en la unidad de trabajo.
 
         Args:
             tracking_code (str): Código de seguimiento del envío.
@@ -179,10 +192,138 @@ class RouteService:
         # ya llama a shipment.assign_route() internamente)
         shipment.assign_route(route_id)
 
-        # Persistir cambios en entidades usando update
-        self._route_repo.update(route)
-        self._shipment_repo.update(shipment)
-        self._center_repo.update(route.origin_center)
+        # Persistir cambios en entidades usando update (un único commit)
+        with self._unit_of_work:
+            self._route_repo.update(route)
+            self._shipment_repo.update(shipment)
+            self._center_repo.update(route.origin_center)
+
+
+    def assign_shipments_to_route(self, route_id, tracking_codes):
+        """
+        Asigna en bloque varios envíos a una ruta de transporte.
+
+        Caso de uso: UC-11 en lote (Asignar Envíos a Ruta)
+
+        Mismas reglas que `assign_shipment_to_route` (RN-015 y RN-016), pero la ruta y su
+        centro de origen se cargan una sola vez, los envíos se leen en bloque (`get_many`) y
+        todos los cambios se persisten en una única unidad de trabajo: una escritura de la
+        ruta, una del centro y una en bloque (`update_many`) de los envíos. Un código incorrecto no detiene la asignación: su
+        error queda en el informe y se continúa con el siguiente.
+
+        Args:
+            route_id (str): ID de la ruta a la que se asignan los envíos.
+            tracking_codes (Iterable[str]): Códigos de seguimiento de los envíos.
+
+        Returns:
+            List[Tuple]: Una tupla (código normalizado, error) por código y en el mismo orden;
+            error es None si el envío se asignó o el mensaje del error en caso contrario.
+
+        Raises:
+            ValueError: Si el ID de la ruta está vacío o la ruta no está activa.
+            EntityNotFoundError: Si la ruta no existe.
+        """
+        if not route_id.strip():
+            raise ValueError("El ID de la ruta no puede estar vacío.")
+
+        route = self._route_repo.get_by_route_id(route_id)
+
+        # Regla de negocio RN-015: solo rutas activas aceptan envíos
+        if not route.is_active:
+            raise ValueError(f"La ruta '{route_id}' no está activa.")
+
+        origin_center = route.origin_center
+        # Cada código se normaliza una sola vez (los envíos guardan el código en mayúsculas) y se usa
+        # así en la lectura, en el inventario del centro y en el informe
+        tracking_codes = [tracking_code.strip().upper() for tracking_code in tracking_codes]
+        # Todos los envíos en una sola lectura en bloque; un código repetido reutiliza el mismo objeto
+        shipments = {shipment.tracking_code: shipment
+                     for shipment in self._shipment_repo.get_many(
+                         [tracking_code for tracking_code in tracking_codes if tracking_code], ignore_missing=True)}
+        report = []
+        assigned = []
+
+        for tracking_code in tracking_codes:
+            if not tracking_code:
+                report.append((tracking_code, "El código de seguimiento del envío no puede estar vacío."))
+                continue
+
+            shipment = shipments.get(tracking_code)
+            if shipment is None:
+                report.append((tracking_code, f"No existe un envío con código '{tracking_code}'."))
+                continue
+
+            # Regla de negocio RN-016: un envío solo puede estar en una ruta a la vez
+            if shipment.is_assigned_to_route():
+                report.append((tracking_code, f"El envío '{tracking_code}' ya está asignado a una ruta."))
+                continue
+            # Se comprueba antes de modificar nada: add_shipment lo recibe en el centro de origen
+            if origin_center.has_shipment(tracking_code):
+                report.append((tracking_code, "El envío ya se encuentra en el centro."))
+                continue
+
+            route.add_shipment(shipment)
+            assigned.append(shipment)
+            report.append((tracking_code, None))
+
+        if assigned:
+            with self._unit_of_work:
+                self._route_repo.update(route)
+                self._shipment_repo.update_many(assigned)
+                self._center_repo.update(origin_center)
+
+        return report
+
+
+    def fill_route_from_queue(self, route_id, max_shipments, shipment_type=None):
+        """
+        Carga en una ruta los siguientes envíos de la cola de despacho de su centro de origen.
+
+        Los envíos se eligen en orden de salida (express primero, después por prioridad y
+        por orden de llegada al centro) sin que el operador tenga que revisar el inventario.
+
+        Args:
+            route_id (str): ID de la ruta a llenar.
+            max_shipments (int): Número máximo de envíos a cargar.
+            shipment_type (str, opcional): Carga solo envíos de este tipo (STANDARD, FRAGILE, EXPRESS).
+
+        Returns:
+            List[str]: Códigos de seguimiento cargados, en orden de salida.
+
+        Raises:
+            ValueError: Si el ID está vacío, la ruta no está activa, `max_shipments` no es positivo
+                o alguno de los envíos elegidos no puede cargarse; en ese caso no se carga
+                ninguno y la cola de despacho queda intacta.
+        """
+        if not route_id.strip():
+            raise ValueError("El ID de la ruta no puede estar vacío.")
+        if max_shipments < 1:
+            raise ValueError("El número de envíos a cargar debe ser positivo.")
+
+        route = self._route_repo.get_by_route_id(route_id)
+
+        # Regla de negocio RN-015: solo rutas activas aceptan envíos
+        if not route.is_active:
+            raise ValueError(f"La ruta '{route_id}' no está activa.")
+
+        # Se eligen sin sacarlos de la cola y se validan todos antes de cargar ninguno:
+        # si uno falla, la cola y la ruta quedan como estaban
+        shipments = route.origin_center.dispatch_queue.next_shipments(max_shipments, shipment_type)
+        if not shipments:
+            return []
+        for shipment in shipments:
+            route.can_load_waiting_shipment(shipment)
+
+        # Al recibir su ruta, cada envío sale de la cola de despacho del centro
+        for shipment in shipments:
+            route.load_waiting_shipment(shipment)
+
+        # El inventario del centro no cambia: solo se guardan la ruta y los envíos asignados
+        with self._unit_of_work:
+            self._route_repo.update(route)
+            self._shipment_repo.update_many(shipments)
+
+        return [shipment.tracking_code for shipment in shipments]
 
 
     def remove_shipment_from_route(self, tracking_code, route_id):
@@ -219,9 +360,10 @@ class RouteService:
         # Operación bidireccional: actualizar ambos lados
         route.remove_shipment(shipment)  # ya llama a shipment.remove_route() internamente
 
-        self._route_repo.update(route)
-        self._shipment_repo.update(shipment)
-        self._center_repo.update(route.origin_center)
+        with self._unit_of_work:
+            self._route_repo.update(route)
+            self._shipment_repo.update(shipment)
+            self._center_repo.update(route.origin_center)
 
 
     def dispatch_route(self, route_id):
@@ -256,8 +398,8 @@ class RouteService:
 
         # Validar que no esté ya despachada (todos los envíos en IN_TRANSIT)
         # Esto es una optimización, no una regla de negocio estricta
-        tracking_codes = route.list_shipments()
-        shipments = [self._shipment_repo.get_by_tracking_code(code) for code in tracking_codes]
+        # Vista de solo lectura del manifiesto: se recorre sin copiarlo y sus envíos se leen en bloque
+        shipments = self._shipment_repo.get_many(route.shipments_view())
         
         # Validar negocio en dominio
         route.dispatch(shipments)
@@ -275,10 +417,97 @@ class RouteService:
             # 3. Remueve del inventario del centro
             origin_center.dispatch_shipment(shipment)
         
-        # Guardar en repositorio actualizando inventario del origen y cambios en cada envío
-        self._center_repo.update(origin_center)
-        for shipment in shipments:
-            self._shipment_repo.update(shipment)
+        # Guardar en repositorio actualizando inventario del origen y los envíos en bloque
+        # (update_many), todo en una única transacción
+        with self._unit_of_work:
+            self._center_repo.update(origin_center)
+            self._shipment_repo.update_many(shipments)
+
+
+    def dispatch_wave(self, center_id=None, route_ids=None):
+        """
+        Despacha en una sola operación (una "oleada") varias rutas activas.
+
+        Caso de uso: UC-14 en lote (Despachar Oleada)
+
+        Se indica un centro, para despachar todas las rutas activas que salen de él, o un
+        conjunto de rutas concretas. Cada centro de origen se carga una sola vez y todos los
+        envíos de todas las rutas se leen en bloque (`get_many`); al final se guardan los
+        centros (una escritura por centro) y todos los envíos (una escritura en bloque con
+        `update_many`) en una única unidad de trabajo.
+
+        Una ruta que no se puede despachar (ya despachada, sin envíos o con algún envío que
+        no está en el centro de origen) no detiene la oleada: se deja sin tocar y su error
+        queda en el informe.
+
+        Args:
+            center_id (str, opcional): ID del centro cuyas rutas activas se despachan.
+            route_ids (Iterable[str], opcional): IDs de las rutas a despachar.
+
+        Returns:
+            List[Tuple]: Una tupla (route_id, error) por ruta; error es None si la ruta se
+            despachó o el mensaje del error en caso contrario.
+
+        Raises:
+            ValueError: Si no se indica exactamente uno de `center_id` y `route_ids` o un ID está vacío.
+            EntityNotFoundError: Si el centro o alguna de las rutas no existe (no se despacha ninguna).
+        """
+        if (center_id is None) == (route_ids is None):
+            raise ValueError("Indica un centro o un conjunto de rutas, no ambos.")
+
+        if center_id is not None:
+            if not center_id.strip():
+                raise ValueError("El ID del centro no puede estar vacío.")
+            center = self._center_repo.get_by_center_id(center_id)
+            centers = {center.center_id: center}
+            routes = [route for route in self._route_repo.list_by_origin(center.center_id) if route.is_active]
+        else:
+            route_ids = [route_id.strip() for route_id in route_ids]
+            if not all(route_ids):
+                raise ValueError("El ID de la ruta no puede estar vacío.")
+            routes = [self._route_repo.get_by_route_id(route_id) for route_id in dict.fromkeys(route_ids)]
+            # Cada centro de origen una sola vez, aunque salgan de él varias rutas
+            centers = {origin_id: self._center_repo.get_by_center_id(origin_id)
+                       for origin_id in dict.fromkeys(route.origin_center.center_id
+                                                      for route in routes if route.is_active)}
+
+        # Los envíos de todas las rutas en una sola lectura en bloque
+        shipments = {shipment.tracking_code: shipment for shipment in self._shipment_repo.get_many(
+            [code for route in routes if route.is_active for code in route.shipments_view()])}
+
+        report = []
+        dispatched = []
+        for route in routes:
+            try:
+                if not route.is_active:
+                    raise ValueError(f"La ruta '{route.route_id}' ya ha sido completada y no se puede despachar.")
+                route_shipments = [shipments[code] for code in route.shipments_view()]
+                origin_center = centers[route.origin_center.center_id]
+                if not route_shipments:
+                    raise ValueError(f"La ruta '{route.route_id}' no tiene envíos que despachar.")
+                route.dispatch(route_shipments)
+                # Se comprueba antes de despachar ninguno para no dejar la ruta a medias
+                for shipment in route_shipments:
+                    if not origin_center.has_shipment(shipment.tracking_code):
+                        raise ValueError(f"El envío '{shipment.tracking_code}' no se encuentra en el centro "
+                                         f"'{origin_center.center_id}'.")
+            except ValueError as e:
+                report.append((route.route_id, str(e)))
+                continue
+
+            for shipment in route_shipments:
+                origin_center.dispatch_shipment(shipment)
+            dispatched.extend(route_shipments)
+            report.append((route.route_id, None))
+
+        # Cada centro y todas las transiciones a IN_TRANSIT, en una única transacción
+        if dispatched:
+            with self._unit_of_work:
+                for center in centers.values():
+                    self._center_repo.update(center)
+                self._shipment_repo.update_many(dispatched)
+
+        return report
 
 
     def complete_route(self, route_id):
@@ -317,15 +546,18 @@ class RouteService:
         # 2. Transferencia de envíos a centro destino
         # 3. Actualización de estados a DELIVERED
         # 4. Cambio de estado de la ruta a inactiva
-        tracking_codes = route.list_shipments()
-        shipments = [self._shipment_repo.get_by_tracking_code(code) for code in tracking_codes]
+        # Vista de solo lectura del manifiesto: se recorre sin copiarlo y sus envíos se leen en bloque
+        shipments = self._shipment_repo.get_many(route.shipments_view())
         route.complete_route(shipments)
 
-        # Persistir cambios usando update()
-        self._route_repo.update(route)
-        for shipment in shipments:
-            self._shipment_repo.update(shipment)
-        self._center_repo.update(route.destination_center)
+        # Persistir cambios, los envíos en bloque con update_many(), todo en una única transacción
+        with self._unit_of_work:
+            self._route_repo.update(route)
+            self._shipment_repo.update_many(shipments)
+            self._center_repo.update(route.destination_center)
+
+        if self._routing_service is not None:
+            self._routing_service.route_completed(route)
 
 
     def list_shipments_in_route(self, route_id):
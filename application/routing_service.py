@@ -0,0 +1,92 @@
+# application/routing_service.py
+
+from logistica.domain.route_network import RouteNetwork
+
+class RoutingService:
+    """
+    Servicio de aplicación que calcula caminos de varios saltos entre centros logísticos.
+
+    Responsabilidades:
+    - Construir la red de centros (`RouteNetwork`) a partir de las rutas activas del repositorio
+    - Responder consultas de camino mínimo entre dos centros sin ruta directa
+    - Mantener la red al día cuando `RouteService` crea o completa rutas
+
+    La red se construye con una sola llamada a `list_all()` en la primera consulta y a
+    partir de ahí se actualiza de forma incremental con `route_created` y `route_completed`,
+    sin volver a leer el repositorio.
+    """
+
+    def __init__(self, route_repo, weight=None):
+        """
+        Inicializa el servicio con el repositorio de rutas.
+
+        Args:
+            route_repo: Instancia del repositorio de rutas.
+            weight (callable, opcional): Coste de recorrer una ruta (`weight(route) -> float`).
+                Por defecto se buscan los caminos con menos saltos.
+        """
+        self._route_repo = route_repo
+        self._weight = weight
+        self._network = None
+
+
+    def find_path(self, origin_center_id, destination_center_id):
+        """
+        Busca el camino de menor coste entre dos centros encadenando rutas activas.
+
+        Args:
+            origin_center_id (str): ID del centro de origen.
+            destination_center_id (str): ID del centro de destino.
+
+        Returns:
+            List[str]: IDs de las rutas a recorrer, en orden.
+
+        Raises:
+            ValueError: Si algún ID está vacío, origen y destino coinciden o no hay camino.
+        """
+        origin_center_id = origin_center_id.strip().upper()
+        destination_center_id = destination_center_id.strip().upper()
+        if not origin_center_id or not destination_center_id:
+            raise ValueError("El ID del centro no puede estar vacío.")
+        if origin_center_id == destination_center_id:
+            raise ValueError("El centro de origen y el de destino deben ser distintos.")
+
+        path = self._get_network().shortest_path(origin_center_id, destination_center_id)
+        if path is None:
+            raise ValueError(f"No hay ningún camino de '{origin_center_id}' a '{destination_center_id}'.")
+        route_ids, _cost = path
+        return route_ids
+
+
+    def path_cost(self, origin_center_id, destination_center_id):
+        """
+        Devuelve el coste del camino mínimo entre dos centros, o None si no hay camino.
+
+        Con el coste por defecto es el número de rutas (saltos) del camino.
+        """
+        path = self._get_network().shortest_path(origin_center_id.strip().upper(),
+                                                  destination_center_id.strip().upper())
+        return None if path is None else path[1]
+
+
+    def route_created(self, route):
+        """Incorpora a la red una ruta recién creada (solo si la red ya está construida)."""
+        if self._network is not None and route.is_active:
+            self._network.add_route(route)
+
+
+    def route_completed(self, route):
+        """Retira de la red una ruta completada: deja de estar disponible para nuevos caminos."""
+        if self._network is not None and self._network.has_route(route.route_id):
+            self._network.remove_route(route.route_id)
+
+
+    def _get_network(self):
+        """Construye la red con las rutas activas la primera vez que se necesita."""
+        if self._network is None:
+            network = RouteNetwork(self._weight)
+            for route in self._route_repo.list_all():
+                if route.is_active:
+                    network.add_route(route)
+            self._network = network
+        return self._network
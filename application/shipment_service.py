@@ -1,6 +1,7 @@
 # application/services.py
 
 from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_types import SHIPMENT_TYPES
 from logistica.domain.shipment_repository import ShipmentRepository
 
 class ShipmentService:
@@ -14,7 +15,7 @@ class ShipmentService:
     - Actuar como punto único de entrada para operaciones de envío
     """
 
-    def __init__(self, repo):
+    def __init__(self, repo, center_repo=None):
         """
         Inicializa el servicio con el repositorio de envíos.
 
@@ -27,11 +28,18 @@ class ShipmentService:
 
         Args:
             repo (ShipmentRepository): Instancia del repositorio de envíos que implementa ShipmentRepository.
+            center_repo (CenterRepository, opcional): Repositorio de centros. Si se indica, tras
+                cambiar la prioridad o el estado de un envío que está en un centro se avisa a ese
+                centro (`Center.refresh_shipment`) para que corrija sus contadores y su cola de
+                despacho. Solo se avisa a los centros ya cargados (`get_if_loaded`): nunca se
+                carga un inventario entero para corregir una entrada, y los centros que se
+                carguen después ya leen los envíos actualizados.
         """
         # Almacenar referencia al repositorio para todas las operaciones
         # Nota: No se valida tipo en tiempo de ejecución por simplicidad,
         # pero en producción se podría usar isinstance(repo, ShipmentRepository)
         self._repo = repo
+        self._center_repo = center_repo
 
 
     def register_shipment(self, tracking_code, sender, recipient, priority=1, shipment_type="standard"):
@@ -76,6 +84,47 @@ class ShipmentService:
         self._repo.add(shipment)
 
 
+    def register_shipments(self, specs):
+        """
+        Registra en bloque los envíos descritos en `specs` (p. ej. un manifiesto de transportista).
+
+        Caso de uso: UC-01 en lote (Registrar Envíos Masivamente)
+
+        Cada especificación se valida con la fábrica de su tipo en el registro de tipos
+        (`SHIPMENT_TYPES.create_many`, mismas reglas que `register_shipment`) y los
+        envíos válidos se persisten de una sola vez con
+        `add_many`. Una fila incorrecta o repetida no detiene la carga: su error
+        queda en el informe y se continúa con la siguiente.
+
+        Args:
+            specs (Iterable): Especificaciones de envío, cada una como diccionario con las
+                claves de `register_shipment` (tracking_code, sender, recipient y, opcionalmente,
+                priority y shipment_type) o como tupla en ese mismo orden.
+
+        Returns:
+            List[Tuple]: Una tupla (código, error) por especificación y en el mismo orden;
+            error es None si el envío se registró o el mensaje del error en caso contrario.
+        """
+        report = []
+        shipments = []
+        positions = []  # Posición en el informe de cada envío válido
+
+        for tracking_code, shipment, error in SHIPMENT_TYPES.create_many(specs):
+            if shipment is None:
+                report.append((tracking_code, error))
+                continue
+            positions.append(len(report))
+            report.append((tracking_code, None))
+            shipments.append(shipment)
+
+        # Persistir todos los envíos válidos de una vez; el repositorio indica los rechazados
+        rejected = self._repo.add_many(shipments)
+        for index, error in rejected.items():
+            position = positions[index]
+            report[position] = (report[position][0], str(error))
+        return report
+
+
     def update_shipment_status(self, tracking_code, new_status):
         """
         Actualiza el estado logístico de un envío específico.
@@ -109,6 +158,7 @@ class ShipmentService:
 
         # Persistir cambios (el envío ya fue modificado)
         self._repo.update(shipment)
+        self._refresh_center(shipment)
 
 
     def increase_shipment_priority(self, tracking_code):
@@ -139,6 +189,7 @@ class ShipmentService:
         shipment.increase_priority()
 
         self._repo.update(shipment)
+        self._refresh_center(shipment)
 
 
     def decrease_shipment_priority(self, tracking_code):
@@ -166,6 +217,15 @@ class ShipmentService:
         shipment.decrease_priority()
 
         self._repo.update(shipment)
+        self._refresh_center(shipment)
+
+    def _refresh_center(self, shipment):
+        """Avisa del cambio al centro que tiene el envío en su inventario, si ese centro ya está cargado."""
+        if self._center_repo is None or shipment.current_center_id is None:
+            return
+        center = self._center_repo.get_if_loaded(shipment.current_center_id)
+        if center is not None:
+            center.refresh_shipment(shipment)
 
 
     def list_shipments(self):
@@ -200,6 +260,30 @@ class ShipmentService:
         result.sort(key=lambda item: item[0].lower())
         return result
 
+    def find_shipments(self, query):
+        """
+        Obtiene una página de envíos filtrada y ordenada por el propio repositorio.
+
+        A diferencia de `list_shipments`, no carga ni ordena todos los envíos: el repositorio
+        resuelve filtros, orden y límite en su almacenamiento (índices en memoria, WHERE /
+        ORDER BY / LIMIT en SQLite), así que el coste depende del tamaño de la página.
+
+        Args:
+            query (ShipmentQuery): Filtros, orden, cursor y límite.
+
+        Returns:
+            Tuple[List[Tuple], Any]: Las filas (código, estado, prioridad, tipo, ruta) de la
+            página y el cursor para pedir la siguiente (`query.next_page(cursor)`), o None si
+            no hay más páginas.
+        """
+        shipments = self._repo.find(query)
+        rows = [(shipment.tracking_code, shipment.current_status, shipment.priority,
+                 shipment.shipment_type, shipment.assigned_route) for shipment in shipments]
+
+        # Una página incompleta es la última; una completa puede serlo también (la siguiente llegará vacía)
+        cursor = query.cursor_of(shipments[-1]) if len(shipments) == query.limit else None
+        return rows, cursor
+
     def get_shipment(self, tracking_code):
         """
         Recupera un envío específico del repositorio para su consulta o manipulación.
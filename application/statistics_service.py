@@ -0,0 +1,116 @@
+# application/statistics_service.py
+
+from collections import Counter
+
+
+class StatisticsService:
+    """
+    Servicio de aplicación con los recuentos de envíos para cuadros de mando.
+
+    Responsabilidades:
+    - Contar envíos por estado, tipo, prioridad, ruta y centro
+    - Cruzar campos (p. ej. envíos IN_TRANSIT por tipo) sin cargar ningún envío
+    - Ofrecer una instantánea barata de todos los recuentos (`snapshot`)
+
+    Los recuentos no se calculan recorriendo `list_all()`: los repositorios los mantienen
+    al escribir (recuentos en memoria actualizados en cada `add`/`update`/`remove`, tabla
+    `shipment_counts` mantenida por triggers en SQLite), así que cualquier escritura, pase o
+    no por un servicio, queda contada. El coste de una consulta depende del número de
+    combinaciones distintas de valores, no del número de envíos.
+    """
+
+    def __init__(self, shipment_repo, center_repo):
+        """
+        Inicializa el servicio con los repositorios necesarios.
+
+        Args:
+            shipment_repo: Repositorio de envíos (recuentos por estado, tipo, prioridad y ruta).
+            center_repo: Repositorio de centros (envíos en el inventario de cada centro).
+        """
+        self._shipment_repo = shipment_repo
+        self._center_repo = center_repo
+
+
+    def count_by(self, *fields):
+        """
+        Cuenta los envíos agrupados por uno o varios campos.
+
+        Ejemplo: `count_by("status", "type")[("IN_TRANSIT", "FRAGILE")]` es el número de
+        envíos frágiles en tránsito.
+
+        Args:
+            *fields (str): Campos de agrupación: "status", "type", "priority" o "route".
+
+        Returns:
+            dict: Valor -> número de envíos con un campo, o tupla de valores -> número de envíos
+            con varios. Solo incluye grupos con envíos.
+
+        Raises:
+            ValueError: Si no se indica ningún campo o alguno no es válido.
+        """
+        return self._shipment_repo.count_by(*fields)
+
+    def counts_by_status(self):
+        """Estado -> número de envíos."""
+        return self._shipment_repo.count_by("status")
+
+    def counts_by_type(self, status=None):
+        """
+        Tipo de envío -> número de envíos.
+
+        Args:
+            status (str, opcional): Contar solo los envíos en este estado.
+        """
+        if status is None:
+            return self._shipment_repo.count_by("type")
+        status = status.strip().upper()
+        return {shipment_type: total
+                for (current_status, shipment_type), total in self._shipment_repo.count_by("status", "type").items()
+                if current_status == status}
+
+    def counts_by_priority(self):
+        """Prioridad -> número de envíos."""
+        return self._shipment_repo.count_by("priority")
+
+    def counts_by_route(self):
+        """Ruta asignada -> número de envíos; la clave None agrupa los envíos sin ruta."""
+        return self._shipment_repo.count_by("route")
+
+    def counts_by_center(self):
+        """Centro -> número de envíos en su inventario (0 en los centros vacíos)."""
+        return self._center_repo.shipment_counts()
+
+    def snapshot(self):
+        """
+        Devuelve todos los recuentos de una vez, pensada para cuadros de mando que consultan cada segundo.
+
+        Son dos lecturas en total: los recuentos de envíos por combinación de estado, tipo,
+        prioridad y ruta (que se agregan aquí por cada campo) y los de los centros.
+
+        Returns:
+            dict: Con las claves:
+                - "total": número de envíos
+                - "by_status", "by_type", "by_priority", "by_route", "by_center": recuentos por campo
+                - "by_status_and_type": estado -> {tipo -> número de envíos}
+        """
+        groups = self._shipment_repo.count_by("status", "type", "priority", "route")
+
+        by_status, by_type, by_priority, by_route = Counter(), Counter(), Counter(), Counter()
+        by_status_and_type = {}
+        for (status, shipment_type, priority, route), total in groups.items():
+            by_status[status] += total
+            by_type[shipment_type] += total
+            by_priority[priority] += total
+            by_route[route] += total
+            types = by_status_and_type.setdefault(status, {})
+            types[shipment_type] = types.get(shipment_type, 0) + total
+
+        return {
+            "total": sum(by_status.values()),
+            "by_status": dict(by_status),
+            "by_type": dict(by_type),
+            "by_priority": dict(by_priority),
+            "by_route": dict(by_route),
+            "by_center": self._center_repo.shipment_counts(),
+            "by_status_and_type": by_status_and_type,
+        }
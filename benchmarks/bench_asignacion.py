@@ -0,0 +1,79 @@
+# benchmarks/bench_asignacion.py
+"""
+Benchmark: asignación de N envíos a una ruta sobre SQLite.
+
+Compara la asignación envío a envío con `RouteService.assign_shipment_to_route` (la
+opción 12 del menú antes del cambio: cada llamada recarga la ruta, su centro y el envío
+y escribe en tres repositorios) con `assign_shipments_to_route`, que carga la ruta una
+vez y persiste todo en una única transacción. Cada variante asigna N envíos a su propia ruta.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_asignacion [num_envios]
+"""
+
+import sys
+
+from logistica.application.route_service import RouteService
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.identity_map import IdentityMap
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
+from logistica.infrastructure.sqlite_route import RouteRepositorySQLite
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.infrastructure.sqlite_unit_of_work import UnitOfWorkSQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+RUTA_UNO_A_UNO = "MAD01-BCN02-STD-001"
+RUTA_EN_BLOQUE = "MAD01-BCN02-STD-002"
+
+
+def preparar(db_path, manager, num_envios):
+    """Crea los centros, las dos rutas y 2 * N envíos registrados sin ruta."""
+    centers = CenterRepositorySQLite(db_path, manager)
+    routes = RouteRepositorySQLite(db_path, manager)
+    shipments = ShipmentRepositorySQLite(db_path, manager)
+    origen = Center("MAD01", "Madrid", "Calle A")
+    destino = Center("BCN02", "Barcelona", "Calle B")
+    centers.add(origen)
+    centers.add(destino)
+    routes.add(Route(RUTA_UNO_A_UNO, origen, destino))
+    routes.add(Route(RUTA_EN_BLOQUE, origen, destino))
+    shipments.add_many([Shipment(codigo_envio(i), "Remitente", "Destinatario") for i in range(2 * num_envios)])
+
+
+def servicio(db_path, manager):
+    """Un servicio por petición, como el menú: mapa de identidad y unidad de trabajo propios."""
+    identity_map = IdentityMap()
+    return RouteService(RouteRepositorySQLite(db_path, manager, identity_map),
+                        ShipmentRepositorySQLite(db_path, manager, identity_map),
+                        CenterRepositorySQLite(db_path, manager, identity_map),
+                        UnitOfWorkSQLite(manager, identity_map))
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    codigos = [codigo_envio(i) for i in range(2 * num_envios)]
+
+    with base_de_datos_temporal() as db_path:
+        manager = SQLiteConnectionManager(db_path)
+        preparar(db_path, manager, num_envios)
+
+        service = servicio(db_path, manager)
+        commits = manager.commits
+        with cronometro(f"assign_shipment_to_route envío a envío ({num_envios} envíos)"):
+            for codigo in codigos[:num_envios]:
+                service.assign_shipment_to_route(codigo, RUTA_UNO_A_UNO)
+        print(f"Commits: {manager.commits - commits}")
+
+        service = servicio(db_path, manager)
+        commits = manager.commits
+        with cronometro(f"assign_shipments_to_route en bloque ({num_envios} envíos)"):
+            report = service.assign_shipments_to_route(RUTA_EN_BLOQUE, codigos[num_envios:])
+        print(f"Commits: {manager.commits - commits}; errores: {sum(error is not None for _c, error in report)}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_columnar.py
+"""
+Benchmark: ShipmentRepositoryMemory frente a ShipmentRepositoryColumnar con N envíos.
+
+Mide con tracemalloc los bytes por envío que ocupa cada repositorio una vez cargado
+(los envíos de entrada se crean fuera de la medición y se descartan) y el tiempo de
+contar los envíos por estado y por tipo: un recorrido de objetos en Python en el
+repositorio actual y `bytearray.count` sobre una columna en el columnar.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_columnar [num_envios]
+"""
+
+import gc
+import sys
+import tracemalloc
+from collections import Counter
+
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.columnar_shipment import ShipmentRepositoryColumnar
+from logistica.benchmarks.comun import codigo_envio, cronometro
+
+
+def envios_de_prueba(num_envios):
+    """Genera envíos estándar y frágiles, con remitentes repetidos y un tercio en tránsito."""
+    envios = []
+    for i in range(num_envios):
+        if i % 4 == 0:
+            envio = FragileShipment(codigo_envio(i), f"Tienda {i % 50}", f"Cliente {i % 5000}", 2)
+        else:
+            envio = Shipment(codigo_envio(i), f"Tienda {i % 50}", f"Cliente {i % 5000}", 1 + i % 3)
+        if i % 3 == 0:
+            envio.update_status("IN_TRANSIT")
+        envios.append(envio)
+    return envios
+
+
+def cargar(clase, num_envios):
+    """Devuelve el repositorio cargado y los bytes por envío que retiene."""
+    gc.collect()
+    tracemalloc.start()
+    envios = envios_de_prueba(num_envios)
+    repo = clase()
+    repo.add_many(envios)
+    # Solo queda lo que retiene el repositorio: los objetos en el actual, las columnas en el columnar
+    del envios
+    gc.collect()
+    memoria, _pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return repo, memoria / num_envios
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    memoria_repo, bytes_memoria = cargar(ShipmentRepositoryMemory, num_envios)
+    columnar_repo, bytes_columnar = cargar(ShipmentRepositoryColumnar, num_envios)
+    print(f"ShipmentRepositoryMemory: {bytes_memoria:.0f} B/envío")
+    print(f"ShipmentRepositoryColumnar: {bytes_columnar:.0f} B/envío ({bytes_memoria / bytes_columnar:.1f} veces menos)")
+
+    with cronometro("recuento por estado y tipo (objetos)"):
+        envios = memoria_repo.list_all()
+        por_estado = Counter(envio.current_status for envio in envios)
+        por_tipo = Counter(envio.shipment_type for envio in envios)
+    with cronometro("recuento por estado y tipo (columnas)"):
+        por_estado_col = columnar_repo.count_by_status()
+        por_tipo_col = columnar_repo.count_by_type()
+    assert por_estado == por_estado_col and por_tipo == por_tipo_col
+
+    with cronometro(f"get_by_tracking_code x{num_envios // 10} (columnar)"):
+        for i in range(0, num_envios, 10):
+            columnar_repo.get_by_tracking_code(codigo_envio(i))
+
+
+if __name__ == "__main__":
+    main()
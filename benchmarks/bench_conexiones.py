@@ -0,0 +1,65 @@
+# benchmarks/bench_conexiones.py
+"""
+Benchmark: conexiones abiertas por llamada de servicio, antes y después del gestor compartido.
+
+"Antes" se reproduce con un gestor que abre una conexión nueva en cada operación
+de repositorio (el comportamiento original); "después" usa un único
+SQLiteConnectionManager compartido por los tres repositorios.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_conexiones [num_envios]
+"""
+
+import sys
+
+from logistica.application.route_service import RouteService
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.center_service import CenterService
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
+from logistica.infrastructure.sqlite_route import RouteRepositorySQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+
+class ConexionPorOperacion(SQLiteConnectionManager):
+    """Reproduce el comportamiento original: una conexión nueva por cada operación."""
+
+    def connection(self):
+        return self._open()
+
+
+def medir(manager_cls, num_envios):
+    with base_de_datos_temporal() as db_path:
+        manager = manager_cls(db_path)
+        shipments = ShipmentRepositorySQLite(db_path, manager)
+        centers = CenterRepositorySQLite(db_path, manager)
+        routes = RouteRepositorySQLite(db_path, manager)
+
+        CenterService(centers, shipments).register_center("MAD01", "Madrid", "Calle A")
+        CenterService(centers, shipments).register_center("BCN02", "Barcelona", "Calle B")
+        route_service = RouteService(routes, shipments, centers)
+        route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        shipment_service = ShipmentService(shipments)
+        for i in range(num_envios):
+            shipment_service.register_shipment(codigo_envio(i), "Remitente", "Destinatario")
+            route_service.assign_shipment_to_route(codigo_envio(i), "MAD01-BCN02-STD-001")
+
+        antes = manager.connections_opened
+        with cronometro(f"  dispatch_route ({manager_cls.__name__})"):
+            route_service.dispatch_route("MAD01-BCN02-STD-001")
+        aperturas = manager.connections_opened - antes
+        manager.close()
+        return aperturas
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"Ruta con {num_envios} envíos")
+    antes = medir(ConexionPorOperacion, num_envios)
+    despues = medir(SQLiteConnectionManager, num_envios)
+    print(f"Conexiones abiertas por dispatch_route — antes: {antes}, después: {despues}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_consultas.py
+"""
+Benchmark: una página de envíos filtrada por estado con volumen creciente.
+
+Compara `list_shipments` filtrado y recortado en Python (carga todos los envíos y los
+ordena) con `find_shipments`, que resuelve filtro, orden y límite en el repositorio:
+índices secundarios en memoria y WHERE / ORDER BY / LIMIT sobre índices en SQLite. Se
+pide la primera página y una página intermedia (por cursor) de los envíos en tránsito,
+que son uno de cada cuatro.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_consultas [num_envios_max]
+"""
+
+import sys
+
+from logistica.application.shipment_service import ShipmentService
+from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_query import ShipmentQuery
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+TAMANO_PAGINA = 50
+
+
+def envios(num_envios):
+    """Genera los envíos; uno de cada cuatro está en tránsito."""
+    for i in range(num_envios):
+        shipment = Shipment(codigo_envio(i), "Remitente", "Destinatario", 1 + i % 3)
+        if i % 4 == 0:
+            shipment.update_status("IN_TRANSIT")
+        yield shipment
+
+
+def medir(etiqueta, service, num_envios):
+    """Primera página y una página a mitad del listado, con cada variante."""
+    with cronometro(f"{etiqueta} list_shipments + filtro ({num_envios} envíos)"):
+        filas = [fila for fila in service.list_shipments() if fila[1] == "IN_TRANSIT"][:TAMANO_PAGINA]
+
+    query = ShipmentQuery(status="IN_TRANSIT", limit=TAMANO_PAGINA)
+    with cronometro(f"{etiqueta} find_shipments primera página ({num_envios} envíos)"):
+        pagina, _cursor = service.find_shipments(query)
+    assert pagina == filas
+
+    mitad = query.next_page(codigo_envio(num_envios // 2))
+    with cronometro(f"{etiqueta} find_shipments página intermedia ({num_envios} envíos)"):
+        service.find_shipments(mitad)
+
+
+def main():
+    num_envios_max = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    num_envios = 10000
+    while num_envios <= num_envios_max:
+        memoria = ShipmentRepositoryMemory()
+        memoria.add_many(envios(num_envios))
+        medir("Memoria:", ShipmentService(memoria), num_envios)
+
+        with base_de_datos_temporal() as db_path:
+            manager = SQLiteConnectionManager(db_path)
+            repo = ShipmentRepositorySQLite(db_path, manager)
+            repo.add_many(envios(num_envios))
+            medir("SQLite: ", ShipmentService(repo), num_envios)
+            manager.close()
+        num_envios *= 4
+
+
+if __name__ == "__main__":
+    main()
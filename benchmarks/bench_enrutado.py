@@ -0,0 +1,108 @@
+# benchmarks/bench_enrutado.py
+"""
+Benchmark: caminos de varios saltos sobre una red de N centros con 4 rutas de salida cada uno.
+
+Compara calcular cada camino desde cero (Dijkstra completo por consulta) con la caché de
+árboles de `RouteNetwork`, y mide crear y completar rutas entre consultas con la caché
+actualizada de forma incremental frente a vaciarla en cada cambio.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_enrutado [num_centros]
+"""
+
+import random
+import sys
+
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+from logistica.domain.route_network import RouteNetwork
+from logistica.benchmarks.comun import cronometro
+
+RUTAS_POR_CENTRO = 4
+CONSULTAS = 2000
+ORIGENES = 50
+CAMBIOS = 500
+
+
+def codigo_centro(i):
+    """Genera un ID de centro válido (4 letras + 2 dígitos) a partir de un entero."""
+    letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return f"{letras[i // 2600 % 26]}{letras[i // 100 % 26]}XX{i % 100:02d}"
+
+
+def ruta(origen, destino, numero):
+    return Route.from_record(f"{origen.center_id}-{destino.center_id}-STD-{numero:03d}", origen, destino, True)
+
+
+def red_de_prueba(num_centros, rng):
+    """Genera centros y `RUTAS_POR_CENTRO` rutas de salida aleatorias por centro."""
+    centros = [Center.from_record(codigo_centro(i), f"Centro {i}", "Calle") for i in range(num_centros)]
+    rutas = []
+    for i, origen in enumerate(centros):
+        destinos = [j for j in rng.sample(range(num_centros), RUTAS_POR_CENTRO + 1) if j != i]
+        for numero, j in enumerate(destinos[:RUTAS_POR_CENTRO]):
+            rutas.append(ruta(origen, centros[j], numero))
+    return centros, rutas
+
+
+def construir(rutas, max_cached_origins=1024):
+    red = RouteNetwork(max_cached_origins=max_cached_origins)
+    for r in rutas:
+        red.add_route(r)
+    return red
+
+
+def cambios_y_consultas(red, cambios, consultas, vaciar_cache):
+    """Alterna una ruta creada o completada con una consulta; devuelve los costes obtenidos."""
+    costes = []
+    for (accion, r), (origen, destino) in zip(cambios, consultas):
+        if accion == "crear":
+            red.add_route(r)
+        else:
+            red.remove_route(r.route_id)
+        if vaciar_cache:
+            red._trees.clear()
+        camino = red.shortest_path(origen, destino)
+        costes.append(None if camino is None else camino[1])
+    return costes
+
+
+def main():
+    num_centros = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(42)
+    centros, rutas = red_de_prueba(num_centros, rng)
+    ids = [centro.center_id for centro in centros]
+    # Las consultas se concentran en un conjunto reducido de orígenes (los centros con más salidas)
+    origenes = rng.sample(ids, ORIGENES)
+    consultas = [(rng.choice(origenes), rng.choice(ids)) for _ in range(CONSULTAS)]
+    print(f"{num_centros} centros, {len(rutas)} rutas, {CONSULTAS} consultas desde {ORIGENES} orígenes")
+
+    sin_cache = construir(rutas, max_cached_origins=0)
+    with cronometro("consultas sin caché (Dijkstra completo por consulta)"):
+        esperados = [sin_cache.shortest_path(origen, destino) for origen, destino in consultas]
+    red = construir(rutas)
+    with cronometro("consultas con caché de árboles"):
+        obtenidos = [red.shortest_path(origen, destino) for origen, destino in consultas]
+    assert [c[1] if c else None for c in esperados] == [c[1] if c else None for c in obtenidos]
+
+    cambios = []
+    for numero in range(CAMBIOS):
+        if numero % 2 == 0:
+            origen, destino = rng.sample(centros, 2)
+            cambios.append(("crear", ruta(origen, destino, 500 + numero)))
+        else:
+            cambios.append(("completar", rutas[rng.randrange(len(rutas))]))
+    # Cada ruta se completa una sola vez
+    vistos = set()
+    cambios = [c for c in cambios if c[1].route_id not in vistos and not vistos.add(c[1].route_id)]
+
+    vaciando = construir(rutas)
+    with cronometro(f"{len(cambios)} cambios + consulta (vaciando la caché)"):
+        esperados = cambios_y_consultas(vaciando, cambios, consultas, vaciar_cache=True)
+    with cronometro(f"{len(cambios)} cambios + consulta (caché incremental)"):
+        obtenidos = cambios_y_consultas(red, cambios, consultas, vaciar_cache=False)
+    assert esperados == obtenidos
+
+
+if __name__ == "__main__":
+    main()
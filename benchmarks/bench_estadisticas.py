@@ -0,0 +1,76 @@
+# benchmarks/bench_estadisticas.py
+"""
+Benchmark: recuentos de envíos para un cuadro de mando.
+
+Compara contar los envíos en tránsito por tipo a partir de `list_shipments()` (carga y
+ordena todos los envíos) y un `GROUP BY` sobre la tabla `shipments` con
+`StatisticsService.snapshot()`, que lee los recuentos que mantienen los repositorios al
+escribir: en memoria y en SQLite (tabla `shipment_counts` y sus triggers).
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_estadisticas [num_envios]
+"""
+
+import sys
+from collections import Counter
+
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.statistics_service import StatisticsService
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+
+def envios(num_envios):
+    """Genera los envíos: uno de cada tres frágil y uno de cada cuatro en tránsito."""
+    for i in range(num_envios):
+        if i % 3 == 0:
+            shipment = FragileShipment(codigo_envio(i), "Remitente", "Destinatario", 2 + i % 2)
+        else:
+            shipment = Shipment(codigo_envio(i), "Remitente", "Destinatario", 1 + i % 3)
+        if i % 4 == 0:
+            shipment.update_status("IN_TRANSIT")
+        yield shipment
+
+
+def medir(etiqueta, shipment_repo, center_repo, num_envios):
+    """Recuento por listado completo frente a la instantánea del servicio."""
+    with cronometro(f"{etiqueta} list_shipments + Counter ({num_envios} envíos)"):
+        por_listado = Counter(tipo for _codigo, estado, _p, tipo, _ruta in ShipmentService(shipment_repo).list_shipments()
+                              if estado == "IN_TRANSIT")
+
+    service = StatisticsService(shipment_repo, center_repo)
+    with cronometro(f"{etiqueta} snapshot x 100 ({num_envios} envíos)"):
+        for _ in range(100):
+            snapshot = service.snapshot()
+    assert snapshot["by_status_and_type"]["IN_TRANSIT"] == dict(por_listado)
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    memoria = ShipmentRepositoryMemory()
+    memoria.add_many(envios(num_envios))
+    medir("Memoria:", memoria, CenterRepositoryMemory(), num_envios)
+
+    with base_de_datos_temporal() as db_path:
+        manager = SQLiteConnectionManager(db_path)
+        repo = ShipmentRepositorySQLite(db_path, manager)
+        with cronometro(f"SQLite:  add_many con triggers de recuento ({num_envios} envíos)"):
+            repo.add_many(envios(num_envios))
+        medir("SQLite: ", repo, CenterRepositorySQLite(db_path, manager), num_envios)
+
+        conn = manager.connection()
+        with cronometro(f"SQLite:  GROUP BY sobre shipments ({num_envios} envíos)"):
+            conn.execute("SELECT current_status, shipment_type, priority, assigned_route_id, COUNT(*) "
+                         "FROM shipments GROUP BY 1, 2, 3, 4").fetchall()
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
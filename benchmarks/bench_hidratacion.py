@@ -0,0 +1,71 @@
+# benchmarks/bench_hidratacion.py
+"""
+Benchmark: reconstrucción de N envíos a partir de filas ya almacenadas.
+
+Compara la hidratación anterior (constructor completo, con la expresión regular del
+código y el resto de validaciones, y después sobrescritura del estado y del historial)
+con la vía rápida `Shipment.from_record`, que confía en los datos del almacenamiento.
+Solo mide la construcción de objetos, sin SQLite, para aislar el coste del dominio.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_hidratacion [num_envios]
+"""
+
+import sys
+
+from logistica.domain.shipment import Shipment, intern_status
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+from logistica.benchmarks.comun import codigo_envio, cronometro
+
+_CLASES = {"STANDARD": Shipment, "FRAGILE": FragileShipment, "EXPRESS": ExpressShipment}
+_TIPOS = ("STANDARD", "FRAGILE", "EXPRESS")
+
+
+def filas_de_prueba(num_envios):
+    """Genera filas con la forma de la tabla shipments y su historial."""
+    filas = []
+    for i in range(num_envios):
+        tipo = _TIPOS[i % 3]
+        prioridad = 3 if tipo == "EXPRESS" else (2 if tipo == "FRAGILE" else 1 + i % 3)
+        filas.append((codigo_envio(i), "Remitente", "Destinatario", prioridad, "IN_TRANSIT", tipo, None,
+                      ["REGISTERED", "IN_TRANSIT"]))
+    return filas
+
+
+def hidratar_con_constructor(fila):
+    """Réplica de la hidratación anterior: constructor validado y sobrescritura del estado."""
+    tc, sender, recipient, priority, status, stype, route_id, history = fila
+    if stype == "FRAGILE":
+        shipment = FragileShipment(tc, sender, recipient, priority)
+    elif stype == "EXPRESS":
+        shipment = ExpressShipment(tc, sender, recipient)
+    else:
+        shipment = Shipment(tc, sender, recipient, priority)
+    shipment._current_status = intern_status(status)
+    shipment._status_history = tuple(map(intern_status, history))
+    shipment._assigned_route = route_id
+    return shipment
+
+
+def hidratar_con_from_record(fila):
+    """Hidratación actual de ShipmentRepositorySQLite."""
+    tc, sender, recipient, priority, status, stype, route_id, history = fila
+    return _CLASES.get(stype, Shipment).from_record(tc, sender, recipient, priority, status, history, route_id)
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    filas = filas_de_prueba(num_envios)
+
+    with cronometro(f"constructor + sobrescritura x{num_envios}"):
+        for fila in filas:
+            hidratar_con_constructor(fila)
+
+    with cronometro(f"from_record x{num_envios}"):
+        for fila in filas:
+            hidratar_con_from_record(fila)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_indices.py
+"""
+Benchmark: búsquedas calientes antes y después de la migración de índices.
+
+Crea una base de datos con N envíos (por defecto un millón) en la versión 1 del
+esquema (sin índices secundarios), mide las búsquedas por ruta, por centro y por
+historial, aplica las migraciones pendientes y repite la medición.
+
+Para cada consulta muestra el plan (SCAN = recorrido completo de la tabla,
+SEARCH = acceso por índice), el número de pasos de la máquina virtual de SQLite
+(contados con `set_progress_handler`, en bloques de 1000 instrucciones) y el tiempo.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_indices [num_envios]
+"""
+
+import sqlite3
+import sys
+import time
+
+from logistica.infrastructure.migrations import migrate
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio
+
+CONSULTAS = [
+    ("envíos de una ruta", "SELECT tracking_code FROM shipments WHERE assigned_route_id = ?", ("MAD01-BCN02-STD-007",)),
+    ("envíos de un centro", "SELECT tracking_code FROM shipments WHERE current_center_id = ?", ("BCN02",)),
+    ("historial de un envío", "SELECT status FROM shipment_status_history WHERE tracking_code = ? ORDER BY id", (codigo_envio(12345),)),
+]
+
+NUM_RUTAS = 100
+
+
+def poblar(conn, num_envios):
+    with conn:
+        conn.executemany("INSERT INTO centers VALUES (?, ?, ?)", [("MAD01", "Madrid", "A"), ("BCN02", "Barcelona", "B")])
+        conn.executemany(
+            "INSERT INTO routes VALUES (?, 'MAD01', 'BCN02', 1)",
+            ((f"MAD01-BCN02-STD-{i:03d}",) for i in range(NUM_RUTAS))
+        )
+        # Casi todos los envíos ya entregados en MAD01; unos pocos en BCN02 y en cada ruta
+        conn.executemany(
+            "INSERT INTO shipments VALUES (?, 'Remitente', 'Destinatario', 1, 'REGISTERED', 'STANDARD', ?, ?)",
+            ((codigo_envio(i),
+              f"MAD01-BCN02-STD-{(i // 1000) % NUM_RUTAS:03d}" if i % 1000 == 0 else None,
+              "BCN02" if i % 500 == 0 else "MAD01")
+             for i in range(num_envios))
+        )
+        conn.executemany(
+            "INSERT INTO shipment_status_history (tracking_code, status) VALUES (?, 'REGISTERED')",
+            ((codigo_envio(i),) for i in range(num_envios))
+        )
+
+
+def medir(conn, etiqueta):
+    print(f"\n== {etiqueta} ==")
+    for nombre, sql, params in CONSULTAS:
+        plan = "; ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+        pasos = [0]
+
+        def contar():
+            pasos[0] += 1
+            return 0
+
+        conn.set_progress_handler(contar, 1000)
+        inicio = time.perf_counter()
+        filas = len(conn.execute(sql, params).fetchall())
+        duracion = time.perf_counter() - inicio
+        conn.set_progress_handler(None, 0)
+        print(f"{nombre:<24} filas={filas:<6} pasos_vm≈{pasos[0] * 1000:<10} {duracion * 1000:8.2f} ms  [{plan}]")
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with base_de_datos_temporal(version=1) as db_path:
+        conn = sqlite3.connect(db_path)
+        print(f"Poblando {num_envios} envíos...")
+        poblar(conn, num_envios)
+        medir(conn, "Esquema v1 (sin índices)")
+        aplicadas = migrate(conn)
+        medir(conn, f"Tras migraciones {aplicadas}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# benchmarks/bench_inventario.py
+"""
+Benchmark: recepción, consulta y despacho de N envíos en un mismo centro.
+
+Con el inventario indexado por código cada operación es O(1), así que el tiempo
+total crece de forma lineal con N (antes, con una lista y búsquedas lineales,
+despachar todo el centro era cuadrático).
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_inventario [num_envios]
+"""
+
+import sys
+
+from logistica.domain.center import Center
+from logistica.domain.shipment import Shipment
+from logistica.benchmarks.comun import codigo_envio, cronometro
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    shipments = [Shipment(codigo_envio(i), "Remitente", "Destinatario", 1 + i % 3) for i in range(num_envios)]
+    center = Center("MAD16", "Madrid Centro", "Calle inventada 16")
+
+    with cronometro(f"receive_shipment x{num_envios}"):
+        for shipment in shipments:
+            center.receive_shipment(shipment)
+
+    with cronometro(f"has_shipment x{num_envios}"):
+        for shipment in shipments:
+            center.has_shipment(shipment.tracking_code)
+
+    with cronometro("count_by_type + count_by_priority"):
+        por_tipo = center.count_by_type()
+        por_prioridad = center.count_by_priority()
+    print(f"Ocupación: {center.shipment_count}; por tipo: {por_tipo}; por prioridad: {por_prioridad}")
+
+    with cronometro(f"dispatch_shipment x{num_envios}"):
+        for shipment in shipments:
+            center.dispatch_shipment(shipment)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/bench_lectura_masiva.py
+"""
+Benchmark: lectura de los N envíos del manifiesto de una ruta sobre SQLite.
+
+Compara la lista por comprensión con `get_by_tracking_code` que usaban `dispatch_route` y
+`complete_route` (dos consultas por envío: fila e historial) con `get_many`, que resuelve
+todos los códigos con consultas `IN (...)` por bloques. Ambas variantes parten de un
+repositorio sin mapa de identidad, como la primera lectura de una petición.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_lectura_masiva [num_envios]
+"""
+
+import sys
+
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # El manifiesto es una parte de la tabla: la ruta lleva uno de cada diez envíos
+    codigos = [codigo_envio(i) for i in range(0, 10 * num_envios, 10)]
+
+    with base_de_datos_temporal() as db_path:
+        manager = SQLiteConnectionManager(db_path)
+        repo = ShipmentRepositorySQLite(db_path, manager)
+        repo.add_many(Shipment(codigo_envio(i), "Remitente", "Destinatario") for i in range(10 * num_envios))
+
+        with cronometro(f"get_by_tracking_code por código ({num_envios} envíos)"):
+            uno_a_uno = [repo.get_by_tracking_code(codigo) for codigo in codigos]
+        with cronometro(f"get_many ({num_envios} envíos)"):
+            en_bloque = repo.get_many(codigos)
+        assert [e.tracking_code for e in en_bloque] == [e.tracking_code for e in uno_a_uno]
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_listado.py
+"""
+Benchmark: tiempo de ShipmentRepositorySQLite.list_all con N envíos.
+
+Inserta los envíos directamente con executemany (sin pasar por el repositorio)
+y mide el listado completo y el número de sentencias ejecutadas.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_listado [num_envios]
+"""
+
+import sqlite3
+import sys
+
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+TIPOS = ("STANDARD", "FRAGILE", "EXPRESS")
+
+
+def poblar(db_path, num_envios):
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO shipments (tracking_code, sender, recipient, priority, current_status, shipment_type, assigned_route_id, current_center_id) "
+            "VALUES (?, 'Remitente', 'Destinatario', ?, 'REGISTERED', ?, NULL, NULL)",
+            ((codigo_envio(i), 3 if i % 3 == 2 else 2, TIPOS[i % 3]) for i in range(num_envios))
+        )
+        conn.executemany(
+            "INSERT INTO shipment_status_history (tracking_code, status) VALUES (?, 'REGISTERED')",
+            ((codigo_envio(i),) for i in range(num_envios))
+        )
+    conn.close()
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with base_de_datos_temporal() as db_path:
+        poblar(db_path, num_envios)
+        manager = SQLiteConnectionManager(db_path)
+        repo = ShipmentRepositorySQLite(db_path, manager)
+
+        statements = []
+        manager.connection().set_trace_callback(statements.append)
+        with cronometro(f"list_all ({num_envios} envíos)"):
+            shipments = repo.list_all()
+        manager.connection().set_trace_callback(None)
+
+        print(f"Envíos reconstruidos: {len(shipments)}; sentencias SQL: {len(statements)}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/bench_manifiesto.py
+"""
+Benchmark: edición del manifiesto de una ruta de consolidación con N envíos.
+
+Asigna N envíos a una ruta, recorre el manifiesto con `shipments_view()` y con
+`list_shipments()` (copia) y retira todos los envíos uno a uno. Con el manifiesto
+como conjunto ordenado, añadir, retirar y comprobar un código son O(1).
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_manifiesto [num_envios]
+"""
+
+import sys
+
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+from logistica.domain.shipment import Shipment
+from logistica.benchmarks.comun import codigo_envio, cronometro
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    shipments = [Shipment(codigo_envio(i), "Remitente", "Destinatario", 1) for i in range(num_envios)]
+    origin = Center("MAD16", "Madrid Centro", "Calle inventada 16")
+    destination = Center("BCN03", "Barcelona Centro", "Carrer inventat 03")
+    route = Route("MAD16-BCN03-STD-001", origin, destination)
+
+    with cronometro(f"add_shipment x{num_envios}"):
+        for shipment in shipments:
+            route.add_shipment(shipment)
+
+    with cronometro("recorrer shipments_view() x100"):
+        for _ in range(100):
+            for _code in route.shipments_view():
+                pass
+
+    with cronometro("recorrer list_shipments() x100"):
+        for _ in range(100):
+            for _code in route.list_shipments():
+                pass
+
+    with cronometro(f"remove_shipment x{num_envios}"):
+        for shipment in shipments:
+            route.remove_shipment(shipment)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_memoria.py
+"""
+Benchmark: memoria por envío con N envíos en ShipmentRepositoryMemory.
+
+Compara la representación actual (`__slots__`, estados compartidos e historial en
+tupla) con una réplica de la anterior (`__dict__` por instancia, historial en una
+lista propia y una cadena de estado nueva en cada transición). Mide con tracemalloc los bytes asignados
+por envío, repositorio incluido, recién registrados y tras una transición de estado.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_memoria [num_envios]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.benchmarks.comun import codigo_envio
+
+
+class EnvioAnterior:
+    """Réplica de la disposición en memoria de Shipment antes de usar __slots__."""
+
+    def __init__(self, tracking_code, sender, recipient, priority=1):
+        self.__tracking_code = tracking_code
+        self.__sender = sender
+        self.__recipient = recipient
+        self._current_status = "REGISTERED"
+        self._status_history = [self._current_status]
+        self._priority = priority
+        self._assigned_route = None
+
+    @property
+    def tracking_code(self):
+        return self.__tracking_code
+
+    def update_status(self, new_status):
+        # upper() crea una cadena nueva por envío, como hacía Shipment.update_status
+        self._current_status = new_status.upper()
+        self._status_history.append(self._current_status)
+
+
+def medir(clase, num_envios, con_transicion):
+    """Devuelve los bytes por envío asignados al crear y guardar `num_envios` envíos."""
+    codigos = [codigo_envio(i) for i in range(num_envios)]
+    gc.collect()
+    tracemalloc.start()
+    repo = ShipmentRepositoryMemory()
+    for codigo in codigos:
+        envio = clase(codigo, "Remitente", "Destinatario", 1)
+        if con_transicion:
+            envio.update_status("in_transit")
+        repo._by_tracking_code[codigo.lower()] = envio
+    memoria, _pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del repo
+    return memoria / num_envios
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"{'':28} {'anterior':>10} {'actual':>10}")
+    for etiqueta, con_transicion in (("recién registrados", False), ("tras una transición", True)):
+        antes = medir(EnvioAnterior, num_envios, con_transicion)
+        despues = medir(Shipment, num_envios, con_transicion)
+        print(f"{etiqueta + ' (B/envío)':28} {antes:10.0f} {despues:10.0f}  ({(1 - despues / antes) * 100:.0f}% menos)")
+
+
+if __name__ == "__main__":
+    main()
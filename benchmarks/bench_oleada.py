@@ -0,0 +1,82 @@
+# benchmarks/bench_oleada.py
+"""
+Benchmark: despacho de todas las rutas que salen de un centro sobre SQLite.
+
+Compara el cambio de turno con `RouteService.dispatch_route` llamado ruta a ruta (cada
+llamada recarga y reescribe el mismo centro de origen y guarda sus envíos uno a uno) con
+`dispatch_wave`, que carga el centro una vez y lo guarda, junto con todos los envíos,
+en una única transacción. Cada variante despacha su propio centro con R rutas de N envíos.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_oleada [num_rutas] [envios_por_ruta]
+"""
+
+import sys
+
+from logistica.application.route_service import RouteService
+from logistica.domain.center import Center
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.identity_map import IdentityMap
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
+from logistica.infrastructure.sqlite_route import RouteRepositorySQLite
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.infrastructure.sqlite_unit_of_work import UnitOfWorkSQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+
+def servicio(db_path, manager):
+    """Un servicio por petición, como el menú: mapa de identidad y unidad de trabajo propios."""
+    identity_map = IdentityMap()
+    return RouteService(RouteRepositorySQLite(db_path, manager, identity_map),
+                        ShipmentRepositorySQLite(db_path, manager, identity_map),
+                        CenterRepositorySQLite(db_path, manager, identity_map),
+                        UnitOfWorkSQLite(manager, identity_map))
+
+
+def preparar(db_path, manager, num_rutas, envios_por_ruta):
+    """Crea dos centros de origen (uno por variante) con sus rutas ya cargadas hacia BCN02."""
+    centers = CenterRepositorySQLite(db_path, manager)
+    shipments = ShipmentRepositorySQLite(db_path, manager)
+    for center_id, name in (("MAD01", "Madrid"), ("VAL03", "Valencia"), ("BCN02", "Barcelona")):
+        centers.add(Center(center_id, name, "Calle A"))
+    shipments.add_many(Shipment(codigo_envio(i), "Remitente", "Destinatario")
+                       for i in range(2 * num_rutas * envios_por_ruta))
+
+    service = servicio(db_path, manager)
+    siguiente = 0
+    rutas = {}
+    for origen in ("MAD01", "VAL03"):
+        rutas[origen] = []
+        for n in range(num_rutas):
+            route_id = f"{origen}-BCN02-STD-{n:03d}"
+            service.create_route(route_id, origen, "BCN02")
+            service.assign_shipments_to_route(route_id, [codigo_envio(i) for i in range(siguiente, siguiente + envios_por_ruta)])
+            siguiente += envios_por_ruta
+            rutas[origen].append(route_id)
+    return rutas
+
+
+def main():
+    num_rutas = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    envios_por_ruta = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+
+    with base_de_datos_temporal() as db_path:
+        manager = SQLiteConnectionManager(db_path)
+        rutas = preparar(db_path, manager, num_rutas, envios_por_ruta)
+
+        commits = manager.commits
+        with cronometro(f"dispatch_route ruta a ruta ({num_rutas} rutas x {envios_por_ruta} envíos)"):
+            for route_id in rutas["MAD01"]:
+                servicio(db_path, manager).dispatch_route(route_id)
+        print(f"Commits: {manager.commits - commits}")
+
+        commits = manager.commits
+        with cronometro(f"dispatch_wave ({num_rutas} rutas x {envios_por_ruta} envíos)"):
+            report = servicio(db_path, manager).dispatch_wave(center_id="VAL03")
+        print(f"Commits: {manager.commits - commits}; rutas con error: {sum(error is not None for _r, error in report)}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_planificacion.py
+"""
+Benchmark: plan de carga de un centro con N envíos en espera sobre SQLite.
+
+Mide por separado la carga del centro, el cálculo del plan (`LoadPlan.pack`, 20 rutas
+por carril con 1.000 plazas cada una) y su aplicación con `LoadPlanningService.apply_plan`
+(escritura en bloque con `update_many` en una única transacción). Como referencia, la
+persistencia envío a envío con `update` se mide sobre una muestra y se extrapola.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_planificacion [num_envios]
+"""
+
+import sys
+import time
+
+from logistica.application.load_planning_service import LoadPlanningService
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+from logistica.infrastructure.identity_map import IdentityMap
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
+from logistica.infrastructure.sqlite_route import RouteRepositorySQLite
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.infrastructure.sqlite_unit_of_work import UnitOfWorkSQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+RUTAS_POR_CARRIL = 20
+PLAZAS_POR_RUTA = 1000
+MUESTRA_FILA_A_FILA = 2000
+
+
+def envio(i):
+    if i % 5 == 0:
+        return ExpressShipment(codigo_envio(i), "Remitente", "Destinatario")
+    if i % 5 == 1:
+        return FragileShipment(codigo_envio(i), "Remitente", "Destinatario", 2 + i % 2)
+    return Shipment(codigo_envio(i), "Remitente", "Destinatario", 1 + i % 3)
+
+
+def preparar(db_path, manager, num_envios):
+    """Crea el centro de origen con sus envíos en espera y las rutas que salen de él."""
+    centers = CenterRepositorySQLite(db_path, manager)
+    routes = RouteRepositorySQLite(db_path, manager)
+    shipments = ShipmentRepositorySQLite(db_path, manager)
+    origen = Center("MAD01", "Madrid", "Calle A")
+    destino = Center("BCN02", "Barcelona", "Calle B")
+    centers.add(origen)
+    centers.add(destino)
+    envios = [envio(i) for i in range(num_envios)]
+    shipments.add_many(envios)
+    for e in envios:
+        origen.receive_shipment(e)
+    centers.update(origen)
+    for carril in ("STD", "FRG", "EXP"):
+        for n in range(RUTAS_POR_CARRIL):
+            routes.add(Route(f"MAD01-BCN02-{carril}-{n:03d}", origen, destino))
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    with base_de_datos_temporal() as db_path:
+        manager = SQLiteConnectionManager(db_path)
+        preparar(db_path, manager, num_envios)
+
+        identity_map = IdentityMap()
+        shipment_repo = ShipmentRepositorySQLite(db_path, manager, identity_map)
+        service = LoadPlanningService(RouteRepositorySQLite(db_path, manager, identity_map), shipment_repo,
+                                      CenterRepositorySQLite(db_path, manager, identity_map),
+                                      UnitOfWorkSQLite(manager, identity_map))
+
+        with cronometro(f"carga del centro ({num_envios} envíos en espera)"):
+            centro = service._center_repo.get_by_center_id("MAD01")
+            len(centro.dispatch_queue)
+        with cronometro("cálculo del plan"):
+            plan = service.plan_center("MAD01", PLAZAS_POR_RUTA)
+        print(f"Plan: {len(plan)} envíos en {len(plan.loads())} rutas; sin plaza o sin carril: {plan.unplanned}")
+
+        muestra = [e for _ruta, envios in plan.loads() for e in envios][:MUESTRA_FILA_A_FILA]
+        inicio = time.perf_counter()
+        for e in muestra:
+            shipment_repo.update(e)
+        por_envio = (time.perf_counter() - inicio) / len(muestra)
+        print(f"update envío a envío: {por_envio * 1e6:.0f} µs/envío "
+              f"(~{por_envio * len(plan):.1f} s estimados para el plan)")
+
+        commits = manager.commits
+        with cronometro("apply_plan (update_many en una transacción)"):
+            service.apply_plan(plan)
+        print(f"Commits al aplicar el plan: {manager.commits - commits}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_registro_masivo.py
+"""
+Benchmark: registro de N envíos con ShipmentService sobre SQLite.
+
+Compara `register_shipment` fila a fila (un commit por envío) con
+`register_shipments`, que valida cada fila y persiste con `add_many`
+(executemany en transacciones por bloques). El registro fila a fila se mide
+sobre una muestra y se extrapola para no alargar la ejecución.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_registro_masivo [num_envios]
+"""
+
+import sys
+import time
+
+from logistica.application.shipment_service import ShipmentService
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.benchmarks.comun import base_de_datos_temporal, codigo_envio, cronometro
+
+TIPOS = ("standard", "fragile", "express")
+MUESTRA_FILA_A_FILA = 2000
+
+
+def especificaciones(inicio, fin):
+    for i in range(inicio, fin):
+        yield {
+            "tracking_code": codigo_envio(i),
+            "sender": "Remitente",
+            "recipient": "Destinatario",
+            "priority": 2,
+            "shipment_type": TIPOS[i % 3],
+        }
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    muestra = min(MUESTRA_FILA_A_FILA, num_envios)
+
+    with base_de_datos_temporal() as db_path:
+        manager = SQLiteConnectionManager(db_path)
+        service = ShipmentService(ShipmentRepositorySQLite(db_path, manager))
+
+        inicio = time.perf_counter()
+        for spec in especificaciones(0, muestra):
+            service.register_shipment(**spec)
+        por_envio = (time.perf_counter() - inicio) / muestra
+        print(f"register_shipment: {por_envio * 1e6:.0f} µs/envío "
+              f"(~{por_envio * num_envios:.1f} s estimados para {num_envios})")
+
+        with cronometro(f"register_shipments ({num_envios} envíos)"):
+            report = service.register_shipments(especificaciones(muestra, muestra + num_envios))
+        errores = sum(1 for _code, error in report if error is not None)
+        print(f"Filas: {len(report)}; errores: {errores}; commits: {manager.commits}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_tipos.py
+"""
+Benchmark: creación e hidratación de N envíos a través del registro de tipos.
+
+Compara la fábrica anterior (importación de las subclases en cada llamada y cadena
+if/elif sobre el tipo en minúsculas) con `SHIPMENT_TYPES.create_many`, y la
+hidratación por tipo con `if/elif` frente a `SHIPMENT_TYPES.hydrator`.
+
+Ejecución (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.benchmarks.bench_tipos [num_envios]
+"""
+
+import sys
+
+from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_types import SHIPMENT_TYPES
+from logistica.benchmarks.comun import codigo_envio, cronometro
+
+_TIPOS = ("standard", "fragile", "express")
+
+
+def crear_con_cadena(tracking_code, sender, recipient, priority=1, shipment_type="standard"):
+    """Réplica de la fábrica anterior de Shipment.create."""
+    from logistica.domain.fragile_shipment import FragileShipment
+    from logistica.domain.express_shipment import ExpressShipment
+
+    shipment_type = shipment_type.lower()
+    if shipment_type == "standard":
+        return Shipment(tracking_code, sender, recipient, priority)
+    elif shipment_type == "fragile":
+        return FragileShipment(tracking_code, sender, recipient, priority)
+    elif shipment_type == "express":
+        return ExpressShipment(tracking_code, sender, recipient)
+    raise ValueError("Tipo de envío no válido.")
+
+
+def hidratar_con_cadena(stype, *campos):
+    """Réplica de la hidratación anterior de ShipmentRepositorySQLite."""
+    from logistica.domain.fragile_shipment import FragileShipment
+    from logistica.domain.express_shipment import ExpressShipment
+
+    if stype == "FRAGILE":
+        return FragileShipment.from_record(*campos)
+    elif stype == "EXPRESS":
+        return ExpressShipment.from_record(*campos)
+    return Shipment.from_record(*campos)
+
+
+def main():
+    num_envios = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    specs = [(codigo_envio(i), "Remitente", "Destinatario", 2, _TIPOS[i % 3]) for i in range(num_envios)]
+
+    with cronometro(f"fábrica con importaciones y cadena if/elif ({num_envios} envíos)"):
+        for spec in specs:
+            crear_con_cadena(*spec)
+    with cronometro("SHIPMENT_TYPES.create_many"):
+        creados = SHIPMENT_TYPES.create_many(specs)
+    assert all(error is None for _code, _shipment, error in creados)
+
+    filas = [(tipo.upper(), codigo, "Remitente", "Destinatario", 2, "REGISTERED", ["REGISTERED"])
+             for codigo, _s, _r, _p, tipo in specs]
+    with cronometro("hidratación con importaciones y cadena if/elif"):
+        for stype, *campos in filas:
+            hidratar_con_cadena(stype, *campos)
+    with cronometro("hidratación con SHIPMENT_TYPES.hydrator"):
+        hydrator = SHIPMENT_TYPES.hydrator
+        for stype, *campos in filas:
+            hydrator(stype)(*campos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/comun.py
+"""Utilidades compartidas por los scripts de benchmark (base de datos temporal y cronometraje)."""
+
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+from logistica.infrastructure.migrations import migrate
+
+
+def crear_esquema(db_path, version=None):
+    """Crea en `db_path` las tablas del sistema, sin datos, hasta la versión de esquema indicada."""
+    conn = sqlite3.connect(db_path)
+    migrate(conn, version)
+    conn.close()
+
+
+@contextmanager
+def base_de_datos_temporal(version=None):
+    """Crea una base de datos vacía con el esquema en un directorio temporal y la elimina al salir."""
+    with tempfile.TemporaryDirectory() as directorio:
+        db_path = os.path.join(directorio, "bench.db")
+        crear_esquema(db_path, version)
+        yield db_path
+
+
+@contextmanager
+def cronometro(etiqueta):
+    """Imprime el tiempo transcurrido dentro del bloque."""
+    inicio = time.perf_counter()
+    yield
+    print(f"{etiqueta}: {time.perf_counter() - inicio:.3f} s")
+
+
+def codigo_envio(i):
+    """Genera un código de seguimiento válido (3 letras + 6 dígitos) a partir de un entero."""
+    letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    prefijo = letras[(i // 1000000) % 26] + letras[(i // 26000000) % 26] + "X"
+    return f"{prefijo}{i % 1000000:06d}"
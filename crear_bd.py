@@ -1,106 +1,115 @@
-"""Script para crear la base de datos de logistica con datos iniciales."""
-import sqlite3
+"""
+Script para crear o actualizar la base de datos de logistica con datos iniciales.
+
+El esquema se gestiona con migraciones versionadas (`infrastructure/migrations.py`):
+una base de datos existente se actualiza en el sitio sin perder datos. Los datos
+iniciales solo se insertan cuando la base de datos está vacía.
+
+Uso (desde el directorio que contiene el paquete `logistica`):
+    python -m logistica.crear_bd            # crea o actualiza logistica.db
+    python -m logistica.crear_bd --reset    # la borra y la recrea desde cero
+"""
+import argparse
 import os
+import sqlite3
+import time
+
+from logistica.infrastructure.migrations import migrate, current_version
+
+CENTROS_INICIALES = [
+    ("MAD16", "Madrid Centro", "Calle inventada 16"),
+    ("BCN03", "Barcelona Centro", "Carrer inventat 03"),
+    ("LPA06", "Las Palmas de Gran Canaria", "Calle León y Castillo 06"),
+]
+
+# Rutas activas por defecto (active = 1)
+RUTAS_INICIALES = [
+    ("MAD16-BCN03-STD-001", "MAD16", "BCN03", 1),
+    ("MAD16-BCN03-EXP-006", "MAD16", "BCN03", 1),
+    ("MAD16-LPA06-STD-003", "MAD16", "LPA06", 1),
+    ("MAD16-LPA06-EXP-009", "MAD16", "LPA06", 1),
+]
+
+ENVIOS_INICIALES = [
+    ("ABC123", "Amazon", "Juan Pérez", 1, "STANDARD"),
+    ("EXP456", "Zara", "María López", 2, "STANDARD"),
+    ("URG789", "Apple", "Carlos Gómez", 3, "EXPRESS"),
+    ("ALB882", "Alibaba", "Victor Aldama", 1, "STANDARD"),
+    ("SHN114", "Shein", "Atteneri López", 2, "FRAGILE"),
+]
+
+
+def insertar_datos_iniciales(conn):
+    """Inserta centros, rutas y envíos de ejemplo (con su historial inicial) en una única transacción."""
+    with conn:
+        conn.executemany("INSERT INTO centers VALUES (?, ?, ?)", CENTROS_INICIALES)
+        conn.executemany("INSERT INTO routes VALUES (?, ?, ?, ?)", RUTAS_INICIALES)
+        conn.executemany("""
+            INSERT INTO shipments (tracking_code, sender, recipient, priority, current_status, shipment_type, assigned_route_id, current_center_id)
+            VALUES (?, ?, ?, ?, 'REGISTERED', ?, NULL, NULL)
+        """, ENVIOS_INICIALES)
+        conn.executemany("""
+            INSERT INTO shipment_status_history (tracking_code, status, changed_at)
+            VALUES (?, 'REGISTERED', ?)
+        """, [(envio[0], time.time()) for envio in ENVIOS_INICIALES])
+
+
+def crear_bd(db_path="logistica.db", reset=False):
+    """
+    Crea la base de datos o la actualiza a la última versión del esquema.
+
+    Args:
+        db_path (str): Ruta del fichero de base de datos.
+        reset (bool): Si es True, borra la base de datos existente antes de crearla.
+
+    Returns:
+        list[int]: Versiones de esquema aplicadas.
+    """
+    if reset:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA foreign_keys = ON")
+        aplicadas = migrate(conn)
+        if conn.execute("SELECT COUNT(*) FROM centers").fetchone()[0] == 0:
+            insertar_datos_iniciales(conn)
+        return aplicadas
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crea o actualiza la base de datos de logística.")
+    parser.add_argument("--db", default="logistica.db", help="Ruta de la base de datos.")
+    parser.add_argument("--reset", action="store_true", help="Borra la base de datos y la recrea desde cero.")
+    args = parser.parse_args()
+
+    aplicadas = crear_bd(args.db, reset=args.reset)
+
+    conn = sqlite3.connect(args.db)
+    if aplicadas:
+        print(f"Migraciones aplicadas: {aplicadas}")
+    print(f"Base de datos en la versión de esquema {current_version(conn)}.")
+
+    # Opcional: Mostrar los datos para verificar
+    print("\n--- Centers ---")
+    for fila in conn.execute("SELECT * FROM centers"):
+        print(fila)
+
+    print("\n--- Routes ---")
+    for fila in conn.execute("SELECT * FROM routes"):
+        print(fila)
+
+    print("\n--- Shipments ---")
+    for fila in conn.execute("SELECT * FROM shipments"):
+        print(fila)
+
+    conn.close()
+    print(f"\nBase de datos guardada en {args.db}")
+
 
-# Eliminar la base de datos si ya existe (para recrearla limpia)
-if os.path.exists("logistica.db"):
-    os.remove("logistica.db")
-
-conn = sqlite3.connect("logistica.db")
-cursor = conn.cursor()
-cursor.execute("PRAGMA foreign_keys = ON")
-
-# Crear tablas
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS centers (
-        center_id TEXT PRIMARY KEY,
-        name TEXT NOT NULL,
-        location TEXT NOT NULL
-    )
-""")
-
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS routes (
-        route_id TEXT PRIMARY KEY,
-        origin_center_id TEXT NOT NULL,
-        destination_center_id TEXT NOT NULL,
-        active INTEGER NOT NULL,
-        FOREIGN KEY (origin_center_id) REFERENCES centers(center_id),
-        FOREIGN KEY (destination_center_id) REFERENCES centers(center_id)
-    )
-""")
-
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS shipments (
-        tracking_code TEXT PRIMARY KEY,
-        sender TEXT NOT NULL,
-        recipient TEXT NOT NULL,
-        priority INTEGER NOT NULL,
-        current_status TEXT NOT NULL,
-        shipment_type TEXT NOT NULL,
-        assigned_route_id TEXT,
-        current_center_id TEXT,
-        FOREIGN KEY (assigned_route_id) REFERENCES routes(route_id),
-        FOREIGN KEY (current_center_id) REFERENCES centers(center_id)
-    )
-""")
-
-cursor.execute("""
-    CREATE TABLE IF NOT EXISTS shipment_status_history (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        tracking_code TEXT NOT NULL,
-        status TEXT NOT NULL,
-        FOREIGN KEY (tracking_code) REFERENCES shipments(tracking_code)
-    )
-""")
-
-# Insertar centros
-cursor.execute("INSERT INTO centers VALUES ('MAD16', 'Madrid Centro', 'Calle inventada 16')")
-cursor.execute("INSERT INTO centers VALUES ('BCN03', 'Barcelona Centro', 'Carrer inventat 03')")
-cursor.execute("INSERT INTO centers VALUES ('LPA06', 'Las Palmas de Gran Canaria', 'Calle León y Castillo 06')")
-
-# Insertar rutas (activas por defecto = 1)
-cursor.execute("INSERT INTO routes VALUES ('MAD16-BCN03-STD-001', 'MAD16', 'BCN03', 1)")
-cursor.execute("INSERT INTO routes VALUES ('MAD16-BCN03-EXP-006', 'MAD16', 'BCN03', 1)")
-cursor.execute("INSERT INTO routes VALUES ('MAD16-LPA06-STD-003', 'MAD16', 'LPA06', 1)")
-cursor.execute("INSERT INTO routes VALUES ('MAD16-LPA06-EXP-009', 'MAD16', 'LPA06', 1)")
-
-# Función de ayuda para insertar envíos y su historial inicial
-def insertar_envio(tracking_code, sender, recipient, priority, shipment_type):
-    cursor.execute("""
-        INSERT INTO shipments (tracking_code, sender, recipient, priority, current_status, shipment_type, assigned_route_id, current_center_id)
-        VALUES (?, ?, ?, ?, 'REGISTERED', ?, NULL, NULL)
-    """, (tracking_code, sender, recipient, priority, shipment_type))
-    
-    cursor.execute("""
-        INSERT INTO shipment_status_history (tracking_code, status)
-        VALUES (?, 'REGISTERED')
-    """, (tracking_code,))
-
-insertar_envio("ABC123", "Amazon", "Juan Pérez", 1, "STANDARD")
-insertar_envio("EXP456", "Zara", "María López", 2, "STANDARD")
-insertar_envio("URG789", "Apple", "Carlos Gómez", 3, "EXPRESS")
-insertar_envio("ALB882", "Alibaba", "Victor Aldama", 1, "STANDARD")
-insertar_envio("SHN114", "Shein", "Atteneri López", 2, "FRAGILE")
-
-conn.commit()
-print("Base de datos creada con datos iniciales.")
-
-# Opcional: Mostrar los datos para verificar
-print("\n--- Centers ---")
-cursor.execute("SELECT * FROM centers")
-for fila in cursor.fetchall():
-    print(fila)
-
-print("\n--- Routes ---")
-cursor.execute("SELECT * FROM routes")
-for fila in cursor.fetchall():
-    print(fila)
-
-print("\n--- Shipments ---")
-cursor.execute("SELECT * FROM shipments")
-for fila in cursor.fetchall():
-    print(fila)
-
-conn.close()
-print("\nBase de datos guardada en logistica.db")
+if __name__ == "__main__":
+    main()
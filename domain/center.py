@@ -4,6 +4,10 @@
 
 import re
 from logistica.domain.shipment import Shipment
+from logistica.domain.dispatch_queue import DispatchQueue
+
+# Validador del ID de centro compilado una sola vez (RN-034)
+_CENTER_ID_PATTERN = re.compile(r'^[A-Z]{3,4}\d{2}$')
 
 class Center:
     """
@@ -43,7 +47,7 @@ class Center:
         if not isinstance(center_id, str) or not center_id.strip():
             raise ValueError("El ID del centro no puede estar vacío.")
         center_id = center_id.upper().strip()
-        if not re.match(r'^[A-Z]{3,4}\d{2}$', center_id):
+        if not _CENTER_ID_PATTERN.match(center_id):
             raise ValueError("El ID del centro debe tener 3 o 4 letras mayúsculas seguida de 2 dígitos (ej. MAD01).")
         if not name or not isinstance(name, str) or not name.strip():
             raise ValueError("El nombre del centro no puede estar vacío.")
@@ -56,10 +60,41 @@ class Center:
         self.__name = name
         self.__location = location
 
+        self._init_inventory()
+
+    @classmethod
+    def from_record(cls, center_id, name, location):
+        """
+        Reconstruye un centro (sin inventario) a partir de datos ya validados por el almacenamiento.
+
+        Vía rápida para la hidratación desde repositorios: no repite las validaciones
+        del constructor. No debe usarse con datos externos.
+
+        Returns:
+            Center: Instancia de `cls` con el inventario vacío.
+        """
+        center = cls.__new__(cls)
+        center.__center_id = center_id
+        center.__name = name
+        center.__location = location
+        center._init_inventory()
+        return center
+
+    def _init_inventory(self):
+        """Inicializa el inventario vacío y sus contadores."""
         # Inventario de envíos almacenados físicamente en este centro
-        # Se usa lista en lugar de dict porque el orden de inserción puede ser relevante
-        # y el acceso por código se hace mediante búsqueda lineal (válido por ahora)
-        self._shipments = []
+        # Diccionario tracking_code -> Shipment: conserva el orden de inserción y permite
+        # comprobar, añadir y retirar un envío en O(1) aunque el centro tenga 100k envíos
+        self._shipments = {}
+
+        # Contadores de ocupación mantenidos en cada entrada/salida (sin recorrer el inventario)
+        self._count_by_type = {}
+        self._count_by_priority = {}
+        # Prioridad con la que cuenta cada envío en _count_by_priority (para corregirla en refresh_shipment)
+        self._priorities = {}
+
+        # Envíos del inventario pendientes de cargar en una ruta, en orden de salida
+        self._dispatch_queue = DispatchQueue()
 
     @property
     def center_id(self):
@@ -106,7 +141,7 @@ class Center:
             raise ValueError("El envío ya se encuentra en el centro.")
 
         # Agregar al inventario
-        self._shipments.append(shipment)
+        self._index(shipment)
 
     def dispatch_shipment(self, shipment):
         """
@@ -143,7 +178,7 @@ class Center:
         shipment.update_status("IN_TRANSIT")
 
         # Remover del inventario (ya no está físicamente en el centro)
-        self._shipments.remove(shipment)
+        self._unindex(self._shipments[shipment.tracking_code])
 
         return shipment
 
@@ -157,7 +192,7 @@ class Center:
         Nota: Devuelve copia para mantener encapsulamiento. Las modificaciones
         a la lista devuelta no afectan el inventario interno.
         """
-        return self._shipments.copy()
+        return list(self._shipments.values())
 
     def has_shipment(self, tracking_code):
         """
@@ -170,6 +205,118 @@ class Center:
             True si el envío está presente, False en caso contrario.
         """
 
-        # Búsqueda lineal: adecuado para inventarios pequeños
-        # Para grandes volúmenes, se podrá optimizar con dict indexado
-        return any(s.tracking_code == tracking_code for s in self._shipments)
+        # Búsqueda por clave en el índice: O(1)
+        return tracking_code in self._shipments
+
+    @property
+    def shipment_count(self):
+        """Devuelve el número de envíos presentes en el centro."""
+        return len(self._shipments)
+
+    def count_by_type(self):
+        """
+        Devuelve cuántos envíos hay en el centro de cada tipo.
+
+        Returns:
+            dict: Tipo de envío (STANDARD, FRAGILE, EXPRESS) -> número de envíos. Solo incluye tipos presentes.
+        """
+        return dict(self._count_by_type)
+
+    def count_by_priority(self):
+        """
+        Devuelve cuántos envíos hay en el centro con cada prioridad.
+
+        Los contadores siguen los cambios de prioridad de los envíos del centro cuando se
+        notifican con `refresh_shipment`.
+
+        Returns:
+            dict: Prioridad (1, 2, 3) -> número de envíos. Solo incluye prioridades presentes.
+        """
+        return dict(self._count_by_priority)
+
+    @property
+    def dispatch_queue(self):
+        """
+        Cola de despacho del centro: envíos que esperan a cargarse en una ruta.
+
+        Contiene los envíos del inventario sin ruta asignada y no entregados, ordenados
+        para salir (express primero, después por prioridad y por orden de llegada). Se
+        mantiene con las entradas y salidas, y con los cambios de prioridad o de ruta
+        notificados con `refresh_shipment`.
+
+        Returns:
+            DispatchQueue: La cola del centro (no una copia).
+        """
+        return self._dispatch_queue
+
+    def refresh_shipment(self, shipment):
+        """
+        Actualiza los contadores y la cola de despacho tras un cambio de prioridad o de ruta de un envío.
+
+        El envío no conoce al centro ni le avisa de sus cambios: lo hace quien los provoca
+        (la ruta al cargar o retirar un envío, ShipmentService al cambiar su prioridad).
+
+        Args:
+            shipment (Shipment): El envío ya modificado. Si es otra instancia del mismo envío
+                (p. ej. leída de otro repositorio), sustituye a la del inventario.
+                Si el envío no está en el centro, no se hace nada.
+        """
+        tracking_code = shipment.tracking_code
+        if tracking_code not in self._shipments:
+            return
+        self._shipments[tracking_code] = shipment
+
+        old_priority = self._priorities[tracking_code]
+        if old_priority != shipment.priority:
+            self._decrement(self._count_by_priority, old_priority)
+            self._count_by_priority[shipment.priority] = self._count_by_priority.get(shipment.priority, 0) + 1
+            self._priorities[tracking_code] = shipment.priority
+
+        if not self._is_waiting(shipment):
+            self._dispatch_queue.discard(tracking_code)
+        elif tracking_code in self._dispatch_queue:
+            self._dispatch_queue.reprioritize(shipment)
+        else:
+            self._dispatch_queue.push(shipment)
+
+    def _restore_shipments(self, shipments):
+        """
+        Carga en el inventario envíos ya validados por el almacenamiento (sin reglas de negocio).
+
+        Lo usa la capa de infraestructura al reconstruir un centro.
+        """
+        for shipment in shipments:
+            self._index(shipment)
+
+    def _index(self, shipment):
+        """Añade el envío al índice y a los contadores."""
+        self._shipments[shipment.tracking_code] = shipment
+        shipment._current_center_id = self.center_id
+        shipment_type = shipment.shipment_type
+        self._count_by_type[shipment_type] = self._count_by_type.get(shipment_type, 0) + 1
+        priority = shipment.priority
+        self._count_by_priority[priority] = self._count_by_priority.get(priority, 0) + 1
+        self._priorities[shipment.tracking_code] = priority
+        if self._is_waiting(shipment):
+            self._dispatch_queue.push(shipment)
+
+    def _unindex(self, shipment):
+        """Retira el envío del índice, de los contadores y de la cola de despacho."""
+        del self._shipments[shipment.tracking_code]
+        self._dispatch_queue.discard(shipment.tracking_code)
+        if shipment._current_center_id == self.center_id:
+            shipment._current_center_id = None
+        self._decrement(self._count_by_type, shipment.shipment_type)
+        self._decrement(self._count_by_priority, self._priorities.pop(shipment.tracking_code))
+
+    @staticmethod
+    def _is_waiting(shipment):
+        """Un envío espera a salir si no tiene ruta asignada y no se ha entregado."""
+        return not shipment.is_assigned_to_route() and not shipment.is_delivered()
+
+    @staticmethod
+    def _decrement(counts, key):
+        if counts[key] == 1:
+            del counts[key]
+        else:
+            counts[key] -= 1
@@ -13,5 +13,12 @@ class CenterRepository:
     def get_by_center_id(self, center_id):
         raise NotImplementedError
 
+    def get_if_loaded(self, center_id):
+        """Devuelve el centro si ya está en memoria (sin ir al almacenamiento), o None."""
+        raise NotImplementedError
+
     def list_all(self):
         raise NotImplementedError
+
+    def shipment_counts(self):
+        raise NotImplementedError
@@ -0,0 +1,193 @@
+# domain/dispatch_queue.py
+
+"""Dominio: Cola de despacho de un centro, ordenada por urgencia y orden de llegada."""
+
+import heapq
+from itertools import count, islice
+
+# Entradas anuladas a partir de las cuales se reconstruyen los montículos (si además superan a las vivas)
+_COMPACT_THRESHOLD = 64
+
+# Posiciones de cada entrada del montículo: [rango, -prioridad, llegada, envío]
+_ARRIVAL = 2
+_SHIPMENT = 3
+
+
+class DispatchQueue:
+    """
+    Envíos que esperan en un centro a ser cargados en una ruta, en el orden en que deben salir.
+
+    Orden de salida:
+    1. Envíos express primero
+    2. Después, frágiles y estándar por prioridad (de 3 a 1)
+    3. A igual urgencia, por orden de llegada a la cola
+
+    Implementación: un montículo (`heapq`) por tipo de envío, de modo que `push` y `pop`
+    son O(log n) también cuando se filtra por tipo; sin filtro se elige la mejor de las
+    cabezas de los montículos. Retirar un envío o cambiar su prioridad anula su entrada
+    en O(1) (borrado perezoso): una entrada solo está viva mientras sea la registrada para
+    su código, y las anuladas se descartan al llegar a la cabeza.
+    """
+
+    def __init__(self):
+        """Inicializa una cola vacía."""
+        self._heaps = {}
+        self._entries = {}
+        self._arrivals = count()
+        self._cancelled = 0
+
+    def __len__(self):
+        """Número de envíos en la cola."""
+        return len(self._entries)
+
+    def __contains__(self, tracking_code):
+        """Indica si el envío con ese código está en la cola."""
+        return tracking_code in self._entries
+
+    def push(self, shipment):
+        """
+        Añade un envío al final de los de su misma urgencia. O(log n).
+
+        Raises:
+            ValueError: Si el envío ya está en la cola.
+        """
+        if shipment.tracking_code in self._entries:
+            raise ValueError(f"El envío '{shipment.tracking_code}' ya está en la cola de despacho.")
+        self._push(shipment, next(self._arrivals))
+
+    def pop(self, shipment_type=None):
+        """
+        Saca de la cola el siguiente envío que debe salir. O(log n).
+
+        Args:
+            shipment_type (str, opcional): Limita la búsqueda a un tipo (STANDARD, FRAGILE, EXPRESS).
+
+        Returns:
+            Shipment: El envío retirado de la cola.
+
+        Raises:
+            ValueError: Si no hay envíos (del tipo indicado) en la cola.
+        """
+        heap = self._next_heap(shipment_type)
+        if heap is None:
+            raise ValueError("La cola de despacho está vacía.")
+        shipment = heapq.heappop(heap)[_SHIPMENT]
+        del self._entries[shipment.tracking_code]
+        return shipment
+
+    def peek(self, shipment_type=None):
+        """Devuelve el siguiente envío que debe salir sin retirarlo, o None si no hay ninguno."""
+        heap = self._next_heap(shipment_type)
+        return None if heap is None else heap[0][_SHIPMENT]
+
+    def take_next(self, n, shipment_type=None):
+        """
+        Saca de la cola los `n` siguientes envíos, en orden de salida. O(n log n).
+
+        Los envíos devueltos siguen en el inventario del centro: están reservados para
+        cargarse en una ruta. Si finalmente no se cargan, deben devolverse con `push`.
+
+        Args:
+            n (int): Número máximo de envíos a sacar.
+            shipment_type (str, opcional): Limita la selección a un tipo de envío.
+
+        Returns:
+            list[Shipment]: Hasta `n` envíos (menos si la cola se agota).
+        """
+        taken = []
+        while len(taken) < n:
+            heap = self._next_heap(shipment_type)
+            if heap is None:
+                break
+            shipment = heapq.heappop(heap)[_SHIPMENT]
+            del self._entries[shipment.tracking_code]
+            taken.append(shipment)
+        return taken
+
+    def next_shipments(self, n, shipment_type=None):
+        """
+        Devuelve los `n` siguientes envíos en orden de salida sin sacarlos de la cola.
+
+        Cada montículo se recorre desde la cabeza solo hasta reunir `n` entradas vivas,
+        saltando las anuladas que se encuentren por el camino: O((n + a) log(n + a)) por
+        tipo de envío, con `a` las anuladas recorridas, sin importar el tamaño de la cola.
+
+        Args:
+            n (int): Número máximo de envíos.
+            shipment_type (str, opcional): Limita la selección a un tipo de envío.
+
+        Returns:
+            list[Shipment]: Hasta `n` envíos, en el orden en que saldrían con `pop`.
+        """
+        if shipment_type is not None:
+            heaps = [self._heaps.get(shipment_type.upper(), [])]
+        else:
+            heaps = self._heaps.values()
+        merged = heapq.merge(*(self._smallest_live(heap, n) for heap in heaps))
+        return [entry[_SHIPMENT] for entry in islice(merged, n)]
+
+    def discard(self, tracking_code):
+        """Retira un envío de la cola si está en ella. O(1)."""
+        if self._entries.pop(tracking_code, None) is not None:
+            self._cancelled_one()
+
+    def reprioritize(self, shipment):
+        """
+        Recoloca un envío de la cola tras un cambio de prioridad, conservando su orden de llegada.
+
+        Si `shipment` es otra instancia del mismo envío, la cola pasa a guardar esta.
+        """
+        entry = self._entries.get(shipment.tracking_code)
+        if entry is not None and (entry[1] != -shipment.priority or entry[_SHIPMENT] is not shipment):
+            self._push(shipment, entry[_ARRIVAL])
+            self._cancelled_one()
+
+    def _push(self, shipment, arrival):
+        shipment_type = shipment.shipment_type
+        entry = [0 if shipment_type == "EXPRESS" else 1, -shipment.priority, arrival, shipment]
+        self._entries[shipment.tracking_code] = entry
+        heapq.heappush(self._heaps.setdefault(shipment_type, []), entry)
+
+    def _smallest_live(self, heap, n):
+        """Las `n` entradas vivas más pequeñas de un montículo, en orden, sin modificarlo."""
+        live = []
+        # Frontera del recorrido: (entrada, posición); los hijos de i están en 2i+1 y 2i+2
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(live) < n:
+            entry, i = heapq.heappop(frontier)
+            if self._is_live(entry):
+                live.append(entry)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return live
+
+    def _is_live(self, entry):
+        return self._entries.get(entry[_SHIPMENT].tracking_code) is entry
+
+    def _cancelled_one(self):
+        """Cuenta una entrada anulada que sigue en un montículo; compacta cuando las anuladas dominan."""
+        self._cancelled += 1
+        if self._cancelled >= _COMPACT_THRESHOLD and self._cancelled > len(self._entries):
+            for shipment_type, heap in self._heaps.items():
+                live = [entry for entry in heap if self._is_live(entry)]
+                heapq.heapify(live)
+                self._heaps[shipment_type] = live
+            self._cancelled = 0
+
+    def _next_heap(self, shipment_type):
+        """Devuelve el montículo cuya cabeza es el siguiente envío (del tipo indicado), o None."""
+        if shipment_type is not None:
+            heap = self._heaps.get(shipment_type.upper())
+            return heap if heap and self._prune(heap) else None
+        candidates = [heap for heap in self._heaps.values() if heap and self._prune(heap)]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda heap: heap[0])
+
+    def _prune(self, heap):
+        """Descarta las entradas anuladas de la cabeza; devuelve True si queda alguna viva."""
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        return bool(heap)
@@ -3,6 +3,7 @@
 """Dominio: Especialización de Shipment para envíos urgentes con prioridad máxima fija."""
 
 from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_types import SHIPMENT_TYPES
 
 class ExpressShipment(Shipment):
     """
@@ -17,6 +18,10 @@ class ExpressShipment(Shipment):
     - Prioridad fija garantiza tratamiento consistente como máxima urgencia
     - Elimina confusión sobre niveles de prioridad dentro de express
     """
+
+    # Sin atributos propios por instancia: hereda los slots de Shipment
+    __slots__ = ()
+
     def __init__(self, tracking_code, sender, recipient):
         """
         Inicializa un envío express con prioridad automática de 3.
@@ -86,4 +91,12 @@ class ExpressShipment(Shipment):
         Returns:
             str: 'EXPRESS' - identificador constante para este tipo.
         """
-        return "EXPRESS"
\ No newline at end of file
+        return "EXPRESS"
+
+
+# La prioridad de la especificación se ignora: un envío express siempre tiene prioridad 3
+SHIPMENT_TYPES.register(
+    "EXPRESS",
+    ExpressShipment,
+    factory=lambda tracking_code, sender, recipient, priority: ExpressShipment(tracking_code, sender, recipient),
+)
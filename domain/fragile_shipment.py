@@ -2,6 +2,7 @@
 """Dominio: Especialización de Shipment para mercancía delicada con reglas de prioridad específicas."""
 
 from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_types import SHIPMENT_TYPES
 
 class FragileShipment(Shipment):
     """
@@ -17,6 +18,12 @@ class FragileShipment(Shipment):
     - Previene degradación accidental a prioridad 1 que podría causar daños
     """
 
+    # Sin atributos propios por instancia: hereda los slots de Shipment
+    __slots__ = ()
+
+    # Marca de fragilidad común a todos los envíos frágiles (atributo de clase, no por instancia)
+    _fragile = True
+
     def __init__(self, tracking_code, sender, recipient, priority=2):
         """
         Inicializa un envío frágil con validación de prioridad mínima.
@@ -38,10 +45,6 @@ class FragileShipment(Shipment):
 
         super().__init__(tracking_code, sender, recipient, priority)
 
-        # Marcar como frágil para identificación rápida
-        # Atributo privado para mantener encapsulamiento
-        self._fragile = True
-
 
     @property
     def shipment_type(self):
@@ -73,7 +76,7 @@ class FragileShipment(Shipment):
         if self._priority <= 2:
             raise ValueError("La prioridad de un envío frágil no puede ser inferior a 2.")
 
-        # Si pasa la validación, delegar al método padre para el decremento real
+        # Si pasa la validación, aplicar el decremento
         self._priority -= 1
 
 
@@ -88,4 +91,7 @@ class FragileShipment(Shipment):
         Returns:
             bool: Siempre True para instancias de FragileShipment.
         """
-        return True
\ No newline at end of file
+        return True
+
+
+SHIPMENT_TYPES.register("FRAGILE", FragileShipment)
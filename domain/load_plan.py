@@ -0,0 +1,108 @@
+# domain/load_plan.py
+
+"""Dominio: Plan de carga de los envíos que esperan en un centro en sus rutas de salida."""
+
+
+class LoadPlan:
+    """
+    Reparto de los envíos en espera de un centro entre las rutas activas que salen de él.
+
+    Reglas del reparto:
+    1. Cada envío solo va en una ruta de su carril (STD -> STANDARD, FRG -> FRAGILE, EXP -> EXPRESS)
+    2. Ninguna ruta supera su capacidad (envíos en el manifiesto, contando los ya cargados)
+    3. Si no hay sitio para todos, se cargan los primeros en orden de salida de la cola
+       de despacho (prioridad y orden de llegada); el resto sigue esperando
+
+    El plan no modifica rutas ni envíos: se calcula con `pack` y se aplica después.
+    """
+
+    def __init__(self, center_id):
+        """Inicializa un plan vacío para el centro indicado."""
+        self._center_id = center_id
+        # route_id -> (ruta, envíos a cargar en orden de salida)
+        self._loads = {}
+        self._capacities = {}
+        self._unplanned = 0
+
+    @classmethod
+    def pack(cls, center, routes, capacities):
+        """
+        Calcula el plan de carga de un centro en bloque, carril a carril.
+
+        Los envíos no tienen peso ni volumen, así que cada uno ocupa una plaza y el
+        empaquetado por lotes se reduce a: tomar de la cola de despacho tantos envíos como
+        plazas libres haya en el carril (una sola selección, O(n log k)) y repartirlos en
+        tramos consecutivos empezando por la ruta con más plazas libres. Es el primer
+        ajuste decreciente con objetos de tamaño 1: usa el menor número de rutas posible.
+
+        Args:
+            center (Center): Centro de origen.
+            routes (Iterable[Route]): Rutas candidatas; solo se usan las activas que salen del centro.
+            capacities (dict): route_id -> capacidad máxima de la ruta.
+
+        Returns:
+            LoadPlan: El plan calculado.
+        """
+        plan = cls(center.center_id)
+        plan._capacities = dict(capacities)
+        queue = center.dispatch_queue
+
+        free_by_type = {}
+        for route in routes:
+            if not route.is_active or route.origin_center.center_id != center.center_id:
+                continue
+            free = capacities.get(route.route_id, 0) - len(route.shipments_view())
+            if free > 0:
+                free_by_type.setdefault(route.shipment_type, []).append((free, route))
+
+        planned = 0
+        for shipment_type, lane in free_by_type.items():
+            lane.sort(key=lambda item: (-item[0], item[1].route_id))
+            waiting = queue.next_shipments(sum(free for free, _route in lane), shipment_type)
+            start = 0
+            for free, route in lane:
+                if start == len(waiting):
+                    break
+                plan._loads[route.route_id] = (route, waiting[start:start + free])
+                start += free
+            planned += len(waiting)
+
+        plan._unplanned = len(queue) - planned
+        return plan
+
+    @property
+    def center_id(self):
+        """ID del centro cuyo plan es."""
+        return self._center_id
+
+    @property
+    def unplanned(self):
+        """Número de envíos en espera que el plan deja sin ruta (sin carril o sin plazas)."""
+        return self._unplanned
+
+    def capacity(self, route_id):
+        """Capacidad de la ruta con la que se calculó el plan."""
+        return self._capacities[route_id]
+
+    def __len__(self):
+        """Número de envíos que carga el plan."""
+        return sum(len(shipments) for _route, shipments in self._loads.values())
+
+    def loads(self):
+        """
+        Devuelve las cargas del plan.
+
+        Returns:
+            list[tuple]: (ruta, lista de envíos a cargar) por cada ruta con algún envío.
+        """
+        return list(self._loads.values())
+
+    def assignments(self):
+        """
+        Resumen del plan para presentación.
+
+        Returns:
+            dict: route_id -> lista de códigos de seguimiento, en orden de salida.
+        """
+        return {route_id: [shipment.tracking_code for shipment in shipments]
+                for route_id, (_route, shipments) in self._loads.items()}
@@ -5,6 +5,13 @@
 import re
 from logistica.domain.shipment import Shipment
 
+# Validador del ID de ruta compilado una sola vez (RN-035)
+# Patrón: origen (ej. MAD01) - destino (ej. BCN02) - tipo (STD/FRG/EXP) - 3 dígitos
+_ROUTE_ID_PATTERN = re.compile(r'^[A-Z]{3,4}\d{2}-[A-Z]{3,4}\d{2}-(STD|FRG|EXP)-\d{3}$')
+
+# Tipo de envío que transporta cada carril (TIPO del ID de la ruta)
+_LANE_SHIPMENT_TYPES = {"STD": "STANDARD", "FRG": "FRAGILE", "EXP": "EXPRESS"}
+
 class Route:
     """
     Gestiona el transporte de envíos entre un centro de origen y uno de destino.
@@ -42,8 +49,7 @@ class Route:
         if not isinstance(route_id, str) or not route_id.strip():
             raise ValueError("El ID de la ruta no puede estar vacío.")
         route_id = route_id.upper().strip()
-        # Patrón: origen (ej. MAD01) - destino (ej. BCN02) - tipo (STD/FRG/EXP) - 3 dígitos
-        if not re.match(r'^[A-Z]{3,4}\d{2}-[A-Z]{3,4}\d{2}-(STD|FRG|EXP)-\d{3}$', route_id):
+        if not _ROUTE_ID_PATTERN.match(route_id):
             raise ValueError("El ID de la ruta debe tener el formato ORIGEN-DESTINO-TIPO-999 (ej. MAD01-BCN02-FRG-001).")
 
         # Validación: ambos centros deben existir
@@ -61,13 +67,41 @@ class Route:
         self.__origin_center = origin_center
         self.__destination_center = destination_center
 
-        # Lista de códigos de seguimiento asignados a esta ruta
-        self._shipments = []
+        # Manifiesto: conjunto ordenado de códigos de seguimiento asignados a esta ruta
+        # (diccionario código -> None: conserva el orden de asignación y permite
+        # añadir, retirar y comprobar un código en O(1))
+        self._shipments = {}
 
         # Estado de la ruta: True = activa (puede recibir envíos), False = completada
         # Inicialmente todas las rutas están activas
         self._active = True
 
+    @classmethod
+    def from_record(cls, route_id, origin_center, destination_center, active, tracking_codes=()):
+        """
+        Reconstruye una ruta a partir de datos ya validados por el almacenamiento.
+
+        Vía rápida para la hidratación desde repositorios: no repite las validaciones
+        del constructor. No debe usarse con datos externos.
+
+        Args:
+            route_id (str): ID de la ruta, ya normalizado.
+            origin_center (Center): Centro de origen.
+            destination_center (Center): Centro de destino.
+            active (bool): Si la ruta sigue activa.
+            tracking_codes (Iterable[str], opcional): Manifiesto, en orden de asignación.
+
+        Returns:
+            Route: Instancia de `cls`.
+        """
+        route = cls.__new__(cls)
+        route.__route_id = route_id
+        route.__origin_center = origin_center
+        route.__destination_center = destination_center
+        route._shipments = dict.fromkeys(tracking_codes)
+        route._active = bool(active)
+        return route
+
     @property
     def route_id(self):
         """Devuelve el identificador único de la ruta. Propiedad de solo lectura."""
@@ -93,6 +127,16 @@ class Route:
         """
         return self._active
 
+    @property
+    def shipment_type(self):
+        """
+        Tipo de envío del carril de la ruta, según el TIPO de su ID (STD, FRG, EXP).
+
+        Returns:
+            str: STANDARD, FRAGILE o EXPRESS.
+        """
+        return _LANE_SHIPMENT_TYPES[self.__route_id.split("-")[2]]
+
     def add_shipment(self, shipment):
         """
         Añade un envío a la ruta y lo registra en el inventario del centro de origen.
@@ -114,8 +158,12 @@ class Route:
         if not self.is_active:
             raise ValueError("La ruta no está activa.")
 
-        # Agregar a la lista interna el código de seguimiento
-        self._shipments.append(shipment.tracking_code)
+        # Un mismo envío no puede figurar dos veces en el manifiesto
+        if shipment.tracking_code in self._shipments:
+            raise ValueError(f"El envío '{shipment.tracking_code}' ya está en la ruta.")
+
+        # Agregar al manifiesto el código de seguimiento
+        self._shipments[shipment.tracking_code] = None
 
         # Establecer relación bidireccional: envío conoce su ruta asignada
         shipment.assign_route(self.route_id)
@@ -124,6 +172,45 @@ class Route:
         # Esto sincroniza el estado lógico (asignación) con el físico (ubicación)
         self.origin_center.receive_shipment(shipment)
 
+    def load_waiting_shipment(self, shipment):
+        """
+        Carga en la ruta un envío que ya espera en el centro de origen.
+
+        A diferencia de `add_shipment`, el envío no se recibe en el centro (ya está en
+        su inventario); solo se añade al manifiesto y se le asigna la ruta, lo que lo
+        retira de la cola de despacho del centro.
+
+        Args:
+            shipment (Shipment): Envío presente en el centro de origen y sin ruta asignada.
+
+        Raises:
+            ValueError: Si la ruta no está activa, el envío no está en el centro de origen
+                o ya está en la ruta.
+        """
+        self.can_load_waiting_shipment(shipment)
+
+        self._shipments[shipment.tracking_code] = None
+        shipment.assign_route(self.route_id)
+        # El envío ya tiene ruta: sale de la cola de despacho del centro
+        self.origin_center.refresh_shipment(shipment)
+
+    def can_load_waiting_shipment(self, shipment):
+        """
+        Valida si un envío que espera en el centro de origen puede cargarse en la ruta, sin cargarlo.
+
+        Permite comprobar un lote entero antes de modificar ninguno de sus envíos.
+
+        Raises:
+            ValueError: Si la ruta no está activa, el envío no está en el centro de origen
+                o ya está en la ruta.
+        """
+        if not self.is_active:
+            raise ValueError("La ruta no está activa.")
+        if not self.origin_center.has_shipment(shipment.tracking_code):
+            raise ValueError(f"El envío '{shipment.tracking_code}' no está en el centro de origen.")
+        if shipment.tracking_code in self._shipments:
+            raise ValueError(f"El envío '{shipment.tracking_code}' ya está en la ruta.")
+
     def remove_shipment(self, shipment):
         """
         Elimina un envío de la ruta y desvincula la ruta del objeto envío.
@@ -134,14 +221,22 @@ class Route:
 
         Args:
             shipment (Shipment): El envío que se desea retirar de la ruta.
+
+        Raises:
+            ValueError: Si el envío no está en la ruta.
         """
 
-        # Remover de la lista interna el código de seguimiento
-        self._shipments.remove(shipment.tracking_code)
+        # Remover del manifiesto el código de seguimiento
+        if shipment.tracking_code not in self._shipments:
+            raise ValueError(f"El envío '{shipment.tracking_code}' no está en la ruta.")
+        del self._shipments[shipment.tracking_code]
 
         # Desvincular la relación bidireccional
         shipment.remove_route()
 
+        # Si sigue en el centro de origen, vuelve a esperar en su cola de despacho
+        self.origin_center.refresh_shipment(shipment)
+
     def dispatch(self, shipments):
         """
         Valida que la ruta pueda ser despachada.
@@ -205,6 +300,38 @@ class Route:
             Copia de la lista de envíos en tránsito por esta ruta.
 
         Nota: Devuelve copia para mantener encapsulamiento. Las modificaciones
-        a la lista devuelta no afectan la lista interna de la ruta.
+        a la lista devuelta no afectan la lista interna de la ruta. Para solo
+        recorrer o consultar el manifiesto, `shipments_view()` evita la copia.
+        """
+        return list(self._shipments)
+
+    def shipments_view(self):
+        """
+        Devuelve una vista de solo lectura del manifiesto, sin copiarlo.
+
+        La vista se puede recorrer (en orden de asignación), admite `len()` y `in`
+        en O(1) y refleja los cambios posteriores de la ruta. No debe modificarse
+        la ruta mientras se recorre.
+
+        Returns:
+            KeysView: Códigos de seguimiento asignados a la ruta.
+        """
+        return self._shipments.keys()
+
+    def has_shipment(self, tracking_code):
+        """
+        Indica si un envío está en el manifiesto de la ruta. O(1).
+
+        Args:
+            tracking_code (str): Código de seguimiento a buscar.
+        """
+        return tracking_code in self._shipments
+
+    def _restore_shipments(self, tracking_codes):
+        """
+        Carga en el manifiesto códigos ya validados por el almacenamiento (sin reglas de negocio).
+
+        Lo usa la capa de infraestructura al reconstruir una ruta.
         """
-        return self._shipments.copy()
\ No newline at end of file
+        for tracking_code in tracking_codes:
+            self._shipments[tracking_code] = None
\ No newline at end of file
@@ -0,0 +1,215 @@
+# domain/route_network.py
+
+"""Dominio: Red de centros unidos por rutas activas, con caminos mínimos memorizados."""
+
+import heapq
+from collections import OrderedDict
+
+_INFINITY = float("inf")
+
+
+def _one_hop(route):
+    """Coste por defecto de una ruta: un salto (camino con menos transbordos)."""
+    return 1
+
+
+def _link(tree, center_id, previous, route_id):
+    """Hace que en el árbol se llegue a `center_id` desde `previous` por la ruta `route_id`."""
+    _distances, arrivals, children = tree
+    old = arrivals.get(center_id)
+    if old is not None:
+        children[old[0]].discard(center_id)
+    arrivals[center_id] = (previous, route_id)
+    children.setdefault(previous, set()).add(center_id)
+
+
+class RouteNetwork:
+    """
+    Grafo dirigido de la red logística: cada centro es un nodo y cada ruta activa una
+    arista `origin_center -> destination_center`.
+
+    Calcula caminos de varios saltos entre centros sin ruta directa mediante Dijkstra.
+    No se usa A*: los centros no tienen coordenadas (la ubicación es texto libre), así
+    que no hay una heurística admisible mejor que 0 y A* se reduce a Dijkstra.
+
+    Memorización: para cada centro de origen consultado se guarda su árbol completo de
+    caminos mínimos (distancia y arista de llegada a cada centro alcanzable), de modo
+    que todas las consultas desde ese origen se responden recorriendo el árbol. Se
+    conservan como máximo `max_cached_origins` árboles (se descarta el usado hace más tiempo).
+
+    Actualización incremental de la caché:
+    - Nueva ruta u -> v: solo se revisan los árboles en los que pasar por u mejora el
+      coste de v, propagando la mejora desde v (Dijkstra parcial); el resto no cambia.
+    - Ruta retirada (completada): solo se reparan los árboles que la usaban, y en ellos
+      solo la rama que colgaba de su destino; el resto del árbol conserva su coste.
+    """
+
+    def __init__(self, weight=None, max_cached_origins=1024):
+        """
+        Args:
+            weight (callable, opcional): Función `weight(route) -> float` no negativa con el
+                coste de recorrer una ruta. Por defecto cada ruta cuesta 1 (menos saltos).
+            max_cached_origins (int): Número máximo de árboles de caminos memorizados.
+        """
+        self._weight = weight or _one_hop
+        self._max_cached_origins = max_cached_origins
+        # route_id -> (center_id origen, center_id destino, coste)
+        self._routes = {}
+        # (origen, destino) -> {route_id: coste}: rutas paralelas entre dos centros
+        self._parallel = {}
+        # origen -> {destino: (coste, route_id)} con la ruta más barata de cada par
+        self._adjacency = {}
+        # destino -> {orígenes con alguna ruta hacia él}
+        self._incoming = {}
+        # origen consultado -> (distancias, aristas de llegada {center_id: (center_id previo, route_id)},
+        #                      hijos {center_id: {centros a los que se llega desde él}})
+        self._trees = OrderedDict()
+
+    def __len__(self):
+        """Número de rutas activas en la red."""
+        return len(self._routes)
+
+    def has_route(self, route_id):
+        """Indica si la ruta forma parte de la red."""
+        return route_id in self._routes
+
+    def add_route(self, route):
+        """
+        Añade una ruta activa a la red y actualiza los árboles memorizados afectados.
+
+        Raises:
+            ValueError: Si la ruta ya está en la red o su coste es negativo.
+        """
+        route_id = route.route_id
+        if route_id in self._routes:
+            raise ValueError(f"La ruta '{route_id}' ya está en la red.")
+        cost = self._weight(route)
+        if cost < 0:
+            raise ValueError(f"El coste de la ruta '{route_id}' no puede ser negativo.")
+
+        origin = route.origin_center.center_id
+        destination = route.destination_center.center_id
+        self._routes[route_id] = (origin, destination, cost)
+        self._parallel.setdefault((origin, destination), {})[route_id] = cost
+        edges = self._adjacency.setdefault(origin, {})
+        best = edges.get(destination)
+        if best is None or cost < best[0]:
+            edges[destination] = (cost, route_id)
+        self._incoming.setdefault(destination, set()).add(origin)
+
+        for tree in self._trees.values():
+            distances = tree[0]
+            candidate = distances.get(origin, _INFINITY) + cost
+            if candidate < distances.get(destination, _INFINITY):
+                distances[destination] = candidate
+                _link(tree, destination, origin, route_id)
+                self._propagate(tree, [(candidate, destination)])
+
+    def remove_route(self, route_id):
+        """
+        Retira una ruta de la red (p. ej. al completarse) y repara los árboles que la usaban.
+
+        Raises:
+            ValueError: Si la ruta no está en la red.
+        """
+        if route_id not in self._routes:
+            raise ValueError(f"La ruta '{route_id}' no está en la red.")
+        origin, destination, _cost = self._routes.pop(route_id)
+        parallel = self._parallel[(origin, destination)]
+        del parallel[route_id]
+        if not parallel:
+            del self._parallel[(origin, destination)]
+            del self._adjacency[origin][destination]
+            self._incoming[destination].discard(origin)
+        elif self._adjacency[origin][destination][1] == route_id:
+            best = min(parallel, key=parallel.get)
+            self._adjacency[origin][destination] = (parallel[best], best)
+
+        for tree in self._trees.values():
+            if tree[1].get(destination) == (origin, route_id):
+                self._repair(tree, destination)
+
+    def shortest_path(self, origin_id, destination_id):
+        """
+        Devuelve el camino de menor coste entre dos centros.
+
+        Args:
+            origin_id (str): ID del centro de origen.
+            destination_id (str): ID del centro de destino.
+
+        Returns:
+            tuple | None: (lista de route_id en orden de recorrido, coste total), o None si
+            no hay camino. Si origen y destino coinciden, el camino está vacío y cuesta 0.
+        """
+        distances, arrivals, _children = self._tree(origin_id)
+        if destination_id not in distances:
+            return None
+
+        route_ids = []
+        center_id = destination_id
+        while center_id != origin_id:
+            center_id, route_id = arrivals[center_id]
+            route_ids.append(route_id)
+        route_ids.reverse()
+        return route_ids, distances[destination_id]
+
+    def _tree(self, origin_id):
+        """Devuelve (y memoriza) el árbol de caminos mínimos desde `origin_id`."""
+        tree = self._trees.get(origin_id)
+        if tree is not None:
+            self._trees.move_to_end(origin_id)
+            return tree
+
+        tree = self._trees[origin_id] = ({origin_id: 0}, {}, {})
+        self._propagate(tree, [(0, origin_id)])
+        if len(self._trees) > self._max_cached_origins:
+            self._trees.popitem(last=False)
+        return tree
+
+    def _repair(self, tree, root):
+        """
+        Recalcula la rama del árbol que colgaba de `root` tras perder su arista de llegada.
+
+        Los centros de la rama se vuelven a alcanzar desde sus vecinos de fuera de ella
+        (que conservan su coste) y se propaga Dijkstra solo dentro de la rama.
+        """
+        distances, arrivals, children = tree
+        children[arrivals[root][0]].discard(root)
+        branch = [root]
+        for center_id in branch:
+            branch.extend(children.pop(center_id, ()))
+        for center_id in branch:
+            del distances[center_id]
+            del arrivals[center_id]
+
+        seeds = []
+        for center_id in branch:
+            best = None
+            for previous in self._incoming.get(center_id, ()):
+                if previous in distances:
+                    cost, route_id = self._adjacency[previous][center_id]
+                    candidate = distances[previous] + cost
+                    if best is None or candidate < best[0]:
+                        best = (candidate, previous, route_id)
+            if best is not None:
+                distances[center_id] = best[0]
+                _link(tree, center_id, best[1], best[2])
+                seeds.append((best[0], center_id))
+        heapq.heapify(seeds)
+        self._propagate(tree, seeds)
+
+    def _propagate(self, tree, heap):
+        """Dijkstra desde los centros de `heap` (coste, center_id), mejorando solo los que bajan de coste."""
+        distances = tree[0]
+        adjacency = self._adjacency
+        while heap:
+            distance, center_id = heapq.heappop(heap)
+            if distance > distances[center_id]:
+                continue
+            for neighbour, (cost, route_id) in adjacency.get(center_id, {}).items():
+                candidate = distance + cost
+                if candidate < distances.get(neighbour, _INFINITY):
+                    distances[neighbour] = candidate
+                    _link(tree, neighbour, center_id, route_id)
+                    heapq.heappush(heap, (candidate, neighbour))
+
@@ -13,5 +13,8 @@ class RouteRepository:
     def get_by_route_id(self, route_id):
         raise NotImplementedError
 
+    def list_by_origin(self, center_id):
+        raise NotImplementedError
+
     def list_all(self):
         raise NotImplementedError
\ No newline at end of file
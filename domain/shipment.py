@@ -2,6 +2,70 @@
 """Dominio: Entidad base que representa un envío en el sistema logístico."""
 
 import re
+import time
+
+from logistica.domain.shipment_types import SHIPMENT_TYPES
+
+# Estados del ciclo de vida. Constantes compartidas: todos los envíos (y sus historiales)
+# referencian estos mismos objetos str en lugar de guardar copias propias.
+REGISTERED = "REGISTERED"
+IN_TRANSIT = "IN_TRANSIT"
+DELIVERED = "DELIVERED"
+
+STATUSES = (REGISTERED, IN_TRANSIT, DELIVERED)
+_CANONICAL_STATUSES = {status: status for status in STATUSES}
+
+# Historial compacto: cada transición es un único int con el código del estado (su posición
+# en STATUSES) en los 2 bits bajos y el instante, en milisegundos desde epoch, en el resto.
+# Un instante 0 indica que se desconoce (p. ej. historial guardado antes de registrar horas).
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+_CODE_BITS = 2
+_CODE_MASK = (1 << _CODE_BITS) - 1
+
+# Validador del código de seguimiento compilado una sola vez (RN-035)
+_TRACKING_CODE_PATTERN = re.compile(r'^[A-Z]{3}\d{3}')
+
+
+def _pack_transition(status, epoch):
+    """Codifica una transición (estado, epoch en segundos o None) como un único int."""
+    code = _STATUS_CODES.get(status)
+    if code is None:
+        raise ValueError(f"Estado desconocido en el historial: {status}")
+    millis = 0 if epoch is None else round(epoch * 1000)
+    return (millis << _CODE_BITS) | code
+
+
+# Historial inicial (tupla con la transición de registro) del último milisegundo en que se
+# registró un envío: los envíos registrados en el mismo milisegundo comparten la misma tupla,
+# de modo que un envío recién registrado no ocupa más que cuando el historial no llevaba horas.
+_last_registration = (None, None)
+
+
+def _registration_history(epoch):
+    """Devuelve el historial inicial de un envío registrado en `epoch`, compartido por milisegundo."""
+    global _last_registration
+    millis = round(epoch * 1000)
+    last_millis, history = _last_registration
+    if last_millis != millis:
+        history = (_pack_transition(REGISTERED, epoch),)
+        _last_registration = (millis, history)
+    return history
+
+
+def _unpack_transition(transition):
+    """Decodifica una transición en (estado, epoch en segundos o None)."""
+    millis = transition >> _CODE_BITS
+    return STATUSES[transition & _CODE_MASK], (millis / 1000 if millis else None)
+
+
+def intern_status(status):
+    """
+    Devuelve la constante compartida equivalente a `status` (p. ej. el texto leído de la base de datos).
+
+    Los valores desconocidos se devuelven sin cambios.
+    """
+    return _CANONICAL_STATUSES.get(status, status)
+
 
 class Shipment:
     """
@@ -18,8 +82,23 @@ class Shipment:
     2. La prioridad siempre está en el rango {1, 2, 3}
     3. Las transiciones de estado siguen una secuencia estricta
     4. El historial de estados es completo e inmutable para consulta
+
+    Representación compacta: la jerarquía usa `__slots__` (sin `__dict__` por instancia),
+    los estados son las constantes compartidas del módulo y el historial es una tupla de
+    enteros que codifican cada transición (estado y momento) en un solo objeto.
     """
 
+    __slots__ = (
+        "__tracking_code", "__sender", "__recipient",
+        "_current_status", "_status_history", "_priority", "_assigned_route", "_current_center_id",
+    )
+
+    # Tabla de transiciones válidas (RN-007), compartida por todas las instancias
+    _TRANSITIONS = {
+        REGISTERED: IN_TRANSIT,
+        IN_TRANSIT: DELIVERED,
+    }
+
     def __init__(self, tracking_code, sender, recipient, priority=1):
         """
         Inicializa una nueva instancia de Shipment con validaciones de negocio.
@@ -45,7 +124,7 @@ class Shipment:
         if not isinstance(tracking_code, str) or not tracking_code.strip():
             raise ValueError("El código de seguimiento no puede estar vacío.")
         tracking_code = tracking_code.upper().strip()
-        if not re.match(r'^[A-Z]{3}\d{3}', tracking_code):
+        if not _TRACKING_CODE_PATTERN.match(tracking_code):
             raise ValueError("El código de seguimiento debe tener 3 letras mayúsculas seguidas de 3 dígitos (Ej. ABC123).")
 
         if not sender or not isinstance(sender, str) or not sender.strip():
@@ -61,11 +140,13 @@ class Shipment:
         self.__recipient = recipient
 
         # Regla de negocio: estado inicial siempre REGISTERED (RN-008)
-        self._current_status = "REGISTERED"
+        self._current_status = REGISTERED
 
         # Historial de estados para trazabilidad completa
-        # Se inicializa con el primer estado para mantener registro desde la creación
-        self._status_history = [self._current_status]
+        # Se inicializa con el primer estado y el momento del registro
+        # (tupla de transiciones codificadas, compartida con los envíos registrados en el mismo
+        # milisegundo; cada transición crea una tupla nueva)
+        self._status_history = _registration_history(time.time())
 
         # Prioridad mutable pero con validaciones en métodos específicos
         self._priority = priority
@@ -74,6 +155,51 @@ class Shipment:
         # Se mantiene como string (ID de ruta) para evitar acoplamiento circular
         self._assigned_route = None
 
+        # ID del centro que tiene el envío en su inventario (lo gestiona Center), None si no está en ninguno.
+        # Como la ruta, se guarda como string: el envío no referencia al centro ni le avisa de sus cambios
+        self._current_center_id = None
+
+    @classmethod
+    def from_record(cls, tracking_code, sender, recipient, priority, current_status, status_history,
+                    assigned_route=None, status_times=None, current_center_id=None):
+        """
+        Reconstruye un envío a partir de datos ya validados por el almacenamiento.
+
+        Vía rápida para la hidratación desde repositorios: no vuelve a aplicar las
+        validaciones del constructor (patrón del código, campos vacíos, prioridad),
+        que ya se comprobaron al registrar el envío. No debe usarse con datos externos.
+
+        Args:
+            tracking_code (str): Código de seguimiento, ya normalizado.
+            sender (str): Remitente.
+            recipient (str): Destinatario.
+            priority (int): Prioridad almacenada.
+            current_status (str): Estado actual.
+            status_history (Iterable[str]): Historial de estados, del más antiguo al más reciente.
+            assigned_route (str, opcional): ID de la ruta asignada.
+            status_times (Iterable[float], opcional): Momento (epoch en segundos, o None si se
+                desconoce) de cada transición de `status_history`. Si se omite, se desconocen todos.
+            current_center_id (str, opcional): ID del centro en cuyo inventario está el envío.
+
+        Returns:
+            Shipment: Instancia de `cls` (Shipment o subclase).
+        """
+        shipment = cls.__new__(cls)
+        shipment.__tracking_code = tracking_code
+        shipment.__sender = sender
+        shipment.__recipient = recipient
+        shipment._priority = priority
+        shipment._current_status = _CANONICAL_STATUSES.get(current_status, current_status)
+        if status_times is None:
+            shipment._status_history = tuple([_pack_transition(status, None) for status in status_history])
+        else:
+            shipment._status_history = tuple([
+                _pack_transition(status, epoch) for status, epoch in zip(status_history, status_times)
+            ])
+        shipment._assigned_route = assigned_route
+        shipment._current_center_id = current_center_id
+        return shipment
+
     @property
     def tracking_code(self):
         """Devuelve el código de seguimiento único."""
@@ -123,6 +249,15 @@ class Shipment:
         """
         return self._assigned_route
 
+    @property
+    def current_center_id(self):
+        """Devuelve el ID del centro en cuyo inventario está el envío o None.
+
+        Lo mantiene el propio Center al recibir y despachar el envío, y los
+        repositorios que guardan el centro lo restauran al hidratar.
+        """
+        return self._current_center_id
+
     @property
     def shipment_type(self):
         """Identifica el tipo de envío. Por defecto 'STANDARD'.
@@ -154,11 +289,11 @@ class Shipment:
         # Validar que la transición sea permitida antes de modificar estado
         self.can_change_to(new_status_format)
 
-        self._current_status = new_status_format
+        self._current_status = _CANONICAL_STATUSES[new_status_format]
 
-        # Registrar en historial para trazabilidad completa
+        # Registrar en historial, con el momento de la transición, para trazabilidad completa
         # El historial es de solo consulta, no se puede modificar externamente
-        self._status_history.append(self._current_status)
+        self._status_history += (_pack_transition(self._current_status, time.time()),)
 
     def can_change_to(self, new_status):
         """
@@ -174,14 +309,10 @@ class Shipment:
             ValueError: Si la transición no es permitida.
         """
         new_status_format = new_status.upper()
-        valid_transitions = {
-            "REGISTERED": "IN_TRANSIT",
-            "IN_TRANSIT": "DELIVERED"
-        }
 
-        # Regla de negocio: solo transiciones definidas en valid_transitions son permitidas
+        # Regla de negocio: solo transiciones definidas en _TRANSITIONS son permitidas
         # Esto asegura un flujo de trabajo lógico y predecible
-        if valid_transitions.get(self._current_status) != new_status_format:
+        if self._TRANSITIONS.get(self._current_status) != new_status_format:
             raise ValueError(f"Transición no permitida: de {self._current_status} a {new_status_format}")
 
     def assign_route(self, new_assigned_route):
@@ -232,7 +363,7 @@ class Shipment:
         Returns:
             bool: True si el estado es DELIVERED (estado final del ciclo de vida).
         """
-        return self._current_status == "DELIVERED"
+        return self._current_status == DELIVERED
 
     def get_status_history(self):
         """
@@ -244,7 +375,61 @@ class Shipment:
         Nota: Devuelve copia para mantener encapsulamiento. El historial es
         inmutable desde fuera de la clase para garantizar trazabilidad confiable.
         """
-        return self._status_history.copy()
+        return [STATUSES[transition & _CODE_MASK] for transition in self._status_history]
+
+    def get_status_timeline(self):
+        """
+        Devuelve el historial de estados junto con el momento de cada transición.
+
+        Returns:
+            List[tuple]: Pares (estado, epoch en segundos), del más antiguo al más reciente.
+            El epoch es None si no se conoce (historiales guardados antes de registrar horas).
+        """
+        return [_unpack_transition(transition) for transition in self._status_history]
+
+    def time_in_state(self, status, now=None):
+        """
+        Calcula cuánto tiempo ha permanecido el envío en un estado.
+
+        Si el envío sigue en ese estado, cuenta hasta `now`.
+
+        Args:
+            status (str): Estado a consultar (ej. 'REGISTERED').
+            now (float, opcional): Instante de referencia (epoch). Por defecto, el actual.
+
+        Returns:
+            float | None: Segundos en el estado, o None si el envío nunca estuvo en él
+            o falta alguna de las marcas de tiempo necesarias.
+        """
+        status = status.upper()
+        timeline = self.get_status_timeline()
+        total = None
+        for position, (entered_status, entered_at) in enumerate(timeline):
+            if entered_status != status:
+                continue
+            if position + 1 < len(timeline):
+                left_at = timeline[position + 1][1]
+            else:
+                left_at = time.time() if now is None else now
+            if entered_at is None or left_at is None:
+                return None
+            total = (total or 0) + (left_at - entered_at)
+        return total
+
+    def time_to_delivery(self):
+        """
+        Calcula el tiempo transcurrido entre el registro y la entrega del envío.
+
+        Returns:
+            float | None: Segundos desde REGISTERED hasta DELIVERED, o None si el envío
+            no se ha entregado o falta alguna de las marcas de tiempo.
+        """
+        timeline = self.get_status_timeline()
+        delivered_at = next((epoch for status, epoch in timeline if status == DELIVERED), None)
+        registered_at = timeline[0][1] if timeline and timeline[0][0] == REGISTERED else None
+        if delivered_at is None or registered_at is None:
+            return None
+        return delivered_at - registered_at
 
     def increase_priority(self):
         """
@@ -291,16 +476,12 @@ class Shipment:
 
         Returns:
             Shipment: Instancia de Shipment o de alguna de sus subclases.
+
+        Raises:
+            ValueError: Si el tipo no está en el registro de tipos (`SHIPMENT_TYPES`) o los datos no son válidos.
         """
-        from logistica.domain.fragile_shipment import FragileShipment
-        from logistica.domain.express_shipment import ExpressShipment
+        # Búsqueda O(1) en el registro: cada tipo aporta su propia fábrica
+        return SHIPMENT_TYPES.create(tracking_code, sender, recipient, priority, shipment_type)
 
-        shipment_type = shipment_type.lower()
-        if shipment_type == "standard":
-            return Shipment(tracking_code, sender, recipient, priority)
-        elif shipment_type == "fragile":
-            return FragileShipment(tracking_code, sender, recipient, priority)
-        elif shipment_type == "express":
-            return ExpressShipment(tracking_code, sender, recipient)
-        else:
-            raise ValueError("Tipo de envío no válido.")
\ No newline at end of file
+
+SHIPMENT_TYPES.register("STANDARD", Shipment)
\ No newline at end of file
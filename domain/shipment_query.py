@@ -0,0 +1,176 @@
+# domain/shipment_query.py
+
+"""Dominio: Consulta filtrada, ordenada y paginada de envíos."""
+
+# Criterios de ordenación admitidos; el código de seguimiento desempata y hace único cada cursor
+ORDER_BY_TRACKING_CODE = "tracking_code"
+ORDER_BY_PRIORITY = "priority"
+_ORDERS = (ORDER_BY_TRACKING_CODE, ORDER_BY_PRIORITY)
+
+_DEFAULT_LIMIT = 50
+
+
+class ShipmentQuery:
+    """
+    Filtros, orden y página de una consulta de envíos (objeto valor inmutable).
+
+    Los repositorios la resuelven en su propio almacenamiento (`find(query)`): SQLite con
+    `WHERE`/`ORDER BY`/`LIMIT` sobre índices y la memoria con índices secundarios, de modo
+    que una página cuesta lo mismo con mil envíos que con un millón.
+
+    Orden:
+    - `tracking_code`: por código de seguimiento (los códigos se guardan en mayúsculas,
+      así que coincide con el orden alfabético sin distinguir mayúsculas de RN-022).
+    - `priority`: de mayor a menor prioridad y, a igual prioridad, por código.
+
+    Paginación por cursor (keyset): `after` es la clave de orden del último envío de la
+    página anterior (`cursor_of`), no un desplazamiento; pedir la página siguiente no
+    recorre las anteriores y no salta ni repite envíos aunque se registren otros entre medias.
+    """
+
+    __slots__ = ("_status", "_shipment_type", "_min_priority", "_max_priority", "_route_id",
+                 "_center_id", "_code_prefix", "_order_by", "_after", "_limit")
+
+    def __init__(self, status=None, shipment_type=None, min_priority=None, max_priority=None,
+                 route_id=None, center_id=None, code_prefix=None, order_by=ORDER_BY_TRACKING_CODE,
+                 after=None, limit=_DEFAULT_LIMIT):
+        """
+        Args:
+            status (str, opcional): Estado actual (REGISTERED, IN_TRANSIT, DELIVERED).
+            shipment_type (str, opcional): Tipo de envío (STANDARD, FRAGILE, EXPRESS...).
+            min_priority (int, opcional): Prioridad mínima, incluida.
+            max_priority (int, opcional): Prioridad máxima, incluida.
+            route_id (str, opcional): Ruta asignada.
+            center_id (str, opcional): Centro en cuyo inventario está el envío.
+            code_prefix (str, opcional): Prefijo del código de seguimiento.
+            order_by (str): `tracking_code` (por defecto) o `priority`.
+            after (str | tuple, opcional): Cursor devuelto por `cursor_of` para la página anterior.
+            limit (int): Número máximo de envíos de la página.
+
+        Raises:
+            ValueError: Si el orden no es válido, el límite no es positivo, el rango de
+                prioridades está vacío o el cursor no corresponde al orden.
+        """
+        if order_by not in _ORDERS:
+            raise ValueError(f"Orden no válido: '{order_by}'. Opciones: {', '.join(_ORDERS)}.")
+        if limit < 1:
+            raise ValueError("El límite de la consulta debe ser positivo.")
+        if min_priority is not None and max_priority is not None and min_priority > max_priority:
+            raise ValueError("La prioridad mínima no puede ser mayor que la máxima.")
+        if after is not None:
+            after = self._check_cursor(order_by, after)
+
+        self._status = _normalize(status)
+        self._shipment_type = _normalize(shipment_type)
+        self._min_priority = min_priority
+        self._max_priority = max_priority
+        self._route_id = _normalize(route_id)
+        self._center_id = _normalize(center_id)
+        self._code_prefix = _normalize(code_prefix)
+        self._order_by = order_by
+        self._after = after
+        self._limit = limit
+
+    @staticmethod
+    def _check_cursor(order_by, after):
+        """Valida que el cursor tenga la forma de la clave del orden elegido."""
+        if order_by == ORDER_BY_TRACKING_CODE:
+            if not isinstance(after, str):
+                raise ValueError("El cursor de una consulta por código es un código de seguimiento.")
+            return after
+        if not (isinstance(after, tuple) and len(after) == 2):
+            raise ValueError("El cursor de una consulta por prioridad es una tupla (prioridad, código).")
+        return after
+
+    @property
+    def status(self):
+        """Estado pedido, o None."""
+        return self._status
+
+    @property
+    def shipment_type(self):
+        """Tipo de envío pedido, o None."""
+        return self._shipment_type
+
+    @property
+    def min_priority(self):
+        """Prioridad mínima (incluida), o None."""
+        return self._min_priority
+
+    @property
+    def max_priority(self):
+        """Prioridad máxima (incluida), o None."""
+        return self._max_priority
+
+    @property
+    def route_id(self):
+        """Ruta asignada pedida, o None."""
+        return self._route_id
+
+    @property
+    def center_id(self):
+        """Centro pedido, o None."""
+        return self._center_id
+
+    @property
+    def code_prefix(self):
+        """Prefijo del código de seguimiento, o None."""
+        return self._code_prefix
+
+    @property
+    def order_by(self):
+        """Criterio de ordenación."""
+        return self._order_by
+
+    @property
+    def after(self):
+        """Cursor de la página anterior, o None para la primera."""
+        return self._after
+
+    @property
+    def limit(self):
+        """Número máximo de envíos de la página."""
+        return self._limit
+
+    def cursor_of(self, shipment):
+        """Devuelve el cursor de un envío: su clave en el orden de la consulta."""
+        if self._order_by == ORDER_BY_TRACKING_CODE:
+            return shipment.tracking_code
+        return (shipment.priority, shipment.tracking_code)
+
+    def next_page(self, cursor):
+        """Devuelve la misma consulta a partir del cursor indicado (la página siguiente)."""
+        return ShipmentQuery(self._status, self._shipment_type, self._min_priority, self._max_priority,
+                             self._route_id, self._center_id, self._code_prefix, self._order_by,
+                             cursor, self._limit)
+
+    def matches(self, shipment):
+        """
+        Indica si un envío cumple los filtros (sin tener en cuenta el cursor ni el límite).
+
+        Es la semántica de referencia de la consulta. El repositorio en memoria la usa para
+        confirmar sobre cada objeto los candidatos que le dan sus índices.
+        """
+        if self._status is not None and shipment.current_status != self._status:
+            return False
+        if self._shipment_type is not None and shipment.shipment_type != self._shipment_type:
+            return False
+        if self._min_priority is not None and shipment.priority < self._min_priority:
+            return False
+        if self._max_priority is not None and shipment.priority > self._max_priority:
+            return False
+        if self._route_id is not None and shipment.assigned_route != self._route_id:
+            return False
+        if self._center_id is not None and shipment.current_center_id != self._center_id:
+            return False
+        if self._code_prefix is not None and not shipment.tracking_code.startswith(self._code_prefix):
+            return False
+        return True
+
+
+def _normalize(value):
+    """Los identificadores, estados y tipos se guardan en mayúsculas; None o vacío = sin filtro."""
+    if value is None:
+        return None
+    value = value.strip().upper()
+    return value or None
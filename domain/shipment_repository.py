@@ -1,17 +1,58 @@
 # domain/repository.py
 
+# Campos por los que se pueden agrupar los recuentos de count_by(*fields)
+COUNT_FIELDS = ("status", "type", "priority", "route")
+
+
+def check_count_fields(fields):
+    """
+    Valida los campos de un count_by: al menos uno y todos en COUNT_FIELDS.
+
+    Raises:
+        ValueError: Si no hay campos o alguno no es válido.
+    """
+    if not fields:
+        raise ValueError(f"Indica al menos un campo de recuento. Opciones: {', '.join(COUNT_FIELDS)}.")
+    for field in fields:
+        if field not in COUNT_FIELDS:
+            raise ValueError(f"Campo de recuento no válido: '{field}'. Opciones: {', '.join(COUNT_FIELDS)}.")
+
+
 class ShipmentRepository:
     def add(self, shipment):
         raise NotImplementedError
 
+    def add_many(self, shipments):
+        raise NotImplementedError
+
     def update(self, shipment):
         raise NotImplementedError
 
+    def update_many(self, shipments):
+        raise NotImplementedError
+
     def remove(self, tracking_code):
         raise NotImplementedError
 
     def get_by_tracking_code(self, tracking_code):
         raise NotImplementedError
 
+    def get_many(self, tracking_codes, ignore_missing=False):
+        raise NotImplementedError
+
+    def find(self, query):
+        """
+        Devuelve una página de envíos según `query` (ShipmentQuery), en su orden.
+
+        El coste depende de la implementación:
+        - Memoria y SQLite: índices secundarios, el coste depende del tamaño de la página.
+        - Columnar: recorrido O(n) de las columnas; rechaza `center_id` con ValueError
+          porque no guarda el centro actual de los envíos.
+        """
+        raise NotImplementedError
+
+    def count_by(self, *fields):
+        raise NotImplementedError
+
     def list_all(self):
         raise NotImplementedError
\ No newline at end of file
@@ -0,0 +1,169 @@
+# domain/shipment_types.py
+
+"""Dominio: Registro de tipos de envío (código -> clase, fábrica e hidratación)."""
+
+from importlib import import_module
+
+# Módulos que registran los tipos de envío del sistema al importarse. Se importan la primera
+# vez que se busca un tipo desconocido, porque las subclases importan el módulo de Shipment
+_BUILTIN_MODULES = (
+    "logistica.domain.shipment",
+    "logistica.domain.fragile_shipment",
+    "logistica.domain.express_shipment",
+)
+
+
+class ShipmentType:
+    """
+    Entrada del registro: cómo se crea y cómo se reconstruye un tipo de envío.
+
+    Attributes:
+        code (str): Código del tipo en mayúsculas (el valor de `shipment_type`).
+        shipment_class (type): Subclase de Shipment.
+        factory (callable): `factory(tracking_code, sender, recipient, priority)` -> envío nuevo validado.
+        hydrate (callable): Misma firma que `Shipment.from_record`; reconstruye un envío guardado.
+    """
+
+    __slots__ = ("code", "shipment_class", "factory", "hydrate")
+
+    def __init__(self, code, shipment_class, factory, hydrate):
+        self.code = code
+        self.shipment_class = shipment_class
+        self.factory = factory
+        self.hydrate = hydrate
+
+
+class ShipmentTypeRegistry:
+    """
+    Registro de los tipos de envío disponibles, consultado en O(1) por su código.
+
+    Lo usan `Shipment.create` y los repositorios al hidratar filas, de modo que un tipo
+    nuevo (p. ej. refrigerado) solo necesita registrarse en su propio módulo:
+
+        SHIPMENT_TYPES.register("REFRIGERATED", RefrigeratedShipment)
+
+    Los códigos se aceptan sin distinguir mayúsculas; las formas en mayúsculas y en
+    minúsculas se indexan al registrar, así que las búsquedas habituales no normalizan.
+    """
+
+    def __init__(self, builtin_modules=()):
+        """
+        Args:
+            builtin_modules (Iterable[str], opcional): Módulos que registran tipos al importarse;
+                se cargan una sola vez, al buscar por primera vez un tipo que no está registrado.
+        """
+        self._types = {}
+        self._codes = []
+        self._builtin_modules = tuple(builtin_modules)
+
+    def register(self, code, shipment_class, factory=None, hydrate=None):
+        """
+        Registra un tipo de envío.
+
+        Args:
+            code (str): Código del tipo (se guarda en mayúsculas).
+            shipment_class (type): Subclase de Shipment cuyo `shipment_type` es `code`.
+            factory (callable, opcional): Crea un envío nuevo a partir de
+                (tracking_code, sender, recipient, priority). Por defecto, el constructor de la clase.
+            hydrate (callable, opcional): Reconstruye un envío guardado. Por defecto,
+                `shipment_class.from_record`.
+
+        Raises:
+            ValueError: Si el código ya está registrado.
+        """
+        code = code.strip().upper()
+        if code in self._types:
+            raise ValueError(f"El tipo de envío '{code}' ya está registrado.")
+        entry = ShipmentType(code, shipment_class, factory or shipment_class, hydrate or shipment_class.from_record)
+        self._types[code] = entry
+        self._types[code.lower()] = entry
+        self._codes.append(code)
+
+    def __contains__(self, code):
+        """Indica si hay un tipo registrado con ese código."""
+        return self._find(code) is not None
+
+    def codes(self):
+        """Códigos registrados, en orden de registro."""
+        self._load_builtins()
+        return tuple(self._codes)
+
+    def get(self, code):
+        """
+        Devuelve la entrada del registro de un tipo.
+
+        Raises:
+            ValueError: Si el tipo no está registrado.
+        """
+        entry = self._find(code)
+        if entry is None:
+            raise ValueError("Tipo de envío no válido.")
+        return entry
+
+    def create(self, tracking_code, sender, recipient, priority=1, shipment_type="standard"):
+        """Crea un envío nuevo del tipo indicado (mismas reglas que `Shipment.create`)."""
+        entry = self._types.get(shipment_type)
+        if entry is None:
+            entry = self.get(shipment_type)
+        return entry.factory(tracking_code, sender, recipient, priority)
+
+    def create_many(self, specs):
+        """
+        Crea envíos en bloque, sin detenerse en las especificaciones incorrectas.
+
+        Args:
+            specs (Iterable): Especificaciones como diccionario con las claves de `create`
+                (tracking_code, sender, recipient y, opcionalmente, priority y shipment_type)
+                o como tupla en ese mismo orden.
+
+        Returns:
+            List[Tuple]: Una tupla (código, envío, error) por especificación y en el mismo orden;
+            envío es None y error el mensaje si la especificación no es válida.
+        """
+        results = []
+        create = self.create
+        for spec in specs:
+            tracking_code = None
+            try:
+                if isinstance(spec, dict):
+                    tracking_code = spec.get("tracking_code")
+                    shipment = create(**spec)
+                else:
+                    tracking_code = spec[0] if spec else None
+                    shipment = create(*spec)
+            except (ValueError, TypeError, AttributeError) as e:
+                results.append((tracking_code, None, str(e)))
+                continue
+            results.append((shipment.tracking_code, shipment, None))
+        return results
+
+    def hydrator(self, code):
+        """
+        Devuelve la función que reconstruye los envíos guardados de un tipo.
+
+        Raises:
+            ValueError: Si el tipo no está registrado.
+        """
+        entry = self._types.get(code)
+        if entry is None:
+            entry = self.get(code)
+        return entry.hydrate
+
+    def _find(self, code):
+        """Busca un tipo por su código; carga los tipos del sistema si aún no lo están."""
+        entry = self._types.get(code)
+        if entry is None and isinstance(code, str):
+            self._load_builtins()
+            entry = self._types.get(code) or self._types.get(code.strip().upper())
+        return entry
+
+    def _load_builtins(self):
+        """Importa (una sola vez) los módulos que registran los tipos del sistema."""
+        if self._builtin_modules:
+            modules, self._builtin_modules = self._builtin_modules, ()
+            for module in modules:
+                import_module(module)
+
+
+# Registro de tipos de envío del sistema
+SHIPMENT_TYPES = ShipmentTypeRegistry(_BUILTIN_MODULES)
@@ -0,0 +1,34 @@
+# domain/unit_of_work.py
+
+class UnitOfWork:
+    """
+    Contrato de unidad de trabajo: agrupa las escrituras de varios repositorios
+    de un mismo caso de uso para que se confirmen (o se descarten) juntas.
+
+    Se usa como gestor de contexto y es reentrante: si un caso de uso abre la
+    unidad de trabajo dentro de otro, solo el bloque más externo confirma.
+
+        with unit_of_work:
+            route_repo.update(route)
+            shipment_repo.update(shipment)
+    """
+
+    def begin(self):
+        raise NotImplementedError
+
+    def commit(self):
+        raise NotImplementedError
+
+    def rollback(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
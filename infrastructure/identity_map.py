@@ -0,0 +1,71 @@
+# infrastructure/identity_map.py
+"""
+Mapa de identidad compartido por los repositorios SQLite.
+
+Sin él, cada repositorio reconstruye sus propias copias de las filas: en un mismo
+caso de uso el mismo envío podía existir como tres objetos `Shipment` distintos
+(el del inventario del centro origen, el del centro destino y el del repositorio
+de envíos), y un cambio aplicado a uno no se veía en los demás.
+
+El mapa guarda, por tipo de entidad y clave, el objeto ya cargado: los repositorios
+lo consultan antes de ir a la base de datos y registran en él lo que reconstruyen.
+Su alcance es la petición: la capa de presentación llama a `clear()` al terminar
+cada petición (y la unidad de trabajo SQLite al deshacer una transacción), de modo
+que nunca se sirven objetos de peticiones anteriores.
+"""
+
+import threading
+
+
+class IdentityMap:
+    """
+    Mapa (tipo de entidad, clave) -> objeto, independiente para cada hilo.
+
+    Cada hilo atiende su propia petición, así que cada uno tiene su propio mapa.
+    Los tipos usados por los repositorios son "shipment", "center" y "route".
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _entities(self, kind):
+        maps = getattr(self._local, "maps", None)
+        if maps is None:
+            maps = self._local.maps = {}
+        entities = maps.get(kind)
+        if entities is None:
+            entities = maps[kind] = {}
+        return entities
+
+    def get(self, kind, key):
+        """Devuelve el objeto registrado para `key`, o None si no se ha cargado en esta petición."""
+        return self._entities(kind).get(key)
+
+    def add(self, kind, key, entity):
+        """Registra `entity` bajo `key` y la devuelve."""
+        self._entities(kind)[key] = entity
+        return entity
+
+    def remove(self, kind, key):
+        """Olvida la entidad registrada bajo `key`, si la hay."""
+        self._entities(kind).pop(key, None)
+
+    def clear(self):
+        """Vacía el mapa del hilo actual (fin de la petición)."""
+        self._local.maps = {}
+
+
+class NullIdentityMap:
+    """Mapa de identidad desactivado: nunca recuerda nada (comportamiento por defecto de los repositorios)."""
+
+    def get(self, kind, key):
+        return None
+
+    def add(self, kind, key, entity):
+        return entity
+
+    def remove(self, kind, key):
+        pass
+
+    def clear(self):
+        pass
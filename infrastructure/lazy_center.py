@@ -0,0 +1,97 @@
+# infrastructure/lazy_center.py
+"""
+Referencia perezosa a un centro logístico.
+
+Al reconstruir una ruta desde SQLite basta con conocer la identidad de sus centros
+(ID, nombre y ubicación); el inventario completo solo se necesita cuando el centro
+se usa de verdad (recibir, despachar o listar envíos). `LazyCenter` se comporta como
+un `Center` normal pero difiere la carga del inventario hasta ese primer acceso.
+"""
+
+from logistica.domain.center import Center
+from logistica.infrastructure.sqlite_membership import remember_persisted_codes
+
+
+class LazyCenter(Center):
+    """
+    Centro cuyo inventario se carga bajo demanda mediante una función `loader`.
+
+    Las propiedades de identidad (`center_id`, `name`, `location`) están disponibles
+    desde el principio sin ninguna consulta. Los métodos que dependen del inventario
+    invocan `loader(center_id)` la primera vez y reutilizan el resultado después.
+    """
+
+    def __init__(self, center_id, name, location, loader):
+        """
+        Args:
+            center_id (str): ID del centro.
+            name (str): Nombre del centro.
+            location (str): Ubicación del centro.
+            loader (callable): Función que recibe el ID del centro y devuelve la lista
+                de envíos presentes en él.
+        """
+        super().__init__(center_id, name, location)
+        self._loader = loader
+        self._loaded = False
+
+    @classmethod
+    def from_record(cls, center_id, name, location, loader):
+        """Crea la referencia perezosa a partir de datos ya validados por el almacenamiento (sin revalidar)."""
+        center = super().from_record(center_id, name, location)
+        center._loader = loader
+        center._loaded = False
+        return center
+
+    @property
+    def is_loaded(self):
+        """Indica si el inventario ya se ha cargado desde el almacenamiento."""
+        return self._loaded
+
+    def _load(self):
+        """Carga el inventario una única vez."""
+        if not self._loaded:
+            self._loaded = True
+            # Bypass de receive_shipment: los envíos ya están validados en el almacenamiento
+            shipments = self._loader(self.center_id)
+            self._restore_shipments(shipments)
+            # Punto de partida para la escritura diferencial del inventario
+            remember_persisted_codes(self, (s.tracking_code for s in shipments))
+
+    def receive_shipment(self, shipment):
+        self._load()
+        super().receive_shipment(shipment)
+
+    def dispatch_shipment(self, shipment):
+        self._load()
+        return super().dispatch_shipment(shipment)
+
+    def refresh_shipment(self, shipment):
+        # Sin inventario cargado no hay contadores ni cola que corregir: se calcularán al cargarlo
+        if self._loaded:
+            super().refresh_shipment(shipment)
+
+    def list_shipments(self):
+        self._load()
+        return super().list_shipments()
+
+    def has_shipment(self, tracking_code):
+        self._load()
+        return super().has_shipment(tracking_code)
+
+    @property
+    def shipment_count(self):
+        self._load()
+        return super().shipment_count
+
+    def count_by_type(self):
+        self._load()
+        return super().count_by_type()
+
+    def count_by_priority(self):
+        self._load()
+        return super().count_by_priority()
+
+    @property
+    def dispatch_queue(self):
+        self._load()
+        return super().dispatch_queue
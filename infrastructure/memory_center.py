@@ -110,6 +110,14 @@ class CenterRepositoryMemory(CenterRepository):
             raise EntityNotFoundError(f"No existe un centro con el identificador '{center_id}'.")
         return center
 
+    def get_if_loaded(self, center_id):
+        """
+        Devuelve el centro con ese ID, o None si no existe.
+
+        En memoria todos los centros están siempre cargados.
+        """
+        return self._by_center_id.get((center_id or "").strip().lower())
+
     def list_all(self):
         """
         Obtiene todos los centros logísticos almacenados en el repositorio.
@@ -121,4 +129,16 @@ class CenterRepositoryMemory(CenterRepository):
             La lista devuelta es una copia superficial. Modificar los objetos
             en la lista afectará a los objetos almacenados en el repositorio.
         """
-        return list(self._by_center_id.values())
\ No newline at end of file
+        return list(self._by_center_id.values())
+
+    def shipment_counts(self):
+        """
+        Número de envíos en el inventario de cada centro.
+
+        Cada Center mantiene su inventario al recibir y despachar envíos, así que basta con
+        leer su tamaño: O(número de centros).
+
+        Returns:
+            dict: Identificador del centro -> número de envíos (0 en los centros vacíos).
+        """
+        return {center.center_id: center.shipment_count for center in self._by_center_id.values()}
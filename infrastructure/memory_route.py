@@ -8,6 +8,7 @@ Esta implementación es case-insensitive para las consultas por ID de ruta, norm
 
 Attributes:
     _by_route_id (dict): Diccionario que mapea IDs de rutas (en minúsculas) a objetos Route.
+    _by_origin (dict): Índice ID del centro de origen -> {ID de ruta (en minúsculas) -> Route}.
 """
 
 from logistica.domain.route_repository import RouteRepository
@@ -31,6 +32,8 @@ class RouteRepositoryMemory(RouteRepository):
         Inicializa un nuevo repositorio en memoria vacío.
         """
         self._by_route_id = {}
+        # Índice por centro de origen (el origen de una ruta no cambia), para list_by_origin
+        self._by_origin = {}
 
     def add(self, route):
         """
@@ -48,6 +51,7 @@ class RouteRepositoryMemory(RouteRepository):
         if key in self._by_route_id:
             raise EntityAlreadyExistsError(f"Ya existe una ruta con identificador '{route.route_id}'")
         self._by_route_id[key] = route
+        self._by_origin.setdefault(route.origin_center.center_id, {})[key] = route
 
     def update(self, route):
         """
@@ -71,7 +75,11 @@ class RouteRepositoryMemory(RouteRepository):
 
         key = route_id.lower()
         if key in self._by_route_id:
-            del self._by_route_id[key]
+            route = self._by_route_id.pop(key)
+            routes_from_origin = self._by_origin[route.origin_center.center_id]
+            del routes_from_origin[key]
+            if not routes_from_origin:
+                del self._by_origin[route.origin_center.center_id]
         else:
             raise EntityNotFoundError(f"No existe una ruta con el identificador '{route_id}'.")
 
@@ -93,6 +101,18 @@ class RouteRepositoryMemory(RouteRepository):
             raise EntityNotFoundError(f"No existe una ruta con el identificador '{route_id}'.")
         return route
 
+    def list_by_origin(self, center_id):
+        """
+        Obtiene las rutas que salen de un centro, sin recorrer las demás.
+
+        Args:
+            center_id (str): ID del centro de origen (sin distinguir mayúsculas).
+
+        Returns:
+            Lista de las rutas (activas o no) con ese origen, en orden de inserción; vacía si no hay ninguna.
+        """
+        return list(self._by_origin.get((center_id or "").strip().upper(), {}).values())
+
     def list_all(self):
         """
         Obtiene todas las rutas almacenadas en el repositorio.
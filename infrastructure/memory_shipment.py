@@ -15,9 +15,17 @@ Attributes:
     (en minúsculas) a objetos Shipment o sus subtipos.
 """
 
-from logistica.domain.shipment_repository import ShipmentRepository
+from collections import Counter
+from heapq import merge
+
+from logistica.domain.shipment_repository import ShipmentRepository, check_count_fields
 from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_query import ORDER_BY_TRACKING_CODE
 from logistica.infrastructure.errores import EntityAlreadyExistsError, EntityNotFoundError
+from logistica.infrastructure.sorted_keys import SortedKeys
+
+# Campos con índice secundario, en el orden de la tupla que guarda _indexed por envío
+_INDEXED_FIELDS = ("status", "type", "route", "priority")
 
 class ShipmentRepositoryMemory(ShipmentRepository):
     """
@@ -43,6 +51,13 @@ class ShipmentRepositoryMemory(ShipmentRepository):
         sus códigos de seguimiento normalizados a minúsculas.
         """
         self._by_tracking_code = {}
+        # Índices para find(): todos los códigos en orden y, por cada campo indexado,
+        # valor -> códigos en orden. _indexed guarda los valores con los que está indexado cada código
+        self._codes = SortedKeys()
+        self._indexes = {field: {} for field in _INDEXED_FIELDS}
+        self._indexed = {}
+        # Recuentos para count_by(): número de envíos por cada combinación de valores indexados
+        self._counts = Counter()
 
     def add(self, shipment):
         """
@@ -58,12 +73,52 @@ class ShipmentRepositoryMemory(ShipmentRepository):
         if key in self._by_tracking_code:
             raise EntityAlreadyExistsError(f"Ya existe un envío con el código '{shipment.tracking_code}'.")
         self._by_tracking_code[key] = shipment
+        self._reindex(shipment)
+
+    def add_many(self, shipments):
+        """
+        Almacena varios envíos de una vez, sin detenerse en los códigos repetidos.
+
+        Args:
+            shipments (Iterable[Shipment]): Envíos a almacenar.
+
+        Returns:
+            dict: Posición en `shipments` -> EntityAlreadyExistsError de cada envío rechazado
+            porque su código ya existía (en el repositorio o antes en el mismo lote).
+        """
+        rejected = {}
+        by_tracking_code = self._by_tracking_code
+        for index, shipment in enumerate(shipments):
+            key = shipment.tracking_code.lower()
+            if key in by_tracking_code:
+                rejected[index] = EntityAlreadyExistsError(f"Ya existe un envío con el código '{shipment.tracking_code}'.")
+            else:
+                by_tracking_code[key] = shipment
+                self._reindex(shipment)
+        return rejected
 
     def update(self, shipment):
         """
-        En memoria el objeto ya está mutado por referencia; no hace nada.
+        En memoria el objeto ya está mutado por referencia; solo se actualizan los índices
+        de `find` con su estado, tipo, ruta y prioridad.
+        """
+        if shipment.tracking_code.lower() in self._by_tracking_code:
+            self._reindex(shipment)
+
+    def update_many(self, shipments):
+        """
+        Comprueba que todos los envíos existen y, como `update`, actualiza sus índices.
+
+        Raises:
+            EntityNotFoundError: Si algún envío no está en el repositorio.
         """
-        pass
+        shipments = list(shipments)
+        missing = [shipment.tracking_code for shipment in shipments
+                   if shipment.tracking_code.lower() not in self._by_tracking_code]
+        if missing:
+            raise EntityNotFoundError(f"No existen los envíos: {', '.join(missing)}.")
+        for shipment in shipments:
+            self._reindex(shipment)
 
     def remove(self, tracking_code):
         """
@@ -81,7 +136,7 @@ class ShipmentRepositoryMemory(ShipmentRepository):
 
         key = tracking_code.lower()
         if key in self._by_tracking_code:
-            del self._by_tracking_code[key]
+            self._unindex(self._by_tracking_code.pop(key).tracking_code)
         else:
             raise EntityNotFoundError(f"No existe un envío con código '{tracking_code}'.")
 
@@ -104,6 +159,33 @@ class ShipmentRepositoryMemory(ShipmentRepository):
             raise EntityNotFoundError(f"No existe un envío con código '{tracking_code}'.")
         return shipment
 
+    def get_many(self, tracking_codes, ignore_missing=False):
+        """
+        Recupera varios envíos por su código de seguimiento, en el orden pedido.
+
+        Args:
+            tracking_codes (Iterable[str]): Códigos de seguimiento a buscar.
+            ignore_missing (bool): Si es True, los códigos que no existen se omiten en lugar de fallar.
+
+        Returns:
+            List[Shipment]: Un envío por código encontrado, en el mismo orden que `tracking_codes`.
+
+        Raises:
+            EntityNotFoundError: Si falta algún envío (y `ignore_missing` es False); el mensaje
+                incluye todos los códigos que no existen.
+        """
+        by_tracking_code = self._by_tracking_code
+        shipments, missing = [], []
+        for tracking_code in tracking_codes:
+            shipment = by_tracking_code.get((tracking_code or "").strip().lower())
+            if shipment is None:
+                missing.append(tracking_code)
+            else:
+                shipments.append(shipment)
+        if missing and not ignore_missing:
+            raise EntityNotFoundError(f"No existen los envíos: {', '.join(missing)}.")
+        return shipments
+
     def list_all(self):
         """
         Obtiene todos los envíos almacenados en el repositorio.
@@ -117,4 +199,160 @@ class ShipmentRepositoryMemory(ShipmentRepository):
             a los objetos almacenados en el repositorio. Para obtener una copia profunda, implemente
             la lógica en la capa de aplicación según sea necesario.
         """
-        return list(self._by_tracking_code.values())
\ No newline at end of file
+        return list(self._by_tracking_code.values())
+
+    def find(self, query):
+        """
+        Devuelve una página de envíos que cumplen una consulta, resuelta con los índices.
+
+        Se recorre en orden el índice más pequeño entre los que restringen la consulta
+        (estado, tipo, ruta o el rango de prioridades), empezando en el cursor o en el
+        prefijo, y cada candidato se confirma sobre el propio envío (`query.matches`)
+        hasta completar la página: no se ordena nada ni se recorre el repositorio entero.
+        El centro no tiene índice (lo mantiene el Center sobre el objeto) y se comprueba
+        en cada candidato.
+
+        Los índices reflejan el estado guardado con `add`/`update`, igual que la base de
+        datos en el repositorio SQLite.
+
+        Args:
+            query (ShipmentQuery): Filtros, orden, cursor y límite.
+
+        Returns:
+            List[Shipment]: Como mucho `query.limit` envíos, en el orden de la consulta.
+        """
+        levels = sorted(level for level in self._indexes["priority"]
+                        if (query.min_priority is None or level >= query.min_priority)
+                        and (query.max_priority is None or level <= query.max_priority))
+        buckets = self._equality_buckets(query)
+        if buckets is None:
+            return []
+
+        if query.order_by == ORDER_BY_TRACKING_CODE:
+            start, inclusive = query.code_prefix, True
+            if query.after is not None and (start is None or query.after >= start):
+                start, inclusive = query.after, False
+            by_priority = [self._indexes["priority"][level] for level in levels]
+            candidates = min(buckets + [by_priority] if len(levels) < len(self._indexes["priority"]) else buckets,
+                             key=_candidate_count, default=[self._codes])
+            return self._collect(query, merge(*(keys.iter_from(start, inclusive) for keys in candidates)),
+                                 query.limit)
+
+        # Por prioridad: un nivel detrás de otro, de mayor a menor, cada uno en orden de código
+        page = []
+        for level in reversed(levels):
+            start, inclusive = query.code_prefix, True
+            if query.after is not None:
+                after_priority, after_code = query.after
+                if level > after_priority:
+                    continue
+                if level == after_priority and (start is None or after_code >= start):
+                    start, inclusive = after_code, False
+            keys = min(buckets + [[self._indexes["priority"][level]]], key=_candidate_count)[0]
+            page += self._collect(query, keys.iter_from(start, inclusive), query.limit - len(page), level)
+            if len(page) == query.limit:
+                break
+        return page
+
+    def count_by(self, *fields):
+        """
+        Cuenta los envíos agrupados por uno o varios campos, sin recorrerlos.
+
+        Los recuentos por combinación de estado, tipo, ruta y prioridad se mantienen al
+        guardar cada envío (`add`/`update`/`remove`), así que el coste depende del número de
+        combinaciones distintas, no del de envíos. El centro no es un campo de este
+        repositorio: su inventario lo cuenta el repositorio de centros (`shipment_counts`).
+
+        Args:
+            *fields (str): Campos de agrupación: "status", "type", "priority" o "route".
+
+        Returns:
+            dict: Valor -> número de envíos con un campo, o tupla de valores -> número de envíos
+            con varios. La ruta de los envíos sin asignar es None. Solo incluye grupos con envíos.
+
+        Raises:
+            ValueError: Si no se indica ningún campo o alguno no es válido.
+        """
+        check_count_fields(fields)
+        positions = [_INDEXED_FIELDS.index(field) for field in fields]
+        counts = Counter()
+        for values, total in self._counts.items():
+            key = tuple(values[position] for position in positions)
+            counts[key if len(key) > 1 else key[0]] += total
+        return dict(counts)
+
+    def _collect(self, query, codes, limit, priority=None):
+        """Toma de `codes` (en orden) los envíos que cumplen la consulta, hasta `limit`."""
+        page = []
+        by_tracking_code = self._by_tracking_code
+        prefix = query.code_prefix
+        for code in codes:
+            if prefix is not None and not code.startswith(prefix):
+                # Los códigos con el prefijo son consecutivos: el primero que no lo tiene cierra el rango
+                break
+            shipment = by_tracking_code[code.lower()]
+            if query.matches(shipment) and (priority is None or shipment.priority == priority):
+                page.append(shipment)
+                if len(page) == limit:
+                    break
+        return page
+
+    def _equality_buckets(self, query):
+        """
+        Índices de los filtros por igualdad de la consulta (cada uno como lista de un elemento).
+
+        Returns:
+            list | None: None si algún valor pedido no tiene ningún envío (la página está vacía).
+        """
+        buckets = []
+        for field, value in (("status", query.status), ("type", query.shipment_type), ("route", query.route_id)):
+            if value is not None:
+                keys = self._indexes[field].get(value)
+                if not keys:
+                    return None
+                buckets.append([keys])
+        return buckets
+
+    def _reindex(self, shipment):
+        """Mueve el envío a los índices y recuentos de sus valores actuales (solo los campos que cambian)."""
+        code = shipment.tracking_code
+        values = (shipment.current_status, shipment.shipment_type, shipment.assigned_route, shipment.priority)
+        previous = self._indexed.get(code)
+        if previous == values:
+            return
+        counts = self._counts
+        counts[values] += 1
+        if previous is None:
+            self._codes.add(code)
+            previous = (None,) * len(values)
+        else:
+            counts[previous] -= 1
+            if not counts[previous]:
+                del counts[previous]
+        for field, old, new in zip(_INDEXED_FIELDS, previous, values):
+            if old != new:
+                index = self._indexes[field]
+                if old is not None:
+                    index[old].discard(code)
+                if new is not None:
+                    keys = index.get(new)
+                    if keys is None:
+                        keys = index[new] = SortedKeys()
+                    keys.add(code)
+        self._indexed[code] = values
+
+    def _unindex(self, code):
+        """Retira un código de todos los índices y de su recuento."""
+        self._codes.discard(code)
+        values = self._indexed.pop(code)
+        self._counts[values] -= 1
+        if not self._counts[values]:
+            del self._counts[values]
+        for field, value in zip(_INDEXED_FIELDS, values):
+            if value is not None:
+                self._indexes[field][value].discard(code)
+
+
+def _candidate_count(candidates):
+    """Número de códigos de una lista de índices que se recorren juntos."""
+    return sum(len(keys) for keys in candidates)
@@ -0,0 +1,39 @@
+# infrastructure/memory_unit_of_work.py
+"""
+Unidad de trabajo para los repositorios en memoria.
+
+Los repositorios en memoria aplican cada escritura al instante sobre sus
+diccionarios y no hay almacenamiento duradero que confirmar, así que esta
+implementación solo lleva la cuenta de los bloques anidados. Permite que los
+servicios usen el mismo código con ambos backends.
+"""
+
+from logistica.domain.unit_of_work import UnitOfWork
+
+
+class UnitOfWorkMemory(UnitOfWork):
+    """
+    Unidad de trabajo reentrante sin efectos sobre el almacenamiento.
+
+    Limitación: no deshace cambios. Las entidades en memoria se modifican en el
+    sitio, por lo que un fallo a mitad de caso de uso no revierte lo ya aplicado;
+    los servicios validan antes de modificar para que esto no ocurra.
+
+    Attributes:
+        commits (int): Número de unidades de trabajo (externas) completadas.
+    """
+
+    def __init__(self):
+        self._depth = 0
+        self.commits = 0
+
+    def begin(self):
+        self._depth += 1
+
+    def commit(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self.commits += 1
+
+    def rollback(self):
+        self._depth -= 1
@@ -0,0 +1,202 @@
+# infrastructure/migrations.py
+"""
+Migraciones versionadas del esquema SQLite.
+
+La versión del esquema se guarda en la cabecera de la base de datos mediante
+`PRAGMA user_version`. `migrate()` aplica, dentro del mismo proceso y en orden,
+las migraciones cuya versión es superior a la actual, cada una en su propia
+transacción. Así una base de datos existente se actualiza en el sitio, sin
+borrarla ni perder datos.
+
+Para añadir un cambio de esquema basta con añadir una entrada al final de
+`MIGRATIONS` con la siguiente versión; nunca se modifican migraciones ya publicadas.
+"""
+
+
+def _count_key(row):
+    """Condición sobre la clave de shipment_counts de la fila OLD o NEW de un trigger."""
+    return (f"current_status = {row}.current_status AND shipment_type = {row}.shipment_type "
+            f"AND priority = {row}.priority AND route_key = COALESCE({row}.assigned_route_id, '') "
+            f"AND center_key = COALESCE({row}.current_center_id, '')")
+
+
+def _count_increment(row):
+    """Suma la fila OLD o NEW de un trigger a su grupo de shipment_counts (lo crea si no existe)."""
+    return (f"INSERT INTO shipment_counts VALUES ({row}.current_status, {row}.shipment_type, {row}.priority, "
+            f"COALESCE({row}.assigned_route_id, ''), COALESCE({row}.current_center_id, ''), 1) "
+            f"ON CONFLICT (current_status, shipment_type, priority, route_key, center_key) "
+            f"DO UPDATE SET total = total + 1;")
+
+
+def _count_decrement(row):
+    """Resta la fila OLD de un trigger de su grupo y borra el grupo si queda vacío."""
+    return (f"UPDATE shipment_counts SET total = total - 1 WHERE {_count_key(row)}; "
+            f"DELETE FROM shipment_counts WHERE {_count_key(row)} AND total = 0;")
+
+
+# Cada migración: (versión, descripción, sentencias SQL)
+MIGRATIONS = [
+    (1, "Esquema inicial", [
+        # IF NOT EXISTS: las bases de datos creadas por el antiguo crear_bd.py tienen
+        # estas tablas pero user_version = 0, y se adoptan sin recrearlas
+        """
+        CREATE TABLE IF NOT EXISTS centers (
+            center_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            location TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS routes (
+            route_id TEXT PRIMARY KEY,
+            origin_center_id TEXT NOT NULL,
+            destination_center_id TEXT NOT NULL,
+            active INTEGER NOT NULL,
+            FOREIGN KEY (origin_center_id) REFERENCES centers(center_id),
+            FOREIGN KEY (destination_center_id) REFERENCES centers(center_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS shipments (
+            tracking_code TEXT PRIMARY KEY,
+            sender TEXT NOT NULL,
+            recipient TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            current_status TEXT NOT NULL,
+            shipment_type TEXT NOT NULL,
+            assigned_route_id TEXT,
+            current_center_id TEXT,
+            FOREIGN KEY (assigned_route_id) REFERENCES routes(route_id),
+            FOREIGN KEY (current_center_id) REFERENCES centers(center_id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS shipment_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            tracking_code TEXT NOT NULL,
+            status TEXT NOT NULL,
+            FOREIGN KEY (tracking_code) REFERENCES shipments(tracking_code)
+        )
+        """,
+    ]),
+    (2, "Índices para las búsquedas por ruta, centro e historial", [
+        # Envíos de una ruta (RouteRepositorySQLite) y de un centro (CenterRepositorySQLite)
+        "CREATE INDEX IF NOT EXISTS idx_shipments_assigned_route ON shipments (assigned_route_id)",
+        "CREATE INDEX IF NOT EXISTS idx_shipments_current_center ON shipments (current_center_id)",
+        # Historial de un envío en orden de inserción; incluir id evita la ordenación posterior
+        "CREATE INDEX IF NOT EXISTS idx_status_history_tracking ON shipment_status_history (tracking_code, id)",
+        # Rutas que salen de / llegan a un centro
+        "CREATE INDEX IF NOT EXISTS idx_routes_origin ON routes (origin_center_id)",
+        "CREATE INDEX IF NOT EXISTS idx_routes_destination ON routes (destination_center_id)",
+        "ANALYZE",
+    ]),
+    (3, "Marca de tiempo de cada transición del historial", [
+        # Epoch en segundos; NULL para las transiciones registradas antes de esta versión
+        "ALTER TABLE shipment_status_history ADD COLUMN changed_at REAL",
+    ]),
+    (4, "Índices para las consultas paginadas de envíos", [
+        # ShipmentRepositorySQLite.find: cada filtro frecuente seguido de la clave de orden, para
+        # que una página sea un recorrido del índice a partir del cursor sin ordenar filas
+        "CREATE INDEX IF NOT EXISTS idx_shipments_status_code ON shipments (current_status, tracking_code)",
+        "CREATE INDEX IF NOT EXISTS idx_shipments_type_code ON shipments (shipment_type, tracking_code)",
+        "CREATE INDEX IF NOT EXISTS idx_shipments_route_code ON shipments (assigned_route_id, tracking_code)",
+        "CREATE INDEX IF NOT EXISTS idx_shipments_center_code ON shipments (current_center_id, tracking_code)",
+        # Los índices de la migración 2 por ruta y por centro son prefijos de los anteriores
+        "DROP INDEX IF EXISTS idx_shipments_assigned_route",
+        "DROP INDEX IF EXISTS idx_shipments_current_center",
+        # Orden por prioridad (de mayor a menor) y código
+        "CREATE INDEX IF NOT EXISTS idx_shipments_priority_code ON shipments (priority DESC, tracking_code)",
+        "ANALYZE",
+    ]),
+    (5, "Recuentos de envíos mantenidos por triggers", [
+        # Un grupo por combinación de estado, tipo, prioridad, ruta y centro ('' = sin ruta o
+        # sin centro). Las estadísticas leen esta tabla, de pocas filas, en lugar de recorrer
+        # shipments; los triggers la mantienen en la misma transacción que cada escritura
+        """
+        CREATE TABLE shipment_counts (
+            current_status TEXT NOT NULL,
+            shipment_type TEXT NOT NULL,
+            priority INTEGER NOT NULL,
+            route_key TEXT NOT NULL,
+            center_key TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            PRIMARY KEY (current_status, shipment_type, priority, route_key, center_key)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT INTO shipment_counts
+        SELECT current_status, shipment_type, priority, COALESCE(assigned_route_id, ''),
+               COALESCE(current_center_id, ''), COUNT(*)
+        FROM shipments
+        GROUP BY 1, 2, 3, 4, 5
+        """,
+        f"""
+        CREATE TRIGGER shipment_counts_insert AFTER INSERT ON shipments
+        BEGIN
+            {_count_increment("NEW")}
+        END
+        """,
+        f"""
+        CREATE TRIGGER shipment_counts_delete AFTER DELETE ON shipments
+        BEGIN
+            {_count_decrement("OLD")}
+        END
+        """,
+        # Solo cuando cambia alguna columna del grupo: reescribir un envío sin cambios no cuesta nada
+        f"""
+        CREATE TRIGGER shipment_counts_update
+        AFTER UPDATE OF current_status, shipment_type, priority, assigned_route_id, current_center_id ON shipments
+        WHEN OLD.current_status IS NOT NEW.current_status OR OLD.shipment_type IS NOT NEW.shipment_type
+          OR OLD.priority IS NOT NEW.priority OR OLD.assigned_route_id IS NOT NEW.assigned_route_id
+          OR OLD.current_center_id IS NOT NEW.current_center_id
+        BEGIN
+            {_count_decrement("OLD")}
+            {_count_increment("NEW")}
+        END
+        """,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    """Devuelve la versión de esquema registrada en la base de datos (0 si nunca se migró)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target_version=None):
+    """
+    Actualiza el esquema de la base de datos hasta `target_version` (por defecto, la última).
+
+    Cada migración se ejecuta en una transacción propia junto con la actualización de
+    `user_version`; si falla, se deshace por completo y la base de datos queda en la
+    versión anterior.
+
+    Args:
+        conn (sqlite3.Connection): Conexión a la base de datos a migrar.
+        target_version (int, opcional): Versión final deseada.
+
+    Returns:
+        list[int]: Versiones aplicadas en esta llamada (vacía si ya estaba al día).
+    """
+    if target_version is None:
+        target_version = LATEST_VERSION
+
+    applied = []
+    version = current_version(conn)
+    for number, _description, statements in MIGRATIONS:
+        if number <= version or number > target_version:
+            continue
+        # BEGIN explícito: el módulo sqlite3 no abre transacción implícita para sentencias DDL
+        conn.execute("BEGIN")
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(number)
+    return applied
@@ -16,18 +16,23 @@ from logistica.domain.route import Route
 from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
 from logistica.infrastructure.memory_center import CenterRepositoryMemory
 from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.memory_unit_of_work import UnitOfWorkMemory
+from logistica.infrastructure.identity_map import NullIdentityMap
 
 
 def seed_repository(use_sqlite=True):
     """
     Inicializa los repositorios en memoria con datos de prueba o devuelve los de SQLite.
 
-    Si use_sqlite es True, devuelve las implementaciones SQLite y asegura que exista la DB.
+    Si use_sqlite es True, devuelve las implementaciones SQLite y asegura que exista la DB
+    con el esquema en su última versión (migraciones aplicadas en el propio proceso).
     De lo contrario, crea centros logísticos, rutas entre ellos y envíos en memoria.
 
     Returns:
         dict: Diccionario conteniendo instancias de repositorios inicializadas
-              bajo las claves "shipments", "routes" y "centers".
+              bajo las claves "shipments", "routes" y "centers", y la unidad de trabajo
+              compartida por ellos bajo la clave "unit_of_work". La clave "identity_map"
+              contiene el mapa de identidad que la presentación vacía al final de cada petición.
     """
     if use_sqlite:
         import os
@@ -35,19 +40,33 @@ def seed_repository(use_sqlite=True):
         db_path = os.path.join(base_dir, "logistica.db")
         
         if not os.path.exists(db_path):
-            print("Base de datos no encontrada. Ejecutando crear_bd.py para generarla...")
-            import subprocess
-            crear_bd_script = os.path.join(base_dir, "crear_bd.py")
-            subprocess.run(["python", crear_bd_script], cwd=base_dir)
-            
+            print("Base de datos no encontrada. Generándola con los datos iniciales...")
+
+        # Crea la base de datos o aplica en el sitio las migraciones pendientes (sin subprocesos)
+        from logistica.crear_bd import crear_bd
+        crear_bd(db_path)
+
         from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
         from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
         from logistica.infrastructure.sqlite_route import RouteRepositorySQLite
-        
+        from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+        from logistica.infrastructure.sqlite_unit_of_work import UnitOfWorkSQLite
+        from logistica.infrastructure.identity_map import IdentityMap
+
+        # Un único gestor de conexiones compartido por los tres repositorios,
+        # cerrado de forma ordenada al terminar el proceso
+        import atexit
+        connection_manager = SQLiteConnectionManager(db_path)
+        atexit.register(connection_manager.close)
+        # Mapa de identidad compartido: cada fila se reconstruye una sola vez por petición
+        identity_map = IdentityMap()
+
         return {
-            "shipments": ShipmentRepositorySQLite(db_path),
-            "routes": RouteRepositorySQLite(db_path),
-            "centers": CenterRepositorySQLite(db_path)
+            "shipments": ShipmentRepositorySQLite(db_path, connection_manager, identity_map),
+            "routes": RouteRepositorySQLite(db_path, connection_manager, identity_map),
+            "centers": CenterRepositorySQLite(db_path, connection_manager, identity_map),
+            "unit_of_work": UnitOfWorkSQLite(connection_manager, identity_map),
+            "identity_map": identity_map
         }
 
     shipment_repo = ShipmentRepositoryMemory()
@@ -87,5 +106,8 @@ def seed_repository(use_sqlite=True):
     return {
         "shipments": shipment_repo,
         "routes": route_repo,
-        "centers": center_repo
+        "centers": center_repo,
+        "unit_of_work": UnitOfWorkMemory(),
+        # Los repositorios en memoria ya devuelven siempre el mismo objeto: el mapa queda vacío
+        "identity_map": NullIdentityMap()
     }
@@ -0,0 +1,112 @@
+# infrastructure/sorted_keys.py
+"""
+Conjunto ordenado de claves para los índices secundarios de los repositorios en memoria.
+
+Las claves se guardan en bloques ordenados de tamaño acotado, con la mayor clave de cada
+bloque en una lista aparte: localizar una clave son dos búsquedas binarias (`bisect`) y
+insertar o borrar solo desplaza los elementos de un bloque, no los de todo el índice. Así
+un índice con millones de claves se mantiene al día envío a envío y se puede recorrer en
+orden a partir de cualquier clave (paginación por cursor) sin ordenar nada al consultar.
+"""
+
+from bisect import bisect_left, bisect_right
+
+# Tamaño de referencia de los bloques: se parten al doblarlo
+_LOAD = 512
+
+
+class SortedKeys:
+    """Conjunto de claves comparables que se recorre en orden ascendente."""
+
+    __slots__ = ("_blocks", "_maxes", "_len")
+
+    def __init__(self, keys=()):
+        """Crea el índice con las claves iniciales (se ordenan una sola vez)."""
+        keys = sorted(set(keys))
+        self._blocks = [keys[start:start + _LOAD] for start in range(0, len(keys), _LOAD)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+
+    def __len__(self):
+        """Número de claves."""
+        return self._len
+
+    def __contains__(self, key):
+        """Indica si la clave está en el índice (O(log n))."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        block = self._blocks[i]
+        return block[bisect_left(block, key)] == key
+
+    def __iter__(self):
+        """Recorre todas las claves en orden."""
+        return self.iter_from()
+
+    def add(self, key):
+        """Añade una clave; no hace nada si ya estaba."""
+        maxes = self._maxes
+        if not maxes:
+            self._blocks.append([key])
+            maxes.append(key)
+            self._len = 1
+            return
+
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            # Mayor que todas: va al final del último bloque
+            i -= 1
+            block = self._blocks[i]
+            block.append(key)
+            maxes[i] = key
+        else:
+            block = self._blocks[i]
+            j = bisect_left(block, key)
+            if block[j] == key:
+                return
+            block.insert(j, key)
+        self._len += 1
+
+        if len(block) > 2 * _LOAD:
+            self._blocks[i:i + 1] = [block[:_LOAD], block[_LOAD:]]
+            maxes[i:i + 1] = [block[_LOAD - 1], block[-1]]
+
+    def discard(self, key):
+        """Retira una clave; no hace nada si no estaba."""
+        maxes = self._maxes
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            return
+        block = self._blocks[i]
+        j = bisect_left(block, key)
+        if block[j] != key:
+            return
+        del block[j]
+        self._len -= 1
+        if not block:
+            del self._blocks[i]
+            del maxes[i]
+        elif j == len(block):
+            maxes[i] = block[-1]
+
+    def iter_from(self, key=None, inclusive=True):
+        """
+        Recorre en orden las claves a partir de `key`.
+
+        Args:
+            key (opcional): Clave de inicio; None para empezar por la primera.
+            inclusive (bool): Si es False, empieza por la primera clave estrictamente mayor
+                (el cursor de la página anterior).
+        """
+        blocks = self._blocks
+        if key is None:
+            i = j = 0
+        else:
+            search = bisect_left if inclusive else bisect_right
+            i = search(self._maxes, key)
+            if i == len(blocks):
+                return
+            j = search(blocks[i], key)
+        for block in blocks[i:]:
+            yield from block[j:]
+            j = 0
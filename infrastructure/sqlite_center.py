@@ -2,6 +2,10 @@
 import sqlite3
 from logistica.domain.center_repository import CenterRepository
 from logistica.domain.center import Center
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.lazy_center import LazyCenter
+from logistica.infrastructure.identity_map import NullIdentityMap
+from logistica.infrastructure.sqlite_membership import persisted_codes, remember_persisted_codes, sync_membership
 from logistica.infrastructure.errores import (
     EntityAlreadyExistsError,
     EntityNotFoundError,
@@ -9,32 +13,32 @@ from logistica.infrastructure.errores import (
 )
 
 class CenterRepositorySQLite(CenterRepository):
-    def __init__(self, db_path="logistica.db"):
+    def __init__(self, db_path="logistica.db", connection_manager=None, identity_map=None):
         self._db_path = db_path
+        # Conexiones persistentes por hilo; compartir el mismo gestor entre los tres repositorios
+        # evita abrir una conexión por operación
+        self._connections = connection_manager or SQLiteConnectionManager(db_path)
+        # Mapa de identidad compartido: una misma fila es siempre el mismo objeto durante la petición
+        self._identity_map = identity_map or NullIdentityMap()
 
     def add(self, center):
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 cursor.execute(
                     "INSERT INTO centers (center_id, name, location) VALUES (?, ?, ?)",
                     (center.center_id, center.name, center.location)
                 )
+            self._identity_map.add("center", center.center_id, center)
         except sqlite3.IntegrityError:
             raise EntityAlreadyExistsError(f"Ya existe un centro con identificador '{center.center_id}'.")
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al guardar el centro: {e}")
-        finally:
-            conn.close()
 
     def update(self, center):
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 cursor.execute(
                     "UPDATE centers SET name = ?, location = ? WHERE center_id = ?",
                     (center.name, center.location, center.center_id)
@@ -42,49 +46,48 @@ class CenterRepositorySQLite(CenterRepository):
                 if cursor.rowcount == 0:
                     raise EntityNotFoundError(f"No existe un centro con identificador '{center.center_id}'.")
                 
-                # Reconciliar inventario (shipments presentes físicamente en el centro)
-                # Primero, quitar de todos los que lo tenian
-                cursor.execute("UPDATE shipments SET current_center_id = NULL WHERE current_center_id = ?", (center.center_id,))
-                
-                # Segundo, asignar a los actuales
-                for shipment in center.list_shipments():
-                    cursor.execute(
-                        "UPDATE shipments SET current_center_id = ? WHERE tracking_code = ?", 
-                        (center.center_id, shipment.tracking_code)
-                    )
-                    
+                # Reconciliar inventario (shipments presentes físicamente en el centro):
+                # solo se escriben los envíos que han entrado o salido desde la carga.
+                # Un centro perezoso cuyo inventario nunca se cargó no puede haber cambiado.
+                current = None
+                if not (isinstance(center, LazyCenter) and not center.is_loaded):
+                    current = {shipment.tracking_code for shipment in center.list_shipments()}
+                    sync_membership(cursor, "current_center_id", center.center_id, persisted_codes(center), current)
+
+            if current is not None:
+                remember_persisted_codes(center, current)
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al actualizar el centro: {e}")
-        finally:
-            conn.close()
 
     def remove(self, center_id):
         center_id = (center_id or "").strip()
         if not center_id:
             raise EntityNotFoundError("El ID del centro no puede estar vacío.")
 
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 # Fallará por foreing_keys si existen dependencias en routes
                 cursor.execute("DELETE FROM centers WHERE center_id = ?", (center_id,))
                 if cursor.rowcount == 0:
                     raise EntityNotFoundError(f"No existe un centro con el identificador '{center_id}'.")
+            self._identity_map.remove("center", center_id)
         except sqlite3.IntegrityError as e:
             raise PersistenceError(f"No se puede eliminar el centro '{center_id}' porque está referenciado por operaciones activas.")
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al eliminar el centro: {e}")
-        finally:
-            conn.close()
 
     def get_by_center_id(self, center_id):
         center_id = (center_id or "").strip()
         if not center_id:
             raise EntityNotFoundError("El ID del centro no puede estar vacío.")
 
-        conn = sqlite3.connect(self._db_path)
+        # Ya cargado en esta petición (también como referencia perezosa de una ruta)
+        center = self._identity_map.get("center", center_id)
+        if center is not None:
+            return center
+
+        conn = self._connections.connection()
         try:
             cursor = conn.cursor()
             cursor.execute("SELECT center_id, name, location FROM centers WHERE center_id = ?", (center_id,))
@@ -92,40 +95,94 @@ class CenterRepositorySQLite(CenterRepository):
             if row is None:
                 raise EntityNotFoundError(f"No existe un centro con el identificador '{center_id}'.")
             
-            center = Center(row[0], row[1], row[2])
-            
-            # Recuperar inventario de shipments
-            cursor.execute("SELECT tracking_code FROM shipments WHERE current_center_id = ?", (center_id,))
-            tracking_rows = cursor.fetchall()
-            
-            # Para evitar dependencias circulares costosas al nivel de la conexion, 
-            # delegamos la resolucion total al shipment repo en este scope.
-            from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
-            shipment_repo = ShipmentRepositorySQLite(self._db_path)
+            center = Center.from_record(row[0], row[1], row[2])
             
-            for (t_code,) in tracking_rows:
-                # Obtenemos sus entidades
-                shipment = shipment_repo.get_by_tracking_code(t_code)
-                # Reconstruimos bypass de negocio manual, pues receive_shipment valora _shipments logic:
-                center._shipments.append(shipment)
+            # Recuperar inventario de shipments en bloque (filas + historiales en dos consultas)
+            shipments = self._shipment_repo()._fetch_shipments(
+                cursor, "WHERE shipments.current_center_id = ?", (row[0],)
+            )
+            # Reconstruimos bypass de negocio manual, pues receive_shipment valora _shipments logic:
+            center._restore_shipments(shipments)
+            remember_persisted_codes(center, (s.tracking_code for s in shipments))
 
-            return center
+            return self._identity_map.add("center", center.center_id, center)
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al recuperar el centro: {e}")
-        finally:
-            conn.close()
+
+    def get_if_loaded(self, center_id):
+        """
+        Devuelve el centro si ya se cargó en esta petición (mapa de identidad), o None.
+
+        No consulta la base de datos: un centro que se cargue después recalcula sus
+        contadores y su cola de despacho a partir de los envíos guardados.
+        """
+        return self._identity_map.get("center", (center_id or "").strip())
 
     def list_all(self):
-        conn = sqlite3.connect(self._db_path)
+        conn = self._connections.connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT center_id FROM centers")
+            cursor.execute("SELECT center_id, name, location FROM centers")
             rows = cursor.fetchall()
+
+            # Inventario de todos los centros con un número fijo de consultas, repartido después por centro
+            by_center = self._shipment_repo()._fetch_shipments_by_center(
+                cursor, "WHERE shipments.current_center_id IS NOT NULL"
+            )
+
             centers = []
-            for row in rows:
-                centers.append(self.get_by_center_id(row[0]))
+            for center_id, name, location in rows:
+                center = self._identity_map.get("center", center_id)
+                if center is None:
+                    center = Center.from_record(center_id, name, location)
+                    shipments = by_center.get(center_id, [])
+                    center._restore_shipments(shipments)
+                    remember_persisted_codes(center, (s.tracking_code for s in shipments))
+                    self._identity_map.add("center", center_id, center)
+                centers.append(center)
             return centers
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al listar los centros: {e}")
-        finally:
-            conn.close()
+
+    def shipment_counts(self):
+        """
+        Número de envíos en el inventario de cada centro, sin cargar ningún inventario.
+
+        Suma los grupos de `shipment_counts` (migración 5) de cada centro; los centros
+        vacíos aparecen con 0.
+
+        Returns:
+            dict: Identificador del centro -> número de envíos.
+        """
+        conn = self._connections.connection()
+        try:
+            rows = conn.execute("""
+                SELECT centers.center_id, COALESCE(SUM(shipment_counts.total), 0)
+                FROM centers
+                LEFT JOIN shipment_counts ON shipment_counts.center_key = centers.center_id
+                GROUP BY centers.center_id
+            """).fetchall()
+        except sqlite3.OperationalError as e:
+            raise PersistenceError(f"Error al contar los envíos de los centros: {e}")
+        return dict(rows)
+
+    def _load_inventory(self, center_id):
+        """
+        Devuelve los envíos presentes en un centro, cargados en bloque.
+
+        Se usa como `loader` de las referencias perezosas (`LazyCenter`) que crea el repositorio de rutas.
+        """
+        conn = self._connections.connection()
+        try:
+            return self._shipment_repo()._fetch_shipments(
+                conn.cursor(), "WHERE shipments.current_center_id = ?", (center_id,)
+            )
+        except sqlite3.OperationalError as e:
+            raise PersistenceError(f"Error al recuperar el inventario del centro: {e}")
+
+    def _shipment_repo(self):
+        """Repositorio de envíos sobre la misma conexión, usado para hidratar inventarios."""
+        # Para evitar dependencias circulares costosas al nivel de la conexion,
+        # delegamos la resolucion total al shipment repo en este scope.
+        from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+        return ShipmentRepositorySQLite(self._db_path, self._connections, self._identity_map)
@@ -0,0 +1,172 @@
+# infrastructure/sqlite_connection.py
+"""
+Gestor de conexiones SQLite compartido por los repositorios de infraestructura.
+
+Antes cada método de los repositorios SQLite abría una conexión nueva, repetía
+`PRAGMA foreign_keys = ON` y la cerraba al terminar, de modo que un único caso de
+uso (p. ej. `RouteService.dispatch_route`) abría decenas de conexiones y perdía la
+caché de sentencias preparadas en cada llamada.
+
+Este módulo mantiene una conexión de larga duración por hilo, aplica los PRAGMA
+una sola vez al abrirla y deja que el módulo `sqlite3` reutilice las sentencias
+preparadas de su caché interna mientras la conexión siga viva.
+"""
+
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+
+class _ThreadConnection:
+    """Conexión de un hilo guardada en su almacenamiento local; al destruirse se libera la conexión."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class SQLiteConnectionManager:
+    """
+    Proporciona conexiones SQLite persistentes, una por hilo, para una misma base de datos.
+
+    Características:
+        - Una conexión por hilo (los objetos `sqlite3.Connection` no deben compartirse entre hilos)
+        - La conexión de un hilo se cierra cuando el hilo termina (p. ej. los hilos por petición
+          de Flask), así que las conexiones abiertas no crecen con el número de peticiones
+        - PRAGMA aplicados una única vez por conexión (WAL, synchronous, cache_size, foreign_keys)
+        - Caché de sentencias preparadas ampliada (`cached_statements`)
+        - Transacciones reentrantes mediante `transaction()`: solo la más externa confirma
+        - Cierre ordenado de todas las conexiones abiertas mediante `close()`
+
+    Attributes:
+        connections_opened (int): Número total de conexiones abiertas por el gestor.
+            Útil para pruebas y benchmarks.
+        commits (int): Número de transacciones confirmadas por `transaction()`.
+    """
+
+    def __init__(self, db_path="logistica.db", journal_mode="WAL", synchronous="NORMAL",
+                 cache_size=-16000, cached_statements=256):
+        """
+        Inicializa el gestor sin abrir todavía ninguna conexión.
+
+        Args:
+            db_path (str): Ruta del fichero de base de datos.
+            journal_mode (str): Modo de journal (por defecto WAL, lectores no bloquean al escritor).
+            synchronous (str): Nivel de sincronización (NORMAL es seguro en modo WAL).
+            cache_size (int): Tamaño de la caché de páginas. Los valores negativos se expresan en KiB.
+            cached_statements (int): Número de sentencias preparadas que conserva cada conexión.
+        """
+        self._db_path = db_path
+        self._journal_mode = journal_mode
+        self._synchronous = synchronous
+        self._cache_size = int(cache_size)
+        self._cached_statements = cached_statements
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open_connections = []
+        self.connections_opened = 0
+        self.commits = 0
+
+    @property
+    def db_path(self):
+        """Devuelve la ruta de la base de datos gestionada."""
+        return self._db_path
+
+    def connection(self):
+        """
+        Devuelve la conexión del hilo actual, abriéndola la primera vez.
+
+        Returns:
+            sqlite3.Connection: Conexión configurada y reutilizable en el hilo actual.
+        """
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = _ThreadConnection(self._open())
+            self._local.holder = holder
+            # Al terminar el hilo se descarta su almacenamiento local y, con él, la conexión
+            weakref.finalize(holder, self._release, holder.conn)
+        return holder.conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Abre (o se une a) la transacción de escritura del hilo actual.
+
+        Los repositorios envuelven cada escritura con este contexto. Si ya hay una
+        transacción abierta en el hilo (p. ej. una unidad de trabajo alrededor de un
+        caso de uso), la escritura se une a ella y no confirma nada por su cuenta;
+        solo el bloque más externo hace `commit` (o `rollback` si se lanza una excepción).
+
+        Yields:
+            sqlite3.Connection: Conexión del hilo actual.
+        """
+        conn = self.connection()
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                conn.rollback()
+            raise
+        self._local.depth = depth
+        if depth == 0:
+            conn.commit()
+            with self._lock:
+                self.commits += 1
+
+    def in_transaction(self):
+        """Indica si el hilo actual está dentro de un bloque `transaction()`."""
+        return getattr(self._local, "depth", 0) > 0
+
+    def _open(self):
+        """Abre una conexión nueva y le aplica los PRAGMA configurados."""
+        # check_same_thread=False solo para permitir que close() cierre conexiones de otros hilos;
+        # durante el uso normal cada conexión se utiliza exclusivamente desde el hilo que la abrió
+        conn = sqlite3.connect(
+            self._db_path,
+            cached_statements=self._cached_statements,
+            check_same_thread=False,
+        )
+        cursor = conn.cursor()
+        cursor.execute(f"PRAGMA journal_mode = {self._journal_mode}")
+        cursor.execute(f"PRAGMA synchronous = {self._synchronous}")
+        cursor.execute(f"PRAGMA cache_size = {self._cache_size}")
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
+        with self._lock:
+            self._open_connections.append(conn)
+            self.connections_opened += 1
+        return conn
+
+    @property
+    def open_connections(self):
+        """Número de conexiones abiertas ahora mismo (una por hilo vivo que haya usado el gestor)."""
+        with self._lock:
+            return len(self._open_connections)
+
+    def _release(self, conn):
+        """Cierra la conexión de un hilo que ha terminado y la retira de las abiertas."""
+        with self._lock:
+            if conn in self._open_connections:
+                self._open_connections.remove(conn)
+        conn.close()
+
+    def close(self):
+        """
+        Cierra todas las conexiones abiertas por el gestor, de cualquier hilo.
+
+        Tras llamar a este método el gestor sigue siendo utilizable: la siguiente
+        llamada a `connection()` abrirá una conexión nueva.
+        """
+        with self._lock:
+            connections, self._open_connections = self._open_connections, []
+        for conn in connections:
+            conn.close()
+        # Se descarta el almacenamiento por hilo para que ningún hilo reutilice una conexión cerrada
+        self._local = threading.local()
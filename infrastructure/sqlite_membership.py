@@ -0,0 +1,65 @@
+# infrastructure/sqlite_membership.py
+"""
+Escritura diferencial de pertenencias (envío ∈ centro, envío ∈ ruta) en SQLite.
+
+La pertenencia de un envío a un centro o a una ruta se guarda como clave foránea en
+`shipments` (`current_center_id` / `assigned_route_id`). En lugar de vaciar la columna
+para todo el centro o ruta y volver a escribirla envío a envío, los repositorios
+calculan la diferencia entre los códigos persistidos y los actuales y escriben solo
+los añadidos y los retirados.
+
+El conjunto persistido se guarda en la propia entidad (`_persisted_shipment_codes`)
+al hidratarla y tras cada actualización. Si la entidad no lo tiene (p. ej. se creó en
+memoria), se obtiene de la base de datos mediante el índice correspondiente.
+"""
+
+# Columnas de pertenencia admitidas (nunca se interpolan valores arbitrarios en el SQL)
+_MEMBERSHIP_COLUMNS = ("current_center_id", "assigned_route_id")
+
+
+def persisted_codes(entity):
+    """Devuelve los códigos persistidos registrados en la entidad, o None si no se conocen."""
+    return getattr(entity, "_persisted_shipment_codes", None)
+
+
+def remember_persisted_codes(entity, codes):
+    """Registra en la entidad el conjunto de códigos que coincide con lo almacenado."""
+    entity._persisted_shipment_codes = set(codes)
+
+
+def sync_membership(cursor, column, owner_id, persisted, current):
+    """
+    Persiste solo la diferencia de pertenencia entre `persisted` y `current`.
+
+    Args:
+        cursor (sqlite3.Cursor): Cursor dentro de la transacción en curso.
+        column (str): `current_center_id` o `assigned_route_id`.
+        owner_id (str): ID del centro o de la ruta.
+        persisted (set[str] | None): Códigos almacenados antes del cambio; None para consultarlos.
+        current (set[str]): Códigos que deben quedar asociados tras el cambio.
+
+    Returns:
+        tuple[set[str], set[str]]: (añadidos, retirados).
+    """
+    if column not in _MEMBERSHIP_COLUMNS:
+        raise ValueError(f"Columna de pertenencia no válida: {column}")
+
+    if persisted is None:
+        cursor.execute(f"SELECT tracking_code FROM shipments WHERE {column} = ?", (owner_id,))
+        persisted = {row[0] for row in cursor.fetchall()}
+
+    added = current - persisted
+    removed = persisted - current
+
+    # La condición sobre el propietario evita desvincular un envío que otro centro/ruta ya ha reclamado
+    if removed:
+        cursor.executemany(
+            f"UPDATE shipments SET {column} = NULL WHERE tracking_code = ? AND {column} = ?",
+            [(code, owner_id) for code in removed]
+        )
+    if added:
+        cursor.executemany(
+            f"UPDATE shipments SET {column} = ? WHERE tracking_code = ?",
+            [(owner_id, code) for code in added]
+        )
+    return added, removed
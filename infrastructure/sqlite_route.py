@@ -2,39 +2,52 @@
 import sqlite3
 from logistica.domain.route_repository import RouteRepository
 from logistica.domain.route import Route
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.lazy_center import LazyCenter
+from logistica.infrastructure.identity_map import NullIdentityMap
+from logistica.infrastructure.sqlite_membership import persisted_codes, remember_persisted_codes, sync_membership
 from logistica.infrastructure.errores import (
     EntityAlreadyExistsError,
     EntityNotFoundError,
     PersistenceError
 )
 
+# Ruta junto con la identidad de sus centros (sin inventario), en el orden que espera _build_route
+_ROUTE_SELECT = (
+    "SELECT r.route_id, r.origin_center_id, o.name, o.location, "
+    "r.destination_center_id, d.name, d.location, r.active "
+    "FROM routes r "
+    "JOIN centers o ON o.center_id = r.origin_center_id "
+    "JOIN centers d ON d.center_id = r.destination_center_id"
+)
+
 class RouteRepositorySQLite(RouteRepository):
-    def __init__(self, db_path="logistica.db"):
+    def __init__(self, db_path="logistica.db", connection_manager=None, identity_map=None):
         self._db_path = db_path
+        # Conexiones persistentes por hilo; compartir el mismo gestor entre los tres repositorios
+        # evita abrir una conexión por operación
+        self._connections = connection_manager or SQLiteConnectionManager(db_path)
+        # Mapa de identidad compartido: una misma fila es siempre el mismo objeto durante la petición
+        self._identity_map = identity_map or NullIdentityMap()
 
     def add(self, route):
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 cursor.execute(
                     "INSERT INTO routes (route_id, origin_center_id, destination_center_id, active) VALUES (?, ?, ?, ?)",
                     (route.route_id, route.origin_center.center_id, route.destination_center.center_id, 1 if route.is_active else 0)
                 )
+            self._identity_map.add("route", route.route_id, route)
         except sqlite3.IntegrityError:
             raise EntityAlreadyExistsError(f"Ya existe una ruta con identificador '{route.route_id}'.")
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al guardar la ruta: {e}")
-        finally:
-            conn.close()
 
     def update(self, route):
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 cursor.execute(
                     "UPDATE routes SET active = ? WHERE route_id = ?",
                     (1 if route.is_active else 0, route.route_id)
@@ -42,89 +55,132 @@ class RouteRepositorySQLite(RouteRepository):
                 if cursor.rowcount == 0:
                     raise EntityNotFoundError(f"No existe una ruta con identificador '{route.route_id}'.")
                 
-                # Actualizar los envíos que están en esta ruta
-                # Primero, los quitamos
-                cursor.execute("UPDATE shipments SET assigned_route_id = NULL WHERE assigned_route_id = ?", (route.route_id,))
-                
-                # Despues los añadimos de nuevo a los presentes
-                for tracking_code in route.list_shipments():
-                    cursor.execute(
-                        "UPDATE shipments SET assigned_route_id = ? WHERE tracking_code = ?", 
-                        (route.route_id, tracking_code)
-                    )
-                    
+                # Actualizar los envíos que están en esta ruta: solo altas y bajas desde la carga
+                current = set(route.shipments_view())
+                sync_membership(cursor, "assigned_route_id", route.route_id, persisted_codes(route), current)
+
+            remember_persisted_codes(route, current)
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al actualizar la ruta: {e}")
-        finally:
-            conn.close()
 
     def remove(self, route_id):
         route_id = (route_id or "").strip()
         if not route_id:
             raise EntityNotFoundError("El ID de la ruta no puede estar vacío.")
 
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 cursor.execute("DELETE FROM routes WHERE route_id = ?", (route_id,))
                 if cursor.rowcount == 0:
                     raise EntityNotFoundError(f"No existe una ruta con el identificador '{route_id}'.")
+            self._identity_map.remove("route", route_id)
         except sqlite3.IntegrityError as e:
             raise PersistenceError(f"No se puede eliminar la ruta '{route_id}' por relaciones activas en bbdd.")
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al eliminar la ruta: {e}")
-        finally:
-            conn.close()
 
     def get_by_route_id(self, route_id):
         route_id = (route_id or "").strip()
         if not route_id:
             raise EntityNotFoundError("El ID de la ruta no puede estar vacío.")
 
-        conn = sqlite3.connect(self._db_path)
+        route = self._identity_map.get("route", route_id)
+        if route is not None:
+            return route
+
+        conn = self._connections.connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT route_id, origin_center_id, destination_center_id, active FROM routes WHERE route_id = ?", (route_id,))
+            cursor.execute(f"{_ROUTE_SELECT} WHERE r.route_id = ?", (route_id,))
             row = cursor.fetchone()
             if row is None:
                 raise EntityNotFoundError(f"No existe una ruta con el identificador '{route_id}'.")
-            
-            rid, o_id, d_id, active = row
-            
-            # Reconstruir los centros inyectándolos
-            from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
-            center_repo = CenterRepositorySQLite(self._db_path)
-            
-            origin = center_repo.get_by_center_id(o_id)
-            dest = center_repo.get_by_center_id(d_id)
-            
-            route = Route(rid, origin, dest)
-            route._active = bool(active)
-            
+
+            route = self._build_route(row, {})
+
             # Recuperar asignaciones de envios a esta ruta (tracking codes string list!)
-            cursor.execute("SELECT tracking_code FROM shipments WHERE assigned_route_id = ?", (route_id,))
-            for (t_code,) in cursor.fetchall():
-                route._shipments.append(t_code)
+            cursor.execute("SELECT tracking_code FROM shipments WHERE assigned_route_id = ?", (route.route_id,))
+            route._restore_shipments(t_code for (t_code,) in cursor.fetchall())
+            remember_persisted_codes(route, route.shipments_view())
 
-            return route
+            return self._identity_map.add("route", route.route_id, route)
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al recuperar la ruta: {e}")
-        finally:
-            conn.close()
+
+    def list_by_origin(self, center_id):
+        # Rutas y asignaciones filtradas por origen con idx_routes_origin, sin leer las demás rutas
+        center_id = (center_id or "").strip().upper()
+        return self._list(
+            " WHERE r.origin_center_id = ?",
+            "SELECT s.assigned_route_id, s.tracking_code FROM shipments s "
+            "JOIN routes r ON r.route_id = s.assigned_route_id WHERE r.origin_center_id = ?",
+            (center_id,),
+        )
 
     def list_all(self):
-        conn = sqlite3.connect(self._db_path)
+        return self._list(
+            "",
+            "SELECT assigned_route_id, tracking_code FROM shipments WHERE assigned_route_id IS NOT NULL",
+            (),
+        )
+
+    def _list(self, route_filter, assignments_select, params):
+        """Hidrata las rutas de `_ROUTE_SELECT` + `route_filter` con sus asignaciones en dos consultas."""
+        conn = self._connections.connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT route_id FROM routes")
+            cursor.execute(_ROUTE_SELECT + route_filter, params)
             rows = cursor.fetchall()
+
+            # Todas las asignaciones en una sola consulta, repartidas después por ruta
+            cursor.execute(assignments_select, params)
+            by_route = {}
+            for r_id, t_code in cursor:
+                by_route.setdefault(r_id, []).append(t_code)
+
+            # Las rutas que comparten centro comparten también la misma referencia perezosa
+            centers = {}
             routes = []
-            for (r_id,) in rows:
-                routes.append(self.get_by_route_id(r_id))
+            for row in rows:
+                route = self._identity_map.get("route", row[0])
+                if route is None:
+                    route = self._build_route(row, centers)
+                    route._restore_shipments(by_route.get(route.route_id, ()))
+                    remember_persisted_codes(route, route.shipments_view())
+                    self._identity_map.add("route", route.route_id, route)
+                routes.append(route)
             return routes
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al listar las rutas: {e}")
-        finally:
-            conn.close()
+
+    def _build_route(self, row, centers):
+        """
+        Reconstruye una ruta con referencias perezosas a sus centros.
+
+        Los centros solo cargan su inventario cuando se usan de verdad (recibir, despachar
+        o listar envíos); consultar `center_id`, `name` o `location` no lanza ninguna consulta.
+
+        Args:
+            row (tuple): Fila devuelta por `_ROUTE_SELECT`.
+            centers (dict): Caché center_id -> LazyCenter compartida entre las rutas de un mismo listado.
+                Antes se consulta el mapa de identidad, que puede tener ya el centro completo.
+        """
+        rid, o_id, o_name, o_location, d_id, d_name, d_location, active = row
+
+        # Reconstruir los centros inyectándolos
+        from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
+        center_repo = CenterRepositorySQLite(self._db_path, self._connections, self._identity_map)
+
+        origin = centers.get(o_id) or self._identity_map.get("center", o_id)
+        if origin is None:
+            origin = LazyCenter.from_record(o_id, o_name, o_location, center_repo._load_inventory)
+            self._identity_map.add("center", o_id, origin)
+        centers[o_id] = origin
+        dest = centers.get(d_id) or self._identity_map.get("center", d_id)
+        if dest is None:
+            dest = LazyCenter.from_record(d_id, d_name, d_location, center_repo._load_inventory)
+            self._identity_map.add("center", d_id, dest)
+        centers[d_id] = dest
+
+        return Route.from_record(rid, origin, dest, active)
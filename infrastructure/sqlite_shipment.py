@@ -1,25 +1,47 @@
 # infrastructure/sqlite_shipment.py
 import sqlite3
-from logistica.domain.shipment_repository import ShipmentRepository
-from logistica.domain.shipment import Shipment
-from logistica.domain.fragile_shipment import FragileShipment
-from logistica.domain.express_shipment import ExpressShipment
+from logistica.domain.shipment_repository import ShipmentRepository, check_count_fields
+from logistica.domain.shipment_query import ORDER_BY_TRACKING_CODE
+from logistica.domain.shipment_types import SHIPMENT_TYPES
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.identity_map import NullIdentityMap
 from logistica.infrastructure.errores import (
     EntityAlreadyExistsError,
     EntityNotFoundError,
     PersistenceError
 )
 
+# Columnas necesarias para reconstruir un envío, en el orden que espera _build_shipment
+_SHIPMENT_COLUMNS = (
+    "shipments.tracking_code, shipments.sender, shipments.recipient, shipments.priority, "
+    "shipments.current_status, shipments.shipment_type, shipments.assigned_route_id, "
+    "shipments.current_center_id"
+)
+
+# Envíos por transacción en add_many; también acota los parámetros de la consulta IN (< 999)
+_ADD_MANY_CHUNK_SIZE = 500
+
+# Columna de shipment_counts (migración 5) de cada campo de count_by
+_COUNT_COLUMNS = {
+    "status": "current_status",
+    "type": "shipment_type",
+    "priority": "priority",
+    "route": "route_key",
+}
+
 class ShipmentRepositorySQLite(ShipmentRepository):
-    def __init__(self, db_path="logistica.db"):
+    def __init__(self, db_path="logistica.db", connection_manager=None, identity_map=None):
         self._db_path = db_path
+        # Conexiones persistentes por hilo; compartir el mismo gestor entre los tres repositorios
+        # evita abrir una conexión por operación
+        self._connections = connection_manager or SQLiteConnectionManager(db_path)
+        # Mapa de identidad compartido: una misma fila es siempre el mismo objeto durante la petición
+        self._identity_map = identity_map or NullIdentityMap()
 
     def add(self, shipment):
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 
                 # Check assigned route and center
                 # Since the Shipment object only holds the string ID for route (_assigned_route) and doesn't hold center natively,
@@ -43,23 +65,96 @@ class ShipmentRepositorySQLite(ShipmentRepository):
                     shipment.assigned_route
                 ))
                 
-                # History (only first item since it's just created)
-                cursor.execute("INSERT INTO shipment_status_history (tracking_code, status) VALUES (?, ?)", (shipment.tracking_code, "REGISTERED"))
-                
+                # History (normally only REGISTERED since it's just created), stamped with the transition time
+                self._append_history(cursor, shipment.tracking_code, shipment.get_status_timeline())
+
+            self._identity_map.add("shipment", shipment.tracking_code, shipment)
         except sqlite3.IntegrityError as e:
             raise EntityAlreadyExistsError(f"Ya existe un envío con el código '{shipment.tracking_code}'.")
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al guardar el envío: {e}")
-        finally:
-            conn.close()
+
+    def add_many(self, shipments, chunk_size=_ADD_MANY_CHUNK_SIZE):
+        """
+        Inserta envíos en bloque con `executemany`, en transacciones de `chunk_size` filas.
+
+        Los códigos que ya existen (en la base de datos o antes en el mismo lote) se
+        rechazan sin interrumpir la carga. Si la llamada se hace dentro de una unidad de
+        trabajo, todos los bloques se unen a su transacción.
+
+        Returns:
+            dict: Posición en `shipments` -> EntityAlreadyExistsError de cada envío rechazado.
+        """
+        rejected = {}
+        chunk = []
+        try:
+            for index, shipment in enumerate(shipments):
+                chunk.append((index, shipment))
+                if len(chunk) >= chunk_size:
+                    self._insert_chunk(chunk, rejected)
+                    chunk = []
+            if chunk:
+                self._insert_chunk(chunk, rejected)
+        except sqlite3.OperationalError as e:
+            raise PersistenceError(f"Error al guardar los envíos: {e}")
+        return rejected
+
+    def _insert_chunk(self, chunk, rejected):
+        """Inserta un bloque de (posición, envío) de add_many en una transacción."""
+        with self._connections.transaction() as conn:
+            cursor = conn.cursor()
+            codes = [shipment.tracking_code for _index, shipment in chunk]
+            placeholders = ", ".join("?" * len(codes))
+            cursor.execute(f"SELECT tracking_code FROM shipments WHERE tracking_code IN ({placeholders})", codes)
+            # Los bloques anteriores ya están en la tabla: basta con comprobar la tabla y el propio bloque
+            existing = {row[0] for row in cursor.fetchall()}
+            seen = set()
+
+            rows = []
+            history = []
+            inserted = []
+            for index, shipment in chunk:
+                code = shipment.tracking_code
+                if code in existing or code in seen:
+                    rejected[index] = EntityAlreadyExistsError(f"Ya existe un envío con el código '{code}'.")
+                    continue
+                seen.add(code)
+                rows.append((
+                    code,
+                    shipment.sender,
+                    shipment.recipient,
+                    shipment.priority,
+                    shipment.current_status,
+                    shipment.shipment_type.upper(),
+                    shipment.assigned_route
+                ))
+                history.extend((code, status, changed_at) for status, changed_at in shipment.get_status_timeline())
+                inserted.append(shipment)
+
+            cursor.executemany("""
+                INSERT INTO shipments (tracking_code, sender, recipient, priority, current_status, shipment_type, assigned_route_id, current_center_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, NULL)
+            """, rows)
+            cursor.executemany(
+                "INSERT INTO shipment_status_history (tracking_code, status, changed_at) VALUES (?, ?, ?)",
+                history
+            )
+
+        for shipment in inserted:
+            self._identity_map.add("shipment", shipment.tracking_code, shipment)
 
     def update(self, shipment):
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 
+                # Estado persistido antes de esta actualización: permite saber qué transiciones son nuevas
+                cursor.execute("SELECT current_status FROM shipments WHERE tracking_code = ?", (shipment.tracking_code,))
+                row = cursor.fetchone()
+                if row is None:
+                    raise EntityNotFoundError(f"No existe el envío '{shipment.tracking_code}'.")
+                persisted_status = row[0]
+
                 cursor.execute("""
                     UPDATE shipments 
                     SET sender = ?, recipient = ?, priority = ?, current_status = ?, assigned_route_id = ?
@@ -73,90 +168,340 @@ class ShipmentRepositorySQLite(ShipmentRepository):
                     shipment.tracking_code
                 ))
 
-                if cursor.rowcount == 0:
-                    raise EntityNotFoundError(f"No existe el envío '{shipment.tracking_code}'.")
+                # Historial append-only: solo se insertan las transiciones posteriores al estado persistido.
+                # Si el estado no ha cambiado (p. ej. cambio de prioridad) la tabla de historial no se toca.
+                self._append_history(cursor, shipment.tracking_code, self._new_transitions(shipment, persisted_status))
 
-                # The shipment history might have new states.
-                # To sync, we can just delete and recreate history, or insert missing.
-                # Let's delete and recreate to be safe and simple.
-                cursor.execute("DELETE FROM shipment_status_history WHERE tracking_code = ?", (shipment.tracking_code,))
-                for s in shipment.get_status_history():
-                    cursor.execute("INSERT INTO shipment_status_history (tracking_code, status) VALUES (?, ?)", (shipment.tracking_code, s))
-                    
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al actualizar el envío: {e}")
-        finally:
-            conn.close()
+
+    def update_many(self, shipments, chunk_size=_ADD_MANY_CHUNK_SIZE):
+        """
+        Actualiza varios envíos en una sola transacción, con `executemany` por bloques de `chunk_size`.
+
+        Igual que `update`, el historial solo recibe las transiciones posteriores al estado
+        persistido de cada envío.
+
+        Raises:
+            EntityNotFoundError: Si algún envío no existe; no se guarda ninguno.
+        """
+        shipments = list(shipments)
+        try:
+            with self._connections.transaction() as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(shipments), chunk_size):
+                    self._update_chunk(cursor, shipments[start:start + chunk_size])
+        except sqlite3.OperationalError as e:
+            raise PersistenceError(f"Error al actualizar los envíos: {e}")
+
+    def _update_chunk(self, cursor, chunk):
+        """Actualiza un bloque de envíos de update_many dentro de la transacción abierta."""
+        codes = [shipment.tracking_code for shipment in chunk]
+        placeholders = ", ".join("?" * len(codes))
+        cursor.execute(f"SELECT tracking_code, current_status FROM shipments WHERE tracking_code IN ({placeholders})", codes)
+        persisted = dict(cursor.fetchall())
+        missing = [code for code in codes if code not in persisted]
+        if missing:
+            raise EntityNotFoundError(f"No existen los envíos: {', '.join(missing)}.")
+
+        cursor.executemany("""
+            UPDATE shipments
+            SET sender = ?, recipient = ?, priority = ?, current_status = ?, assigned_route_id = ?
+            WHERE tracking_code = ?
+        """, [
+            (shipment.sender, shipment.recipient, shipment.priority, shipment.current_status,
+             shipment.assigned_route, shipment.tracking_code)
+            for shipment in chunk
+        ])
+        cursor.executemany(
+            "INSERT INTO shipment_status_history (tracking_code, status, changed_at) VALUES (?, ?, ?)",
+            [(shipment.tracking_code, status, changed_at)
+             for shipment in chunk
+             for status, changed_at in self._new_transitions(shipment, persisted[shipment.tracking_code])]
+        )
+
+    @staticmethod
+    def _new_transitions(shipment, persisted_status):
+        """Transiciones (estado, epoch) del envío posteriores a su estado persistido."""
+        if shipment.current_status == persisted_status:
+            return []
+        timeline = shipment.get_status_timeline()
+        statuses = [status for status, _changed_at in timeline]
+        if persisted_status not in statuses:
+            return []
+        return timeline[statuses.index(persisted_status) + 1:]
 
     def remove(self, tracking_code):
-        tracking_code = (tracking_code or "").strip()
+        # Los códigos se guardan en mayúsculas, como en get_by_tracking_code y get_many
+        tracking_code = (tracking_code or "").strip().upper()
         if not tracking_code:
             raise EntityNotFoundError("El código de seguimiento no puede estar vacío.")
 
-        conn = sqlite3.connect(self._db_path)
         try:
-            with conn:
+            with self._connections.transaction() as conn:
                 cursor = conn.cursor()
-                cursor.execute("PRAGMA foreign_keys = ON")
                 cursor.execute("DELETE FROM shipment_status_history WHERE tracking_code = ?", (tracking_code,))
                 cursor.execute("DELETE FROM shipments WHERE tracking_code = ?", (tracking_code,))
                 if cursor.rowcount == 0:
                     raise EntityNotFoundError(f"No existe un envío con el código '{tracking_code}'.")
+            self._identity_map.remove("shipment", tracking_code)
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al eliminar el envío: {e}")
-        finally:
-            conn.close()
 
     def get_by_tracking_code(self, tracking_code):
-        tracking_code = (tracking_code or "").strip()
+        # Misma normalización que get_many: ambos encuentran el envío y comparten la clave del mapa de identidad
+        tracking_code = (tracking_code or "").strip().upper()
         if not tracking_code:
             raise EntityNotFoundError("El código de seguimiento no puede estar vacío.")
 
-        conn = sqlite3.connect(self._db_path)
+        # Ya cargado en esta petición: mismo objeto, sin consultas
+        shipment = self._identity_map.get("shipment", tracking_code)
+        if shipment is not None:
+            return shipment
+
+        conn = self._connections.connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT tracking_code, sender, recipient, priority, current_status, shipment_type, assigned_route_id FROM shipments WHERE tracking_code = ?", (tracking_code,))
-            row = cursor.fetchone()
-            
-            if row is None:
+            shipments = self._fetch_shipments(cursor, "WHERE shipments.tracking_code = ?", (tracking_code,))
+            if not shipments:
                 raise EntityNotFoundError(f"No existe un envío con el código '{tracking_code}'.")
-            
-            tc, sender, recipient, priority, status, stype, route_id = row
-            
-            cursor.execute("SELECT status FROM shipment_status_history WHERE tracking_code = ? ORDER BY id ASC", (tracking_code,))
-            history = [r[0] for r in cursor.fetchall()]
-
-            # Determine type and create object
-            if stype == "FRAGILE":
-                shipment = FragileShipment(tc, sender, recipient, priority)
-            elif stype == "EXPRESS":
-                shipment = ExpressShipment(tc, sender, recipient)
-                # express ignores priority setting manually if not needed, or force it
-            else:
-                shipment = Shipment(tc, sender, recipient, priority)
-            
-            # Since the domain initiates history with REGISTERED, and status with REGISTERED, we override it internally:
-            shipment._current_status = status
-            shipment._status_history = history
-            shipment._assigned_route = route_id
-            
-            return shipment
+            return shipments[0]
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al recuperar el envío: {e}")
-        finally:
-            conn.close()
 
-    def list_all(self):
-        conn = sqlite3.connect(self._db_path)
+    def get_many(self, tracking_codes, ignore_missing=False, chunk_size=_ADD_MANY_CHUNK_SIZE):
+        """
+        Recupera varios envíos con consultas `IN (...)` de `chunk_size` códigos, en el orden pedido.
+
+        Los envíos ya cargados en la petición salen del mapa de identidad; el resto se
+        hidrata por bloques (dos consultas por bloque, envíos e historiales), no uno a uno.
+
+        Args:
+            tracking_codes (Iterable[str]): Códigos de seguimiento a buscar.
+            ignore_missing (bool): Si es True, los códigos que no existen se omiten en lugar de fallar.
+
+        Returns:
+            List[Shipment]: Un envío por código encontrado, en el mismo orden que `tracking_codes`.
+
+        Raises:
+            EntityNotFoundError: Si falta algún envío (y `ignore_missing` es False); el mensaje
+                incluye todos los códigos que no existen.
+        """
+        # Los códigos se guardan en mayúsculas: se busca sin distinguir mayúsculas, como en memoria
+        requested = list(tracking_codes)
+        codes = [(tracking_code or "").strip().upper() for tracking_code in requested]
+        found = {}
+        pending = []
+        for tracking_code in codes:
+            if tracking_code and tracking_code not in found:
+                shipment = self._identity_map.get("shipment", tracking_code)
+                found[tracking_code] = shipment
+                if shipment is None:
+                    pending.append(tracking_code)
+
+        if pending:
+            conn = self._connections.connection()
+            try:
+                cursor = conn.cursor()
+                for start in range(0, len(pending), chunk_size):
+                    chunk = pending[start:start + chunk_size]
+                    placeholders = ", ".join("?" * len(chunk))
+                    for shipment in self._fetch_shipments(
+                            cursor, f"WHERE shipments.tracking_code IN ({placeholders})", chunk):
+                        found[shipment.tracking_code] = shipment
+            except sqlite3.OperationalError as e:
+                raise PersistenceError(f"Error al recuperar los envíos: {e}")
+
+        shipments, missing = [], []
+        for tracking_code, code in zip(requested, codes):
+            shipment = found.get(code)
+            if shipment is None:
+                missing.append(tracking_code)
+            else:
+                shipments.append(shipment)
+        if missing and not ignore_missing:
+            raise EntityNotFoundError(f"No existen los envíos: {', '.join(missing)}.")
+        return shipments
+
+    def find(self, query):
+        """
+        Devuelve una página de envíos que cumplen una consulta, resuelta en SQL.
+
+        Los filtros, el orden, el cursor y el límite se traducen a `WHERE`/`ORDER BY`/`LIMIT`
+        sobre los índices de la migración 4, así que la consulta de códigos recorre solo el
+        tramo del índice que empieza en el cursor; después la página se hidrata con `get_many`.
+        El prefijo se resuelve como un rango del código (`>=` y `<`), que sí usa los índices.
+
+        Args:
+            query (ShipmentQuery): Filtros, orden, cursor y límite.
+
+        Returns:
+            List[Shipment]: Como mucho `query.limit` envíos, en el orden de la consulta.
+        """
+        conditions, params = [], []
+        for column, value in (("current_status", query.status), ("shipment_type", query.shipment_type),
+                              ("assigned_route_id", query.route_id), ("current_center_id", query.center_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if query.min_priority is not None:
+            conditions.append("priority >= ?")
+            params.append(query.min_priority)
+        if query.max_priority is not None:
+            conditions.append("priority <= ?")
+            params.append(query.max_priority)
+        if query.code_prefix is not None:
+            prefix = query.code_prefix
+            conditions.append("tracking_code >= ? AND tracking_code < ?")
+            params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+
+        if query.order_by == ORDER_BY_TRACKING_CODE:
+            order = "tracking_code"
+            if query.after is not None:
+                conditions.append("tracking_code > ?")
+                params.append(query.after)
+        else:
+            order = "priority DESC, tracking_code"
+            if query.after is not None:
+                after_priority, after_code = query.after
+                conditions.append("(priority < ? OR (priority = ? AND tracking_code > ?))")
+                params += [after_priority, after_priority, after_code]
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        conn = self._connections.connection()
         try:
             cursor = conn.cursor()
-            cursor.execute("SELECT tracking_code FROM shipments")
-            rows = cursor.fetchall()
-            shipments = []
-            for (tc,) in rows:
-                shipments.append(self.get_by_tracking_code(tc))
-            return shipments
+            cursor.execute(f"SELECT tracking_code FROM shipments {where} ORDER BY {order} LIMIT ?",
+                           params + [query.limit])
+            codes = [code for (code,) in cursor.fetchall()]
+        except sqlite3.OperationalError as e:
+            raise PersistenceError(f"Error al consultar los envíos: {e}")
+        return self.get_many(codes, ignore_missing=True)
+
+    def count_by(self, *fields):
+        """
+        Cuenta los envíos agrupados por uno o varios campos.
+
+        Lee la tabla `shipment_counts`, que los triggers de la migración 5 mantienen al día
+        en la misma transacción que cada escritura en `shipments`: un `GROUP BY` sobre unas
+        pocas filas por combinación de valores, no un recorrido de los envíos.
+
+        Args:
+            *fields (str): Campos de agrupación: "status", "type", "priority" o "route".
+
+        Returns:
+            dict: Valor -> número de envíos con un campo, o tupla de valores -> número de envíos
+            con varios. La ruta de los envíos sin asignar es None. Solo incluye grupos con envíos.
+
+        Raises:
+            ValueError: Si no se indica ningún campo o alguno no es válido.
+            PersistenceError: Si falla la consulta.
+        """
+        check_count_fields(fields)
+        columns = ", ".join(_COUNT_COLUMNS[field] for field in fields)
+        route = fields.index("route") if "route" in fields else None
+        conn = self._connections.connection()
+        try:
+            rows = conn.execute(f"SELECT {columns}, SUM(total) FROM shipment_counts GROUP BY {columns}").fetchall()
+        except sqlite3.OperationalError as e:
+            raise PersistenceError(f"Error al contar los envíos: {e}")
+
+        counts = {}
+        for *key, total in rows:
+            if route is not None:
+                key[route] = key[route] or None
+            counts[tuple(key) if len(key) > 1 else key[0]] = total
+        return counts
+
+    def list_all(self):
+        conn = self._connections.connection()
+        try:
+            # Dos consultas en total (envíos + historiales), independientemente del número de envíos
+            return self._fetch_shipments(conn.cursor())
         except sqlite3.OperationalError as e:
             raise PersistenceError(f"Error al listar envíos: {e}")
-        finally:
-            conn.close()
+
+    def _append_history(self, cursor, tracking_code, transitions):
+        """Inserta nuevas transiciones (estado, epoch) al final del historial, con el momento en que ocurrieron."""
+        cursor.executemany(
+            "INSERT INTO shipment_status_history (tracking_code, status, changed_at) VALUES (?, ?, ?)",
+            [(tracking_code, status, changed_at) for status, changed_at in transitions]
+        )
+
+    def _fetch_shipments(self, cursor, where="", params=()):
+        """
+        Carga en bloque los envíos que cumplen `where` junto con sus historiales.
+
+        Ejecuta un número constante de consultas: una para las filas de `shipments` y otra
+        para todo el historial de esos envíos, agrupado después en memoria por código.
+
+        Args:
+            cursor (sqlite3.Cursor): Cursor de la conexión activa.
+            where (str): Cláusula WHERE opcional, con columnas cualificadas como `shipments.<columna>`.
+            params (tuple): Parámetros de la cláusula WHERE.
+
+        Returns:
+            list[Shipment]: Envíos reconstruidos, en el orden devuelto por la consulta.
+        """
+        rows, histories = self._fetch_rows(cursor, where, params)
+        return [self._hydrate(row, histories) for row in rows]
+
+    def _fetch_shipments_by_center(self, cursor, where="", params=()):
+        """
+        Igual que `_fetch_shipments`, pero agrupa los envíos por su `current_center_id`.
+
+        Returns:
+            dict: Mapa center_id -> lista de envíos presentes en ese centro.
+        """
+        rows, histories = self._fetch_rows(cursor, where, params)
+        by_center = {}
+        for row in rows:
+            by_center.setdefault(row[7], []).append(self._hydrate(row, histories))
+        return by_center
+
+    def _fetch_rows(self, cursor, where, params):
+        """
+        Ejecuta las dos consultas de hidratación y devuelve (filas, historiales agrupados por código).
+
+        Cada historial es un par de listas paralelas (estados, momentos de cada transición).
+        """
+        cursor.execute(f"SELECT {_SHIPMENT_COLUMNS} FROM shipments {where}", params)
+        rows = cursor.fetchall()
+        if not rows:
+            return rows, {}
+
+        # El id del historial es INTEGER PRIMARY KEY (rowid), por lo que ORDER BY id no requiere ordenación extra
+        if where:
+            cursor.execute(
+                "SELECT h.tracking_code, h.status, h.changed_at FROM shipment_status_history h "
+                f"JOIN shipments ON shipments.tracking_code = h.tracking_code {where} ORDER BY h.id",
+                params
+            )
+        else:
+            cursor.execute("SELECT tracking_code, status, changed_at FROM shipment_status_history ORDER BY id")
+        histories = {}
+        for tc, status, changed_at in cursor:
+            history = histories.get(tc)
+            if history is None:
+                history = histories[tc] = ([], [])
+            history[0].append(status)
+            history[1].append(changed_at)
+        return rows, histories
+
+    def _hydrate(self, row, histories):
+        """Devuelve el envío de la fila: el ya registrado en el mapa de identidad o uno nuevo."""
+        shipment = self._identity_map.get("shipment", row[0])
+        if shipment is None:
+            shipment = self._identity_map.add("shipment", row[0], self._build_shipment(row, histories.get(row[0], ((), ()))))
+        return shipment
+
+    def _build_shipment(self, row, history):
+        """Reconstruye un envío del tipo adecuado a partir de su fila y su historial (estados, momentos)."""
+        tc, sender, recipient, priority, status, stype, route_id, center_id = row
+        statuses, changed_at = history
+
+        # Vía rápida: los datos ya se validaron al guardarlos, no se repiten las validaciones del constructor.
+        # La clase (y cómo se reconstruye) la aporta el registro de tipos: un tipo nuevo no requiere cambios aquí
+        return SHIPMENT_TYPES.hydrator(stype)(
+            tc, sender, recipient, priority, status, statuses, route_id, changed_at, current_center_id=center_id
+        )
@@ -0,0 +1,60 @@
+# infrastructure/sqlite_unit_of_work.py
+"""
+Unidad de trabajo para los repositorios SQLite.
+
+Abre una transacción en la conexión del hilo actual a través del gestor de
+conexiones compartido. Mientras está abierta, las escrituras de los repositorios
+que usan ese mismo gestor se unen a ella en lugar de confirmar cada una por su
+cuenta, de modo que un caso de uso completo paga un único `commit` (y un único
+fsync) y un fallo a mitad deshace todo lo escrito.
+"""
+
+import threading
+
+from logistica.domain.unit_of_work import UnitOfWork
+
+
+class UnitOfWorkSQLite(UnitOfWork):
+    """
+    Unidad de trabajo respaldada por `SQLiteConnectionManager.transaction()`.
+
+    Los repositorios deben compartir el `connection_manager` pasado aquí;
+    las escrituras de un repositorio con su propio gestor no participan.
+
+    Si se le pasa el mapa de identidad de los repositorios, lo vacía al deshacer la
+    transacción más externa: los objetos cargados ya no reflejan la base de datos.
+    """
+
+    def __init__(self, connection_manager, identity_map=None):
+        """
+        Args:
+            connection_manager (SQLiteConnectionManager): Gestor compartido con los repositorios.
+            identity_map (IdentityMap, opcional): Mapa de identidad compartido con los repositorios.
+        """
+        self._connections = connection_manager
+        self._identity_map = identity_map
+        # Pila de contextos abiertos por hilo: la unidad de trabajo puede anidarse
+        # y la misma instancia la usan todos los hilos del servidor
+        self._local = threading.local()
+
+    def _transactions(self):
+        transactions = getattr(self._local, "transactions", None)
+        if transactions is None:
+            transactions = self._local.transactions = []
+        return transactions
+
+    def begin(self):
+        transaction = self._connections.transaction()
+        transaction.__enter__()
+        self._transactions().append(transaction)
+
+    def commit(self):
+        self._transactions().pop().__exit__(None, None, None)
+
+    def rollback(self):
+        # Al recibir una excepción el contexto deshace la transacción (solo en el nivel externo)
+        transactions = self._transactions()
+        error = RuntimeError("Unidad de trabajo cancelada.")
+        transactions.pop().__exit__(RuntimeError, error, None)
+        if not transactions and self._identity_map is not None:
+            self._identity_map.clear()
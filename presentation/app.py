@@ -19,7 +19,7 @@
 # | if opcion == "15": complete_route       | @app.route("/routes/<route_id>/completar")                      |
 # | input("Código: ")                       | <string:tracking_code> en la URL                                |
 # | print("X " + str(e))                    | @app.errorhandler(Error) -> devuelve HTML + código 4xx/5xx                |
-# | shipment_service.list_shipments()       | (Igual, llamado dentro de la ruta Flask)                  |
+# | shipment_service.list_shipments()       | shipment_service.find_shipments(query), paginado con ?despues= |
 # | seed_repository()                       | seed_repository(use_sqlite=True)                                |
 # Notas del sistema:
 # - Se mantiene la lógica de negocio intacta en la capa de application.
@@ -35,6 +35,8 @@ from logistica.infrastructure.seed_data import seed_repository
 from logistica.application.shipment_service import ShipmentService
 from logistica.application.route_service import RouteService
 from logistica.application.center_service import CenterService
+from logistica.application.statistics_service import StatisticsService
+from logistica.domain.shipment_query import ShipmentQuery, ORDER_BY_TRACKING_CODE, ORDER_BY_PRIORITY
 from logistica.infrastructure.errores import EntityNotFoundError, EntityAlreadyExistsError, PersistenceError
 import logging
 
@@ -48,12 +50,18 @@ app = Flask(__name__)
 repos = seed_repository(use_sqlite=True)
 shipment_service = ShipmentService(repos["shipments"])
 center_service = CenterService(repos["centers"], repos["shipments"])
-route_service = RouteService(repos["routes"], repos["shipments"], repos["centers"])
+route_service = RouteService(repos["routes"], repos["shipments"], repos["centers"], repos["unit_of_work"])
+statistics_service = StatisticsService(repos["shipments"], repos["centers"])
 
 @app.before_request
 def log_peticion():
     app.logger.info(f"{request.method} {request.path}")
 
+@app.teardown_request
+def limpiar_mapa_identidad(error=None):
+    # El mapa de identidad dura lo que dura la petición
+    repos["identity_map"].clear()
+
 @app.errorhandler(EntityNotFoundError)
 def handle_not_found(error):
     return (f"<h2>404 - No encontrado</h2>"
@@ -84,9 +92,10 @@ def bienvenida():
         "<h1>Bienvenido al sistema de logística</h1>"
         "<p>Consultas:</p>"
         "<ul>"
-        f"<li><a href='{url_for('listar_envios')}'>/shipments</a>: lista todos los envíos</li>"
+        f"<li><a href='{url_for('listar_envios')}'>/shipments</a>: lista los envíos por páginas (filtros: estado, tipo, prioridad_min, prioridad_max, ruta, centro, prefijo, orden, limite)</li>"
         f"<li><a href='{url_for('list_centers')}'>/centers</a>: lista todos los centros logísticos</li>"
         f"<li><a href='{url_for('list_routes')}'>/routes</a>: lista todas las rutas</li>"
+        f"<li><a href='{url_for('estadisticas')}'>/estadisticas</a>: recuentos de envíos (JSON)</li>"
         "</ul>"
     )
 
@@ -105,15 +114,50 @@ def ayuda():
 # === RUTAS DE ENVÍOS ===
 @app.route("/shipments")
 def listar_envios():
-    envios = shipment_service.list_shipments()
+    # Filtros, orden y página por parámetros de la URL (?estado=in_transit&tipo=fragile&limite=20...).
+    # Se resuelven en el repositorio con find_shipments: cada página cuesta lo mismo con mil envíos que con un millón
+    orden = request.args.get("orden", ORDER_BY_TRACKING_CODE)
+    query = ShipmentQuery(
+        status=request.args.get("estado"),
+        shipment_type=request.args.get("tipo"),
+        min_priority=_entero(request.args.get("prioridad_min")),
+        max_priority=_entero(request.args.get("prioridad_max")),
+        route_id=request.args.get("ruta"),
+        center_id=request.args.get("centro"),
+        code_prefix=request.args.get("prefijo"),
+        order_by=orden,
+        after=_leer_cursor(orden, request.args.get("despues")),
+        limit=_entero(request.args.get("limite")) or 50,
+    )
+    envios, cursor = shipment_service.find_shipments(query)
     if not envios:
-        return "No hay envíos registrados."
+        return "No hay envíos registrados." if not request.args else "No hay envíos que cumplan los filtros."
     lineas = [
         f"{tracking_code} — Estado: {current_status} — Prioridad: {priority} — Tipo: {shipment_type} — Ruta: {assigned_route or '(sin ruta)'}"
         for tracking_code, current_status, priority, shipment_type, assigned_route in envios
     ]
+    if cursor is not None:
+        parametros = {**request.args.to_dict(), "despues": _escribir_cursor(cursor)}
+        lineas.append(f"<a href='{url_for('listar_envios', **parametros)}'>Página siguiente</a>")
     return "<br>".join(lineas)
 
+def _entero(valor):
+    """Convierte un parámetro numérico de la URL; un valor no numérico produce ValueError (400)."""
+    return None if valor in (None, "") else int(valor)
+
+def _leer_cursor(orden, valor):
+    """Cursor de la URL: el código en el orden por código, 'prioridad-código' en el orden por prioridad."""
+    if not valor:
+        return None
+    if orden == ORDER_BY_PRIORITY:
+        prioridad, _, codigo = valor.partition("-")
+        return (int(prioridad), codigo)
+    return valor
+
+def _escribir_cursor(cursor):
+    """Inverso de _leer_cursor."""
+    return f"{cursor[0]}-{cursor[1]}" if isinstance(cursor, tuple) else cursor
+
 @app.route("/shipments/<string:tracking_code>")
 def get_shipment(tracking_code):
     shipment = shipment_service.get_shipment(tracking_code)
@@ -219,5 +263,14 @@ def complete_route(route_id):
     route_service.complete_route(route_id)
     return redirect(url_for('list_routes'))
 
+
+# === ESTADÍSTICAS ===
+@app.route("/estadisticas")
+def estadisticas():
+    # JSON para cuadros de mando; las claves JSON son cadenas, así que los envíos sin ruta van bajo "(sin ruta)"
+    snapshot = statistics_service.snapshot()
+    snapshot["by_route"] = {route or "(sin ruta)": total for route, total in snapshot["by_route"].items()}
+    return snapshot
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -1,8 +1,11 @@
 # presentation/menu.py
 
+import time
+
 from logistica.application.shipment_service import ShipmentService
 from logistica.application.route_service import RouteService
 from logistica.application.center_service import CenterService
+from logistica.domain.shipment_query import ShipmentQuery
 from logistica.infrastructure.seed_data import seed_repository
 from logistica.infrastructure.errores import (
     EntityAlreadyExistsError,
@@ -41,7 +44,8 @@ def main():
     route_service = RouteService(
         repositories["routes"],
         repositories["shipments"],
-        repositories["centers"]
+        repositories["centers"],
+        repositories["unit_of_work"]
     )
     center_service = CenterService(
         repositories["centers"],
@@ -49,6 +53,8 @@ def main():
     )
 
     while True:
+        # Cada opción del menú es una petición: no se reutilizan objetos cargados en la anterior
+        repositories["identity_map"].clear()
         mostrar_menu()
         opcion = input("Elige una opción: ").strip()
 
@@ -86,10 +92,17 @@ def main():
 
 
             elif opcion == "5":
-                envios = shipment_service.list_shipments()
-                for code, status, priority, shipment_type, route in envios:
-                    route_str = route or "(sin ruta)"
-                    print(f"- {code:<10} | {status:^13} | P:{priority:<2} | {shipment_type:<10} | Ruta: {route_str}")
+                status = input("Filtrar por estado (vacío = todos): ").strip()
+                route_id = input("Filtrar por ruta (vacío = todas): ").strip()
+                query = ShipmentQuery(status=status, route_id=route_id, limit=20)
+                while True:
+                    envios, cursor = shipment_service.find_shipments(query)
+                    for code, status, priority, shipment_type, route in envios:
+                        route_str = route or "(sin ruta)"
+                        print(f"- {code:<10} | {status:^13} | P:{priority:<2} | {shipment_type:<10} | Ruta: {route_str}")
+                    if cursor is None or input("Intro para ver más, 'q' para terminar: ").strip().lower() == "q":
+                        break
+                    query = query.next_page(cursor)
 
 
             elif opcion == "6":
@@ -108,8 +121,14 @@ def main():
                     route_str = shipment.assigned_route if shipment.assigned_route else "(sin ruta)"
                     print(f"Ruta asignada: {route_str}")
                     print("\n=== Historial de estados ===")
-                    for i, estado in enumerate(shipment.get_status_history(), start=1):
-                        print(f"  {i}. {estado}")
+                    for i, (estado, desde) in enumerate(shipment.get_status_timeline(), start=1):
+                        if desde is None:
+                            print(f"  {i}. {estado}")
+                        else:
+                            print(f"  {i}. {estado} (desde {time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(desde))})")
+                    tiempo_entrega = shipment.time_to_delivery()
+                    if tiempo_entrega is not None:
+                        print(f"Tiempo hasta la entrega: {tiempo_entrega / 3600:.1f} h")
 
 
             elif opcion == "7":
@@ -163,14 +182,10 @@ def main():
                     if code.strip()
                 ]
 
-                assigned_tracking_codes, failed_assignments = [], []
-
-                for code in tracking_codes:
-                    try:
-                        route_service.assign_shipment_to_route(code, route_id)
-                        assigned_tracking_codes.append(code)
-                    except (ValueError, EntityAlreadyExistsError, EntityNotFoundError, PersistenceError) as e:
-                        failed_assignments.append((code, str(e)))
+                # Una sola operación: la ruta se carga una vez y todo se guarda en una transacción
+                report = route_service.assign_shipments_to_route(route_id, tracking_codes)
+                assigned_tracking_codes = [code for code, error in report if error is None]
+                failed_assignments = [(code, error) for code, error in report if error is not None]
 
                 print("\n=== Resumen de asignación ===")
 
@@ -4,6 +4,7 @@ import unittest
 from logistica.domain.center import Center
 from logistica.domain.shipment import Shipment
 from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
 
 class TestCenter(unittest.TestCase):
 
@@ -66,5 +67,70 @@ class TestCenter(unittest.TestCase):
         lista.append(self.shipment2)  # modificar copia
         self.assertEqual(len(self.center.list_shipments()), 1)  # original no se afecta
 
+    def test_inventory_keeps_insertion_order(self):
+        self.center.receive_shipment(self.shipment2)
+        self.center.receive_shipment(self.shipment1)
+        self.assertEqual(self.center.list_shipments(), [self.shipment2, self.shipment1])
+
+    def test_occupancy_counters(self):
+        fragile = FragileShipment("FRG001", "S", "R", 3)
+        express = ExpressShipment("EXP001", "S", "R")
+        for shipment in (self.shipment1, fragile, express):
+            self.center.receive_shipment(shipment)
+        self.assertEqual(self.center.shipment_count, 3)
+        self.assertEqual(self.center.count_by_type(), {"STANDARD": 1, "FRAGILE": 1, "EXPRESS": 1})
+        self.assertEqual(self.center.count_by_priority(), {self.shipment1.priority: 1, 3: 2})
+
+        self.center.dispatch_shipment(express)
+        self.assertEqual(self.center.shipment_count, 2)
+        self.assertEqual(self.center.count_by_type(), {"STANDARD": 1, "FRAGILE": 1})
+        self.assertEqual(self.center.count_by_priority(), {self.shipment1.priority: 1, 3: 1})
+
+    def test_priority_counters_follow_priority_changes(self):
+        shipment = Shipment("PRI001", "S", "R", 1)
+        self.center.receive_shipment(shipment)
+        shipment.increase_priority()
+        # El envío no avisa al centro: hasta refresh_shipment los contadores no cambian
+        self.assertEqual(self.center.count_by_priority(), {1: 1})
+        self.center.refresh_shipment(shipment)
+        self.assertEqual(self.center.count_by_priority(), {2: 1})
+
+        # Fuera del centro el envío ya no afecta a sus contadores
+        self.center.dispatch_shipment(shipment)
+        shipment.decrease_priority()
+        self.center.refresh_shipment(shipment)
+        self.assertEqual(self.center.count_by_priority(), {})
+        self.assertIsNone(shipment.current_center_id)
+
+    def test_dispatch_queue_follows_inventory(self):
+        low = Shipment("LOW001", "S", "R", 1)
+        high = Shipment("HIG001", "S", "R", 2)
+        self.center.receive_shipment(low)
+        self.center.receive_shipment(high)
+        queue = self.center.dispatch_queue
+        self.assertIs(queue.peek(), high)
+
+        # Los cambios de prioridad y de ruta del envío se reflejan en la cola al notificarlos
+        low.increase_priority()
+        low.increase_priority()
+        self.center.refresh_shipment(low)
+        self.assertIs(queue.peek(), low)
+        low.assign_route("MAD01-BCN02-STD-001")
+        self.center.refresh_shipment(low)
+        self.assertNotIn("LOW001", queue)
+        low.remove_route()
+        self.center.refresh_shipment(low)
+        self.assertIn("LOW001", queue)
+
+        self.center.dispatch_shipment(high)
+        self.assertEqual(queue.take_next(5), [low])
+
+    def test_from_record_starts_with_empty_inventory(self):
+        center = Center.from_record("MAD16", "Madrid Centro", "Calle 1")
+        self.assertEqual(center.center_id, "MAD16")
+        self.assertEqual(center.shipment_count, 0)
+        center.receive_shipment(self.shipment1)
+        self.assertEqual(center.count_by_type(), {"STANDARD": 1})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,167 @@
+# tests/test_columnar_shipment.py
+
+import unittest
+from logistica.infrastructure.columnar_shipment import ShipmentRepositoryColumnar
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+from logistica.application.shipment_service import ShipmentService
+from logistica.infrastructure.errores import EntityAlreadyExistsError, EntityNotFoundError
+from logistica.domain.shipment_query import ShipmentQuery, ORDER_BY_PRIORITY
+from logistica.tests.test_shipment_query import sample_shipments, expected, all_pages
+from logistica.tests.test_statistics_service import brute_force
+
+class TestShipmentRepositoryColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryColumnar()
+
+    def test_add_and_get_materializes_same_data(self):
+        self.repo.add(FragileShipment("FRG001", "Shein", "Ana", 3))
+        self.repo.add(ExpressShipment("EXP001", "Apple", "Luis"))
+
+        s = self.repo.get_by_tracking_code("frg001")
+        self.assertIsInstance(s, FragileShipment)
+        self.assertEqual((s.tracking_code, s.sender, s.recipient, s.priority), ("FRG001", "Shein", "Ana", 3))
+        self.assertEqual(s.get_status_history(), ["REGISTERED"])
+        self.assertIsNone(s.assigned_route)
+        self.assertIsInstance(self.repo.get_by_tracking_code("EXP001"), ExpressShipment)
+
+    def test_duplicate_and_missing_codes(self):
+        self.repo.add(Shipment("ABC123", "A", "B", 1))
+        with self.assertRaises(EntityAlreadyExistsError):
+            self.repo.add(Shipment("ABC123", "C", "D", 2))
+        with self.assertRaises(EntityNotFoundError):
+            self.repo.get_by_tracking_code("ZZZ999")
+        with self.assertRaises(EntityNotFoundError):
+            self.repo.get_by_tracking_code("  ")
+
+    def test_update_persists_mutations(self):
+        self.repo.add(Shipment("ABC123", "A", "B", 1))
+        s = self.repo.get_by_tracking_code("ABC123")
+        s.update_status("IN_TRANSIT")
+        s.increase_priority()
+        s.assign_route("MAD16-BCN03-STD-001")
+        # Cada consulta devuelve un objeto nuevo: sin update() el cambio no se guarda
+        self.assertEqual(self.repo.get_by_tracking_code("ABC123").current_status, "REGISTERED")
+
+        self.repo.update(s)
+        stored = self.repo.get_by_tracking_code("ABC123")
+        self.assertEqual(stored.current_status, "IN_TRANSIT")
+        self.assertEqual(stored.get_status_history(), ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(stored.priority, 2)
+        self.assertEqual(stored.assigned_route, "MAD16-BCN03-STD-001")
+
+    def test_update_many_checks_every_code_first(self):
+        self.repo.add_many([Shipment("ABC001", "A", "B", 1), Shipment("ABC002", "A", "B", 1)])
+        first = self.repo.get_by_tracking_code("ABC001")
+        first.update_status("IN_TRANSIT")
+        with self.assertRaises(EntityNotFoundError):
+            self.repo.update_many([first, Shipment("ZZZ999", "A", "B", 1)])
+        self.assertEqual(self.repo.get_by_tracking_code("ABC001").current_status, "REGISTERED")
+
+        self.repo.update_many([first])
+        self.assertEqual(self.repo.get_by_tracking_code("ABC001").current_status, "IN_TRANSIT")
+
+    def test_get_many_preserves_order_and_reports_missing(self):
+        self.repo.add_many([Shipment("ABC001", "A", "B", 1), Shipment("ABC002", "A", "B", 1)])
+        self.assertEqual([s.tracking_code for s in self.repo.get_many(["abc002", "ABC001"])], ["ABC002", "ABC001"])
+        with self.assertRaises(EntityNotFoundError) as cm:
+            self.repo.get_many(["ZZZ998", "ABC001", "ZZZ999"])
+        self.assertIn("ZZZ998, ZZZ999", str(cm.exception))
+        self.assertEqual(len(self.repo.get_many(["ZZZ998", "ABC001"], ignore_missing=True)), 1)
+
+    def test_find_scans_columns(self):
+        shipments = sample_shipments()
+        self.repo.add_many(shipments)
+        for query in (ShipmentQuery(shipment_type="fragile"), ShipmentQuery(code_prefix="std", max_priority=2),
+                      ShipmentQuery(route_id="mad01-bcn02-std-001", order_by=ORDER_BY_PRIORITY),
+                      ShipmentQuery(route_id="NOEXISTE"), ShipmentQuery(shipment_type="express")):
+            self.assertEqual([s.tracking_code for s in self.repo.find(query)], expected(shipments, query))
+        for query in (ShipmentQuery(limit=5), ShipmentQuery(order_by=ORDER_BY_PRIORITY, limit=4)):
+            self.assertEqual(all_pages(self.repo, query), expected(shipments, query))
+        with self.assertRaises(ValueError):
+            self.repo.find(ShipmentQuery(center_id="MAD01"))
+
+    def test_status_times_are_preserved(self):
+        self.repo.add(Shipment.from_record("ABC123", "A", "B", 1, "IN_TRANSIT", ["REGISTERED", "IN_TRANSIT"],
+                                           status_times=[1000.0, 1060.25]))
+        self.repo.add(Shipment.from_record("ABC124", "A", "B", 1, "REGISTERED", ["REGISTERED"]))
+        self.assertEqual(self.repo.get_by_tracking_code("ABC123").get_status_timeline(),
+                         [("REGISTERED", 1000.0), ("IN_TRANSIT", 1060.25)])
+        self.assertEqual(self.repo.get_by_tracking_code("ABC124").get_status_timeline(), [("REGISTERED", None)])
+
+    def test_irregular_history_is_preserved(self):
+        s = Shipment.from_record("ABC123", "A", "B", 1, "IN_TRANSIT", ["REGISTERED", "IN_TRANSIT", "IN_TRANSIT"])
+        self.repo.add(s)
+        self.assertEqual(self.repo.get_by_tracking_code("ABC123").get_status_history(),
+                         ["REGISTERED", "IN_TRANSIT", "IN_TRANSIT"])
+
+    def test_counts_without_materializing(self):
+        self.repo.add_many([
+            Shipment("ABC001", "A", "B", 1),
+            FragileShipment("ABC002", "A", "B", 2),
+            ExpressShipment("ABC003", "A", "B"),
+            Shipment("ABC004", "A", "B", 1),
+        ])
+        s = self.repo.get_by_tracking_code("ABC004")
+        s.update_status("IN_TRANSIT")
+        self.repo.update(s)
+
+        self.assertEqual(self.repo.shipment_count, 4)
+        self.assertEqual(self.repo.count_by_status(), {"REGISTERED": 3, "IN_TRANSIT": 1})
+        self.assertEqual(self.repo.count_by_type(), {"STANDARD": 2, "FRAGILE": 1, "EXPRESS": 1})
+        self.assertEqual(self.repo.count_by_priority(), {1: 2, 2: 1, 3: 1})
+
+    def test_count_by_groups_columns(self):
+        shipments = sample_shipments()
+        self.repo.add_many(shipments)
+        self.repo.remove("STD001")
+        shipments = [s for s in shipments if s.tracking_code != "STD001"]
+        for fields in (("status",), ("route",), ("type", "priority"), ("status", "type", "priority", "route")):
+            self.assertEqual(self.repo.count_by(*fields), brute_force(shipments, *fields))
+        with self.assertRaises(ValueError):
+            self.repo.count_by("center")
+
+    def test_add_many_reports_duplicates(self):
+        self.repo.add(Shipment("ABC001", "A", "B", 1))
+        rejected = self.repo.add_many([
+            Shipment("ABC002", "A", "B", 1),
+            Shipment("ABC001", "A", "B", 1),
+            Shipment("ABC002", "A", "B", 1),
+        ])
+        self.assertEqual(sorted(rejected), [1, 2])
+        self.assertEqual([s.tracking_code for s in self.repo.list_all()], ["ABC001", "ABC002"])
+
+    def test_remove_and_compaction(self):
+        codes = [f"ABC{i:04d}" for i in range(3000)]
+        self.repo.add_many([Shipment(code, f"S{i % 7}", "R", 1 + i % 3) for i, code in enumerate(codes)])
+        for code in codes[:2500]:
+            self.repo.remove(code)
+        with self.assertRaises(EntityNotFoundError):
+            self.repo.remove(codes[0])
+
+        # Tras compactar no quedan filas eliminadas y el índice sigue encontrando los envíos vivos
+        self.assertLess(len(self.repo._status), 3000)
+        self.assertEqual(self.repo.shipment_count, 500)
+        self.assertEqual([s.tracking_code for s in self.repo.list_all()], codes[2500:])
+        self.assertEqual(self.repo.get_by_tracking_code(codes[2999]).sender, "S3")
+        self.assertEqual(sum(self.repo.count_by_priority().values()), 500)
+
+        # Un código eliminado puede volver a registrarse
+        self.repo.add(Shipment(codes[0], "A", "B", 1))
+        self.assertEqual(self.repo.get_by_tracking_code(codes[0]).tracking_code, codes[0])
+
+    def test_strings_are_interned(self):
+        self.repo.add_many([Shipment(f"ABC{i:03d}", "Amazon", "Juan", 1) for i in range(100)])
+        self.assertEqual(len(self.repo._strings._strings), 2)
+
+    def test_works_behind_shipment_service(self):
+        service = ShipmentService(self.repo)
+        service.register_shipment("ABC123", "A", "B", 2, "fragile")
+        service.update_shipment_status("ABC123", "IN_TRANSIT")
+        self.assertEqual(service.get_shipment("ABC123").current_status, "IN_TRANSIT")
+        self.assertIsInstance(service.get_shipment("ABC123"), FragileShipment)
+
+if __name__ == '__main__':
+    unittest.main()
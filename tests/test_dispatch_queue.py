@@ -0,0 +1,93 @@
+# tests/test_dispatch_queue.py
+
+import unittest
+from logistica.domain.dispatch_queue import DispatchQueue
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+
+class TestDispatchQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = DispatchQueue()
+        self.std_low = Shipment("STD001", "A", "B", 1)
+        self.std_high = Shipment("STD002", "A", "B", 3)
+        self.fragile = FragileShipment("FRG001", "A", "B", 2)
+        self.express = ExpressShipment("EXP001", "A", "B")
+        self.std_high_later = Shipment("STD003", "A", "B", 3)
+        for shipment in (self.std_low, self.std_high, self.fragile, self.express, self.std_high_later):
+            self.queue.push(shipment)
+
+    def test_order_express_then_priority_then_arrival(self):
+        self.assertEqual(self.queue.take_next(10),
+                         [self.express, self.std_high, self.std_high_later, self.fragile, self.std_low])
+        self.assertEqual(len(self.queue), 0)
+
+    def test_take_next_by_type(self):
+        self.assertEqual(self.queue.take_next(1, shipment_type="standard"), [self.std_high])
+        self.assertEqual(self.queue.take_next(5, shipment_type="FRAGILE"), [self.fragile])
+        self.assertEqual(self.queue.take_next(5, shipment_type="EXPRESS"), [self.express])
+        self.assertEqual(self.queue.take_next(5), [self.std_high_later, self.std_low])
+
+    def test_next_shipments_does_not_remove(self):
+        self.assertEqual(self.queue.next_shipments(2), [self.express, self.std_high])
+        self.assertEqual(self.queue.next_shipments(5, "standard"), [self.std_high, self.std_high_later, self.std_low])
+        self.queue.discard("STD002")
+        self.assertEqual(self.queue.next_shipments(1, "STANDARD"), [self.std_high_later])
+        self.assertEqual(len(self.queue), 4)
+
+    def test_next_shipments_matches_pop_order_with_cancelled_entries(self):
+        queue = DispatchQueue()
+        shipments = [Shipment(f"STD{i:03d}", "A", "B", 1 + i % 3) for i in range(60)]
+        for shipment in shipments:
+            queue.push(shipment)
+        # Entradas anuladas repartidas por el montículo (por debajo del umbral de compactación)
+        for shipment in shipments[::4]:
+            queue.discard(shipment.tracking_code)
+        for shipment in shipments[1::6]:
+            if shipment.priority < 3:
+                shipment.increase_priority()
+                queue.reprioritize(shipment)
+        expected = queue.next_shipments(10)
+        self.assertEqual(queue.take_next(10), expected)
+        self.assertEqual(queue.next_shipments(1000), queue.take_next(1000))
+
+    def test_pop_and_peek(self):
+        self.assertIs(self.queue.peek(), self.express)
+        self.assertIs(self.queue.pop(), self.express)
+        self.assertIs(self.queue.pop("fragile"), self.fragile)
+        with self.assertRaises(ValueError):
+            self.queue.pop("fragile")
+        self.assertIsNone(self.queue.peek("express"))
+
+    def test_push_duplicate_raises(self):
+        with self.assertRaises(ValueError):
+            self.queue.push(self.std_low)
+
+    def test_discard_and_reprioritize(self):
+        self.queue.discard("EXP001")
+        self.queue.discard("NOT001")
+        self.assertNotIn("EXP001", self.queue)
+
+        # Sube de prioridad: adelanta a los de prioridad menor, pero no a los que llegaron antes
+        self.std_low.increase_priority()
+        self.std_low.increase_priority()
+        self.queue.reprioritize(self.std_low)
+        self.assertEqual(self.queue.take_next(10), [self.std_low, self.std_high, self.std_high_later, self.fragile])
+
+    def test_repeated_priority_changes_and_compaction(self):
+        shipments = [Shipment(f"ABC{i:03d}", "A", "B", 1) for i in range(200)]
+        queue = DispatchQueue()
+        for shipment in shipments:
+            queue.push(shipment)
+        for shipment in shipments:
+            shipment.increase_priority()
+            queue.reprioritize(shipment)
+            shipment.decrease_priority()
+            queue.reprioritize(shipment)
+        for shipment in shipments[:150]:
+            queue.discard(shipment.tracking_code)
+        self.assertEqual(queue.take_next(100), shipments[150:])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# tests/test_load_planning_service.py
+
+import unittest
+from logistica.application.load_planning_service import LoadPlanningService
+from logistica.application.route_service import RouteService
+from logistica.application.center_service import CenterService
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+from logistica.infrastructure.errores import EntityNotFoundError
+
+class TestLoadPlanningService(unittest.TestCase):
+
+    def setUp(self):
+        self.route_repo = RouteRepositoryMemory()
+        self.center_repo = CenterRepositoryMemory()
+        self.shipment_repo = ShipmentRepositoryMemory()
+        center_service = CenterService(self.center_repo, self.shipment_repo)
+        center_service.register_center("MAD01", "Madrid", "Calle A")
+        center_service.register_center("BCN02", "Barcelona", "Calle B")
+        self.route_service = RouteService(self.route_repo, self.shipment_repo, self.center_repo)
+        self.service = LoadPlanningService(self.route_repo, self.shipment_repo, self.center_repo)
+        self.center = self.center_repo.get_by_center_id("MAD01")
+
+    def receive(self, *shipments):
+        for shipment in shipments:
+            self.shipment_repo.add(shipment)
+            self.center.receive_shipment(shipment)
+
+    def test_plan_respects_lane_priority_and_capacity(self):
+        self.route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.route_service.create_route("MAD01-BCN02-STD-002", "MAD01", "BCN02")
+        self.route_service.create_route("MAD01-BCN02-EXP-001", "MAD01", "BCN02")
+        self.route_service.create_route("BCN02-MAD01-STD-001", "BCN02", "MAD01")
+        low = [Shipment(f"STD{i:03d}", "A", "B", 1) for i in range(3)]
+        high = [Shipment(f"STD{i:03d}", "A", "B", 3) for i in range(3, 6)]
+        self.receive(*low, *high, ExpressShipment("EXP001", "A", "B"), FragileShipment("FRG001", "A", "B", 2))
+
+        plan = self.service.plan_center("mad01", 2, capacities={"mad01-bcn02-std-002": 3})
+
+        # Los de mayor prioridad ocupan las plazas; primero la ruta con más plazas libres
+        self.assertEqual(plan.assignments(), {
+            "MAD01-BCN02-STD-002": ["STD003", "STD004", "STD005"],
+            "MAD01-BCN02-STD-001": ["STD000", "STD001"],
+            "MAD01-BCN02-EXP-001": ["EXP001"],
+        })
+        # Sin ruta frágil ni plaza para el último estándar
+        self.assertEqual(plan.unplanned, 2)
+        self.assertEqual(len(plan), 6)
+        # Calcular el plan no modifica nada
+        self.assertFalse(high[0].is_assigned_to_route())
+
+    def test_apply_plan_loads_routes(self):
+        self.route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        shipments = [Shipment(f"STD{i:03d}", "A", "B", 1 + i % 3) for i in range(5)]
+        self.receive(*shipments)
+
+        loaded = self.service.apply_plan(self.service.plan_center("MAD01", 4))
+
+        self.assertEqual(loaded, {"MAD01-BCN02-STD-001": ["STD002", "STD001", "STD004", "STD000"]})
+        route = self.route_repo.get_by_route_id("MAD01-BCN02-STD-001")
+        self.assertEqual(route.list_shipments(), ["STD002", "STD001", "STD004", "STD000"])
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("STD000").assigned_route, "MAD01-BCN02-STD-001")
+        self.assertEqual([s.tracking_code for s in self.center.dispatch_queue.take_next(5)], ["STD003"])
+
+        # La capacidad cuenta los envíos ya cargados
+        self.assertEqual(len(self.service.plan_center("MAD01", 4)), 0)
+
+    def test_stale_plan_is_rejected_without_changes(self):
+        self.route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.route_service.create_route("MAD01-BCN02-STD-002", "MAD01", "BCN02")
+        self.receive(Shipment("STD001", "A", "B", 3), Shipment("STD002", "A", "B", 1))
+        plan = self.service.plan_center("MAD01", 1)
+
+        # Entretanto, otro operador carga uno de los envíos del plan
+        self.route_repo.get_by_route_id("MAD01-BCN02-STD-002").load_waiting_shipment(
+            self.shipment_repo.get_by_tracking_code("STD002"))
+        with self.assertRaises(ValueError):
+            self.service.apply_plan(plan)
+        self.assertFalse(self.shipment_repo.get_by_tracking_code("STD001").is_assigned_to_route())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.service.plan_center(" ", 5)
+        with self.assertRaises(ValueError):
+            self.service.plan_center("MAD01", 0)
+        with self.assertRaises(ValueError):
+            self.service.plan_center("MAD01", 5, capacities={"MAD01-BCN02-STD-001": -1})
+        with self.assertRaises(EntityNotFoundError):
+            self.service.plan_center("SEV03", 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# tests/test_memory_repositories.py
+
+import unittest
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.domain.shipment import Shipment
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+from logistica.infrastructure.errores import EntityNotFoundError
+
+
+class TestShipmentRepositoryMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryMemory()
+
+    def test_get_many_preserves_order_and_reports_missing(self):
+        self.repo.add_many([Shipment("ABC123", "A", "B"), Shipment("DEF456", "A", "B")])
+        self.assertEqual([s.tracking_code for s in self.repo.get_many(["def456", "ABC123"])], ["DEF456", "ABC123"])
+        with self.assertRaises(EntityNotFoundError) as cm:
+            self.repo.get_many(["NOE001", "ABC123", "NOE002"])
+        self.assertIn("NOE001, NOE002", str(cm.exception))
+        self.assertEqual(len(self.repo.get_many(["NOE001", "ABC123"], ignore_missing=True)), 1)
+
+
+
+class TestRouteRepositoryMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = RouteRepositoryMemory()
+        self.mad = Center("MAD01", "Madrid", "Calle A")
+        self.bcn = Center("BCN02", "Barcelona", "Calle B")
+
+    def test_list_by_origin(self):
+        self.repo.add(Route("MAD01-BCN02-STD-001", self.mad, self.bcn))
+        self.repo.add(Route("BCN02-MAD01-STD-001", self.bcn, self.mad))
+        self.repo.add(Route("MAD01-BCN02-STD-002", self.mad, self.bcn))
+        self.assertEqual([route.route_id for route in self.repo.list_by_origin(" mad01 ")],
+                         ["MAD01-BCN02-STD-001", "MAD01-BCN02-STD-002"])
+
+        self.repo.remove("MAD01-BCN02-STD-001")
+        self.repo.remove("BCN02-MAD01-STD-001")
+        self.assertEqual([route.route_id for route in self.repo.list_by_origin("MAD01")], ["MAD01-BCN02-STD-002"])
+        self.assertEqual(self.repo.list_by_origin("BCN02"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# tests/test_migrations.py
+
+import unittest
+import os
+import sqlite3
+from logistica.infrastructure.migrations import migrate, current_version, LATEST_VERSION
+from logistica.crear_bd import crear_bd
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = "test_migraciones.db"
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+        self.conn = sqlite3.connect(self.db_path)
+
+    def tearDown(self):
+        self.conn.close()
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+    def _indexes(self):
+        rows = self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+        return {row[0] for row in rows}
+
+    def test_migrate_fresh_database(self):
+        applied = migrate(self.conn)
+        self.assertEqual(applied, list(range(1, LATEST_VERSION + 1)))
+        self.assertEqual(current_version(self.conn), LATEST_VERSION)
+        self.assertIn("idx_shipments_route_code", self._indexes())
+        self.assertIn("idx_shipments_center_code", self._indexes())
+        self.assertIn("idx_status_history_tracking", self._indexes())
+
+    def test_migrate_is_idempotent(self):
+        migrate(self.conn)
+        self.assertEqual(migrate(self.conn), [])
+        self.assertEqual(current_version(self.conn), LATEST_VERSION)
+
+    def test_migrate_to_target_version(self):
+        self.assertEqual(migrate(self.conn, target_version=1), [1])
+        self.assertEqual(self._indexes(), set())
+        self.assertEqual(migrate(self.conn), list(range(2, LATEST_VERSION + 1)))
+
+    def test_upgrade_legacy_database_keeps_data(self):
+        # Base de datos creada por el antiguo crear_bd.py: tablas sin índices y user_version = 0
+        with self.conn:
+            self.conn.execute("CREATE TABLE centers (center_id TEXT PRIMARY KEY, name TEXT NOT NULL, location TEXT NOT NULL)")
+            self.conn.execute("CREATE TABLE routes (route_id TEXT PRIMARY KEY, origin_center_id TEXT NOT NULL, destination_center_id TEXT NOT NULL, active INTEGER NOT NULL)")
+            self.conn.execute("CREATE TABLE shipments (tracking_code TEXT PRIMARY KEY, sender TEXT NOT NULL, recipient TEXT NOT NULL, priority INTEGER NOT NULL, current_status TEXT NOT NULL, shipment_type TEXT NOT NULL, assigned_route_id TEXT, current_center_id TEXT)")
+            self.conn.execute("CREATE TABLE shipment_status_history (id INTEGER PRIMARY KEY AUTOINCREMENT, tracking_code TEXT NOT NULL, status TEXT NOT NULL)")
+            self.conn.execute("INSERT INTO centers VALUES ('MAD01', 'Madrid', 'Calle 1')")
+
+        migrate(self.conn)
+        self.assertEqual(current_version(self.conn), LATEST_VERSION)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM centers").fetchone()[0], 1)
+
+    def test_counts_backfilled_from_existing_shipments(self):
+        migrate(self.conn, target_version=4)
+        with self.conn:
+            self.conn.execute("INSERT INTO shipments VALUES ('ABC001', 'S', 'R', 1, 'REGISTERED', 'STANDARD', NULL, NULL)")
+            self.conn.execute("INSERT INTO shipments VALUES ('ABC002', 'S', 'R', 1, 'REGISTERED', 'STANDARD', NULL, NULL)")
+        migrate(self.conn)
+        self.assertEqual(self.conn.execute("SELECT * FROM shipment_counts").fetchall(),
+                         [("REGISTERED", "STANDARD", 1, "", "", 2)])
+
+        with self.conn:
+            self.conn.execute("UPDATE shipments SET current_status = 'IN_TRANSIT' WHERE tracking_code = 'ABC001'")
+            self.conn.execute("DELETE FROM shipments WHERE tracking_code = 'ABC002'")
+        self.assertEqual(self.conn.execute("SELECT * FROM shipment_counts").fetchall(),
+                         [("IN_TRANSIT", "STANDARD", 1, "", "", 1)])
+
+    def test_lookups_use_indexes(self):
+        migrate(self.conn)
+        plan = " ".join(str(row) for row in self.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT tracking_code FROM shipments WHERE current_center_id = ?", ("MAD01",)))
+        self.assertIn("idx_shipments_center_code", plan)
+
+    def test_crear_bd_seeds_only_once(self):
+        self.conn.close()
+        crear_bd(self.db_path)
+        crear_bd(self.db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM centers").fetchone()[0], 3)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM shipments").fetchone()[0], 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,11 @@ class TestRoute(unittest.TestCase):
         self.assertTrue(self.route.is_active)
         self.assertEqual(self.route.list_shipments(), [])
 
+    def test_shipment_type_from_lane(self):
+        self.assertEqual(self.route.shipment_type, "STANDARD")
+        self.assertEqual(Route("MAD01-BCN02-FRG-001", self.origin, self.dest).shipment_type, "FRAGILE")
+        self.assertEqual(Route("MAD01-BCN02-EXP-001", self.origin, self.dest).shipment_type, "EXPRESS")
+
     def test_create_route_invalid_id_pattern(self):
         with self.assertRaises(ValueError):
             Route("BAD-ID", self.origin, self.dest)
@@ -85,5 +90,35 @@ class TestRoute(unittest.TestCase):
         lista.append(self.shipment.tracking_code)  # modificar copia (aunque sea el mismo objeto)
         self.assertEqual(len(self.route.list_shipments()), 1)
 
+    def test_add_duplicate_shipment_raises(self):
+        self.route.add_shipment(self.shipment)
+        with self.assertRaises(ValueError):
+            self.route.add_shipment(self.shipment)
+        self.assertEqual(self.route.list_shipments(), ["ABC123"])
+
+    def test_remove_shipment_not_in_route_raises(self):
+        with self.assertRaises(ValueError):
+            self.route.remove_shipment(self.shipment)
+
+    def test_shipments_view_is_live_and_ordered(self):
+        view = self.route.shipments_view()
+        other = Shipment("XYZ789", "C", "D", 1)
+        self.route.add_shipment(other)
+        self.route.add_shipment(self.shipment)
+        self.assertEqual(list(view), ["XYZ789", "ABC123"])
+        self.assertEqual(len(view), 2)
+        self.assertIn("ABC123", view)
+        self.assertTrue(self.route.has_shipment("XYZ789"))
+
+        self.route.remove_shipment(other)
+        self.assertEqual(list(view), ["ABC123"])
+        self.assertFalse(hasattr(view, "append"))
+
+    def test_from_record_restores_route(self):
+        route = Route.from_record("MAD01-BCN02-STD-001", self.origin, self.dest, 0, ["ABC123", "XYZ789"])
+        self.assertFalse(route.is_active)
+        self.assertEqual(route.list_shipments(), ["ABC123", "XYZ789"])
+        self.assertIs(route.origin_center, self.origin)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+# tests/test_route_network.py
+
+import random
+import unittest
+from logistica.domain.route_network import RouteNetwork
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+
+class TestRouteNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.centers = {cid: Center(cid, cid, "Calle") for cid in ("MAD01", "BCN02", "VAL03", "SEV04", "BIL05",
+                                                            "ZAR06", "MAL07", "COR08", "GIR09", "LEO10")}
+        self.network = RouteNetwork()
+
+    def route(self, origin, destination, number=1, lane="STD"):
+        return Route(f"{origin}-{destination}-{lane}-{number:03d}", self.centers[origin], self.centers[destination])
+
+    def test_multi_hop_path_with_fewest_routes(self):
+        self.network.add_route(self.route("MAD01", "BCN02"))
+        self.network.add_route(self.route("BCN02", "VAL03"))
+        self.network.add_route(self.route("VAL03", "SEV04"))
+        self.network.add_route(self.route("MAD01", "VAL03"))
+
+        self.assertEqual(self.network.shortest_path("MAD01", "SEV04"),
+                         (["MAD01-VAL03-STD-001", "VAL03-SEV04-STD-001"], 2))
+        self.assertEqual(self.network.shortest_path("MAD01", "MAD01"), ([], 0))
+        # Las rutas son dirigidas
+        self.assertIsNone(self.network.shortest_path("SEV04", "MAD01"))
+        self.assertIsNone(self.network.shortest_path("MAD01", "BIL05"))
+
+    def test_cheapest_path_with_custom_weight(self):
+        costs = {"EXP": 10, "STD": 3}
+        network = RouteNetwork(weight=lambda route: costs[route.route_id.split("-")[2]])
+        network.add_route(self.route("MAD01", "SEV04", lane="EXP"))
+        network.add_route(self.route("MAD01", "BCN02"))
+        network.add_route(self.route("BCN02", "SEV04"))
+        self.assertEqual(network.shortest_path("MAD01", "SEV04"), (["MAD01-BCN02-STD-001", "BCN02-SEV04-STD-001"], 6))
+
+    def test_duplicate_and_unknown_routes_raise(self):
+        route = self.route("MAD01", "BCN02")
+        self.network.add_route(route)
+        with self.assertRaises(ValueError):
+            self.network.add_route(route)
+        with self.assertRaises(ValueError):
+            self.network.remove_route("MAD01-VAL03-STD-001")
+
+    def test_cached_trees_follow_added_and_removed_routes(self):
+        self.network.add_route(self.route("MAD01", "BCN02"))
+        self.network.add_route(self.route("BCN02", "VAL03"))
+        self.assertEqual(self.network.shortest_path("MAD01", "VAL03")[1], 2)
+        self.assertIsNone(self.network.shortest_path("MAD01", "SEV04"))
+
+        # Una ruta nueva mejora el árbol memorizado sin recalcularlo entero
+        self.network.add_route(self.route("MAD01", "VAL03"))
+        self.network.add_route(self.route("VAL03", "SEV04"))
+        self.assertEqual(self.network.shortest_path("MAD01", "SEV04")[0], ["MAD01-VAL03-STD-001", "VAL03-SEV04-STD-001"])
+
+        # Al retirar una ruta usada se vuelve al camino alternativo
+        self.network.remove_route("MAD01-VAL03-STD-001")
+        self.assertEqual(self.network.shortest_path("MAD01", "SEV04")[1], 3)
+        self.network.remove_route("BCN02-VAL03-STD-001")
+        self.assertIsNone(self.network.shortest_path("MAD01", "SEV04"))
+
+    def test_incremental_updates_match_a_fresh_network(self):
+        rng = random.Random(7)
+        ids = list(self.centers)
+        weights = {}
+        network = RouteNetwork(weight=lambda route: weights[route.route_id])
+        active = []
+        for step in range(400):
+            if active and rng.random() < 0.3:
+                route = active.pop(rng.randrange(len(active)))
+                network.remove_route(route.route_id)
+            else:
+                origin, destination = rng.sample(ids, 2)
+                route = self.route(origin, destination, step)
+                weights[route.route_id] = rng.randint(1, 9)
+                network.add_route(route)
+                active.append(route)
+
+            fresh = RouteNetwork(weight=lambda route: weights[route.route_id])
+            for route in active:
+                fresh.add_route(route)
+            origin, destination = rng.sample(ids, 2)
+            expected = fresh.shortest_path(origin, destination)
+            result = network.shortest_path(origin, destination)
+            self.assertEqual(None if result is None else result[1], None if expected is None else expected[1])
+            if result is not None:
+                self.assertTrue(all(network.has_route(route_id) for route_id in result[0]))
+                self.assertEqual(sum(weights[route_id] for route_id in result[0]), result[1])
+
+    def test_cache_is_bounded(self):
+        network = RouteNetwork(max_cached_origins=2)
+        network.add_route(self.route("MAD01", "BCN02"))
+        for cid in self.centers:
+            network.shortest_path(cid, "BCN02")
+        self.assertEqual(len(network._trees), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ from logistica.application.shipment_service import ShipmentService
 from logistica.infrastructure.memory_route import RouteRepositoryMemory
 from logistica.infrastructure.memory_center import CenterRepositoryMemory
 from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_unit_of_work import UnitOfWorkMemory
 from logistica.domain.shipment import Shipment
 from logistica.infrastructure.errores import EntityAlreadyExistsError, EntityNotFoundError
 
@@ -138,6 +139,55 @@ class TestRouteService(unittest.TestCase):
             self.service.assign_shipment_to_route("ABC123", route_id)
         self.assertIn("ya está asignado", str(cm.exception))
 
+    # Test assign_shipments_to_route
+    def test_assign_shipments_reports_each_code(self):
+        unit_of_work = UnitOfWorkMemory()
+        service = RouteService(self.route_repo, self.shipment_repo, self.center_repo, unit_of_work)
+        route_id = "MAD01-BCN02-STD-001"
+        service.create_route(route_id, "MAD01", "BCN02")
+        for code in ("ABC123", "DEF456", "GHI789"):
+            self.shipment_service.register_shipment(code, "A", "B")
+        service.assign_shipment_to_route("GHI789", route_id)
+
+        report = service.assign_shipments_to_route(route_id, ["ABC123", "NOE999", " ", "DEF456", "ABC123", "GHI789"])
+
+        self.assertEqual([code for code, _error in report], ["ABC123", "NOE999", "", "DEF456", "ABC123", "GHI789"])
+        errors = dict(enumerate(error for _code, error in report))
+        self.assertIsNone(errors[0])
+        self.assertIsNotNone(errors[1])
+        self.assertIn("vacío", errors[2])
+        self.assertIsNone(errors[3])
+        self.assertIn("ya está asignado", errors[4])
+        self.assertIn("ya está asignado", errors[5])
+
+        self.assertEqual(service.list_shipments_in_route(route_id), ["GHI789", "ABC123", "DEF456"])
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("DEF456").assigned_route, route_id)
+        self.assertTrue(self.center_repo.get_by_center_id("MAD01").has_shipment("DEF456"))
+        # Una unidad de trabajo para la asignación individual y otra para todo el bloque
+        self.assertEqual(unit_of_work.commits, 2)
+
+    def test_assign_shipments_skips_shipment_already_in_center(self):
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        self.center_service.receive_shipment("ABC123", "MAD01")
+
+        report = self.service.assign_shipments_to_route(route_id, ["ABC123"])
+
+        self.assertIn("ya se encuentra en el centro", report[0][1])
+        self.assertEqual(self.service.list_shipments_in_route(route_id), [])
+        self.assertIsNone(self.shipment_repo.get_by_tracking_code("ABC123").assigned_route)
+
+    def test_assign_shipments_route_inactive_raises(self):
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        self.service.complete_route(route_id)
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        with self.assertRaises(ValueError):
+            self.service.assign_shipments_to_route(route_id, ["ABC123"])
+        with self.assertRaises(EntityNotFoundError):
+            self.service.assign_shipments_to_route("MAD01-BCN02-STD-999", ["ABC123"])
+
     # Test remove_shipment_from_route
     def test_remove_shipment_valid(self):
         route_id = "MAD01-BCN02-STD-001"
@@ -153,6 +203,8 @@ class TestRouteService(unittest.TestCase):
         # El envío sigue en el centro de origen
         center = self.center_service.get_center("MAD01")
         self.assertTrue(center.has_shipment("ABC123"))
+        # La ruta avisa al centro: el envío vuelve a esperar en la cola de despacho
+        self.assertIn("ABC123", center.dispatch_queue)
 
     def test_remove_shipment_not_in_route_raises(self):
         route_id1 = "MAD01-BCN02-STD-001"
@@ -184,6 +236,18 @@ class TestRouteService(unittest.TestCase):
         center = self.center_service.get_center("MAD01")
         self.assertFalse(center.has_shipment("ABC123"))
 
+    def test_dispatch_route_with_unit_of_work(self):
+        unit_of_work = UnitOfWorkMemory()
+        service = RouteService(self.route_repo, self.shipment_repo, self.center_repo, unit_of_work)
+        route_id = "MAD01-BCN02-STD-001"
+        service.create_route(route_id, "MAD01", "BCN02")
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        service.assign_shipment_to_route("ABC123", route_id)
+        service.dispatch_route(route_id)
+        # Una unidad de trabajo por caso de uso que escribe en varios repositorios
+        self.assertEqual(unit_of_work.commits, 2)
+        self.assertEqual(self.shipment_service.get_shipment("ABC123").current_status, "IN_TRANSIT")
+
     def test_dispatch_route_already_dispatched_raises(self):
         route_id = "MAD01-BCN02-STD-001"
         self.service.create_route(route_id, "MAD01", "BCN02")
@@ -217,6 +281,61 @@ class TestRouteService(unittest.TestCase):
         with self.assertRaises(EntityNotFoundError):
             self.service.dispatch_route("MAD01-BCN02-STD-999")
 
+    # Test dispatch_wave
+    def test_dispatch_wave_from_center(self):
+        unit_of_work = UnitOfWorkMemory()
+        service = RouteService(self.route_repo, self.shipment_repo, self.center_repo, unit_of_work)
+        self.center_service.register_center("VAL03", "Valencia", "Calle C")
+        for route_id, destination in (("MAD01-BCN02-STD-001", "BCN02"), ("MAD01-VAL03-STD-001", "VAL03"),
+                                      ("MAD01-BCN02-STD-002", "BCN02")):
+            service.create_route(route_id, "MAD01", destination)
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        self.shipment_service.register_shipment("DEF456", "A", "B")
+        self.shipment_service.register_shipment("GHI789", "A", "B")
+        service.assign_shipments_to_route("MAD01-BCN02-STD-001", ["ABC123", "DEF456"])
+        service.assign_shipments_to_route("MAD01-VAL03-STD-001", ["GHI789"])
+        commits = unit_of_work.commits
+
+        report = service.dispatch_wave(center_id="MAD01")
+
+        self.assertEqual(dict(report)["MAD01-BCN02-STD-001"], None)
+        self.assertEqual(dict(report)["MAD01-VAL03-STD-001"], None)
+        self.assertIn("no tiene envíos", dict(report)["MAD01-BCN02-STD-002"])
+        for code in ("ABC123", "DEF456", "GHI789"):
+            self.assertEqual(self.shipment_repo.get_by_tracking_code(code).current_status, "IN_TRANSIT")
+        self.assertEqual(self.center_repo.get_by_center_id("MAD01").shipment_count, 0)
+        # Toda la oleada en una única unidad de trabajo
+        self.assertEqual(unit_of_work.commits - commits, 1)
+
+        # Una segunda oleada no vuelve a despachar las rutas
+        report = service.dispatch_wave(route_ids=["MAD01-BCN02-STD-001"])
+        self.assertIn("ya ha sido despachada", report[0][1])
+
+    def test_dispatch_wave_by_route_ids_skips_ineligible_routes(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.service.create_route("BCN02-MAD01-STD-001", "BCN02", "MAD01")
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        self.shipment_service.register_shipment("DEF456", "A", "B")
+        self.service.assign_shipment_to_route("ABC123", "MAD01-BCN02-STD-001")
+        self.service.assign_shipment_to_route("DEF456", "BCN02-MAD01-STD-001")
+        self.service.dispatch_route("BCN02-MAD01-STD-001")
+
+        report = self.service.dispatch_wave(route_ids=["BCN02-MAD01-STD-001", "MAD01-BCN02-STD-001"])
+
+        self.assertEqual([route_id for route_id, _error in report], ["BCN02-MAD01-STD-001", "MAD01-BCN02-STD-001"])
+        # La ruta ya despachada no detiene la oleada
+        self.assertIn("ya ha sido despachada", report[0][1])
+        self.assertIsNone(report[1][1])
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC123").current_status, "IN_TRANSIT")
+
+    def test_dispatch_wave_requires_center_or_routes(self):
+        with self.assertRaises(ValueError):
+            self.service.dispatch_wave()
+        with self.assertRaises(ValueError):
+            self.service.dispatch_wave(center_id="MAD01", route_ids=[])
+        with self.assertRaises(EntityNotFoundError):
+            self.service.dispatch_wave(route_ids=["MAD01-BCN02-STD-999"])
+
     # Test complete_route
     def test_complete_route_valid(self):
         route_id = "MAD01-BCN02-STD-001"
@@ -234,6 +353,24 @@ class TestRouteService(unittest.TestCase):
         dest_center = self.center_service.get_center("BCN02")
         self.assertTrue(dest_center.has_shipment("ABC123"))
 
+    def test_dispatch_and_complete_save_shipments_in_bulk(self):
+        # Cada caso de uso guarda sus envíos con una sola llamada a update_many, nunca uno a uno
+        calls = []
+        self.shipment_repo.update = lambda shipment: calls.append(("update", shipment.tracking_code))
+        update_many = self.shipment_repo.update_many
+        self.shipment_repo.update_many = lambda shipments: (calls.append(("update_many", len(shipments))),
+                                                            update_many(shipments))
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        self.shipment_service.register_shipments([("ABC123", "A", "B", 1, "standard"), ("DEF456", "A", "B", 1, "standard")])
+        self.service.assign_shipments_to_route(route_id, ["ABC123", "DEF456"])
+        del calls[:]
+
+        self.service.dispatch_route(route_id)
+        self.service.complete_route(route_id)
+
+        self.assertEqual(calls, [("update_many", 2), ("update_many", 2)])
+
     def test_complete_route_already_inactive_raises(self):
         route_id = "MAD01-BCN02-STD-001"
         self.service.create_route(route_id, "MAD01", "BCN02")
@@ -255,4 +392,67 @@ class TestRouteService(unittest.TestCase):
 
     def test_complete_route_route_not_found_raises(self):
         with self.assertRaises(EntityNotFoundError):
-            self.service.complete_route("MAD01-BCN02-STD-999")
\ No newline at end of file
+            self.service.complete_route("MAD01-BCN02-STD-999")
+
+    # Test fill_route_from_queue
+    def test_fill_route_from_queue_loads_in_dispatch_order(self):
+        self.shipment_service.register_shipment("STD001", "A", "B", 1)
+        self.shipment_service.register_shipment("STD002", "A", "B", 3)
+        self.shipment_service.register_shipment("FRG001", "A", "B", 2, "fragile")
+        self.shipment_service.register_shipment("EXP001", "A", "B", 3, "express")
+        for code in ("STD001", "STD002", "FRG001", "EXP001"):
+            self.center_service.receive_shipment(code, "MAD01")
+
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        loaded = self.service.fill_route_from_queue(route_id, 3)
+
+        self.assertEqual(loaded, ["EXP001", "STD002", "FRG001"])
+        self.assertEqual(self.service.list_shipments_in_route(route_id), loaded)
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("EXP001").assigned_route, route_id)
+        center = self.center_repo.get_by_center_id("MAD01")
+        self.assertEqual(len(center.dispatch_queue), 1)
+
+        # Al retirar un envío de la ruta vuelve a la cola del centro
+        self.service.remove_shipment_from_route("FRG001", route_id)
+        self.assertEqual(self.service.fill_route_from_queue(route_id, 5, shipment_type="fragile"), ["FRG001"])
+
+        # Despachar la ruta vacía la cola de los envíos cargados
+        self.service.dispatch_route(route_id)
+        self.assertEqual([s.tracking_code for s in center.dispatch_queue.take_next(10)], ["STD001"])
+
+    def test_fill_route_from_queue_inactive_route_keeps_queue(self):
+        self.shipment_service.register_shipment("STD001", "A", "B", 1)
+        self.center_service.receive_shipment("STD001", "MAD01")
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        self.service.complete_route(route_id)
+        with self.assertRaises(ValueError):
+            self.service.fill_route_from_queue(route_id, 1)
+        self.assertIn("STD001", self.center_repo.get_by_center_id("MAD01").dispatch_queue)
+
+    def test_fill_route_from_queue_validates_before_loading(self):
+        self.shipment_service.register_shipment("STD001", "A", "B", 1)
+        self.shipment_service.register_shipment("STD002", "A", "B", 3)
+        for code in ("STD001", "STD002"):
+            self.center_service.receive_shipment(code, "MAD01")
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        # Manifiesto incoherente: STD001 figura en la ruta aunque sigue esperando en el centro
+        self.route_repo.get_by_route_id(route_id)._restore_shipments(["STD001"])
+
+        with self.assertRaises(ValueError):
+            self.service.fill_route_from_queue(route_id, 2)
+        # STD002 salía antes y no se ha cargado: la cola queda intacta
+        self.assertIsNone(self.shipment_repo.get_by_tracking_code("STD002").assigned_route)
+        queue = self.center_repo.get_by_center_id("MAD01").dispatch_queue
+        self.assertEqual([s.tracking_code for s in queue.next_shipments(5)], ["STD002", "STD001"])
+
+    def test_fill_route_from_queue_empty_queue_writes_nothing(self):
+        unit_of_work = UnitOfWorkMemory()
+        service = RouteService(self.route_repo, self.shipment_repo, self.center_repo, unit_of_work)
+        route_id = "MAD01-BCN02-STD-001"
+        service.create_route(route_id, "MAD01", "BCN02")
+        commits = unit_of_work.commits
+        self.assertEqual(service.fill_route_from_queue(route_id, 5), [])
+        self.assertEqual(unit_of_work.commits, commits)
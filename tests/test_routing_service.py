@@ -0,0 +1,62 @@
+# tests/test_routing_service.py
+
+import unittest
+from logistica.application.routing_service import RoutingService
+from logistica.application.route_service import RouteService
+from logistica.application.center_service import CenterService
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+
+class TestRoutingService(unittest.TestCase):
+
+    def setUp(self):
+        self.route_repo = RouteRepositoryMemory()
+        self.center_repo = CenterRepositoryMemory()
+        self.shipment_repo = ShipmentRepositoryMemory()
+        center_service = CenterService(self.center_repo, self.shipment_repo)
+        for cid in ("MAD01", "BCN02", "VAL03"):
+            center_service.register_center(cid, cid, "Calle")
+        self.routing = RoutingService(self.route_repo)
+        self.service = RouteService(self.route_repo, self.shipment_repo, self.center_repo,
+                                    routing_service=self.routing)
+
+    def test_find_path_over_existing_routes(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.service.create_route("BCN02-VAL03-STD-001", "BCN02", "VAL03")
+        self.assertEqual(self.routing.find_path("mad01", "VAL03"), ["MAD01-BCN02-STD-001", "BCN02-VAL03-STD-001"])
+        self.assertEqual(self.routing.path_cost("MAD01", "VAL03"), 2)
+        self.assertIsNone(self.routing.path_cost("VAL03", "MAD01"))
+
+    def test_invalid_queries_raise(self):
+        with self.assertRaises(ValueError):
+            self.routing.find_path(" ", "VAL03")
+        with self.assertRaises(ValueError):
+            self.routing.find_path("MAD01", "MAD01")
+        with self.assertRaises(ValueError):
+            self.routing.find_path("MAD01", "VAL03")
+
+    def test_route_service_keeps_network_up_to_date(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.assertEqual(self.routing.find_path("MAD01", "BCN02"), ["MAD01-BCN02-STD-001"])
+
+        # Rutas creadas después de construir la red
+        self.service.create_route("BCN02-VAL03-STD-001", "BCN02", "VAL03")
+        self.assertEqual(self.routing.path_cost("MAD01", "VAL03"), 2)
+        self.service.create_route("MAD01-VAL03-EXP-001", "MAD01", "VAL03")
+        self.assertEqual(self.routing.find_path("MAD01", "VAL03"), ["MAD01-VAL03-EXP-001"])
+
+        # Una ruta completada deja de formar parte de los caminos
+        self.service.complete_route("MAD01-VAL03-EXP-001")
+        self.assertEqual(self.routing.path_cost("MAD01", "VAL03"), 2)
+        self.service.complete_route("MAD01-BCN02-STD-001")
+        with self.assertRaises(ValueError):
+            self.routing.find_path("MAD01", "VAL03")
+
+    def test_completed_routes_are_ignored_when_building(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.service.complete_route("MAD01-BCN02-STD-001")
+        self.assertIsNone(RoutingService(self.route_repo).path_cost("MAD01", "BCN02"))
+
+if __name__ == '__main__':
+    unittest.main()
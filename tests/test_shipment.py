@@ -1,7 +1,10 @@
 # tests/test_shipment.py
 
+import time
 import unittest
-from logistica.domain.shipment import Shipment
+from logistica.domain.shipment import Shipment, IN_TRANSIT, intern_status
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
 
 class TestShipment(unittest.TestCase):
 
@@ -43,6 +46,67 @@ class TestShipment(unittest.TestCase):
         self.assertEqual(s.current_status, "DELIVERED")
         self.assertEqual(s.get_status_history(), ["REGISTERED", "IN_TRANSIT", "DELIVERED"])
 
+    def test_compact_representation(self):
+        for s in (Shipment("ABC123", "A", "B", 1), FragileShipment("FRG123", "A", "B"), ExpressShipment("EXP123", "A", "B")):
+            self.assertFalse(hasattr(s, "__dict__"))
+        a = Shipment("ABC123", "A", "B", 1)
+        b = Shipment("DEF456", "A", "B", 1)
+        # Historial inmutable con un único int por transición (estado y momento)
+        self.assertIsInstance(a._status_history, tuple)
+        self.assertTrue(all(type(t) is int for t in a._status_history))
+        a.update_status("in_transit")
+        self.assertEqual(len(a._status_history), 2)
+        self.assertIs(a.current_status, IN_TRANSIT)
+        self.assertEqual(b.get_status_history(), ["REGISTERED"])
+
+    def test_registration_history_shared_within_a_millisecond(self):
+        shipments = [Shipment(f"ABC{i:03d}", "A", "B", 1) for i in range(1000)]
+        # Mil registros seguidos caen en pocos milisegundos: la mayoría comparten la tupla inicial
+        self.assertLess(len({id(s._status_history) for s in shipments}), 100)
+        a, b = next((a, b) for a, b in zip(shipments, shipments[1:]) if a._status_history is b._status_history)
+        # Compartir la tupla no mezcla los historiales: cada transición crea una tupla nueva
+        a.update_status("IN_TRANSIT")
+        self.assertEqual(b.get_status_history(), ["REGISTERED"])
+        self.assertEqual(a.get_status_timeline()[0], b.get_status_timeline()[0])
+
+    def test_status_timeline_records_transition_times(self):
+        before = time.time()
+        s = Shipment("ABC123", "A", "B", 1)
+        s.update_status("IN_TRANSIT")
+        timeline = s.get_status_timeline()
+        self.assertEqual([status for status, _ in timeline], ["REGISTERED", "IN_TRANSIT"])
+        for _status, epoch in timeline:
+            self.assertGreaterEqual(epoch, before - 0.001)
+            self.assertLessEqual(epoch, time.time() + 0.001)
+
+    def test_time_in_state_and_time_to_delivery(self):
+        s = Shipment.from_record("ABC123", "A", "B", 1, "DELIVERED", ["REGISTERED", "IN_TRANSIT", "DELIVERED"],
+                                 status_times=[1000.0, 1060.5, 1360.5])
+        self.assertAlmostEqual(s.time_in_state("registered"), 60.5)
+        self.assertAlmostEqual(s.time_in_state("IN_TRANSIT"), 300.0)
+        self.assertAlmostEqual(s.time_in_state("DELIVERED", now=1400.5), 40.0)
+        self.assertAlmostEqual(s.time_to_delivery(), 360.5)
+
+        pending = Shipment.from_record("ABC124", "A", "B", 1, "IN_TRANSIT", ["REGISTERED", "IN_TRANSIT"],
+                                       status_times=[1000.0, 1010.0])
+        self.assertAlmostEqual(pending.time_in_state("IN_TRANSIT", now=1100.0), 90.0)
+        self.assertIsNone(pending.time_in_state("DELIVERED"))
+        self.assertIsNone(pending.time_to_delivery())
+
+    def test_unknown_transition_times(self):
+        # Historiales anteriores a las marcas de tiempo: los tiempos no se pueden calcular
+        s = Shipment.from_record("ABC123", "A", "B", 1, "IN_TRANSIT", ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(s.get_status_timeline(), [("REGISTERED", None), ("IN_TRANSIT", None)])
+        self.assertIsNone(s.time_in_state("REGISTERED"))
+        s.update_status("DELIVERED")
+        self.assertIsNone(s.time_to_delivery())
+        self.assertIsNotNone(s.get_status_timeline()[-1][1])
+
+    def test_intern_status(self):
+        leido = "".join(["IN_", "TRANSIT"])  # cadena distinta con el mismo texto
+        self.assertIs(intern_status(leido), IN_TRANSIT)
+        self.assertEqual(intern_status("OTRO"), "OTRO")
+
     def test_update_status_invalid_transition(self):
         s = Shipment("ABC123", "A", "B", 1)
         with self.assertRaises(ValueError):
@@ -109,5 +173,22 @@ class TestShipment(unittest.TestCase):
         s.update_status("DELIVERED")
         self.assertTrue(s.is_delivered())
 
+    def test_from_record_restores_state_without_revalidating(self):
+        status = "".join(["IN_", "TRANSIT"])
+        s = ExpressShipment.from_record("EXP001", "A", "B", 3, status, ["REGISTERED", status], "MAD16-BCN03-EXP-006")
+        self.assertIsInstance(s, ExpressShipment)
+        self.assertEqual(s.priority, 3)
+        self.assertIs(s.current_status, IN_TRANSIT)
+        self.assertEqual(s.get_status_history(), ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(s.assigned_route, "MAD16-BCN03-EXP-006")
+        # Sigue siendo un envío normal: las transiciones se validan como siempre
+        s.update_status("DELIVERED")
+        self.assertTrue(s.is_delivered())
+
+        # Los datos del almacenamiento no se revalidan (el constructor rechazaría este código)
+        self.assertEqual(Shipment.from_record("legacy", "A", "B", 1, "REGISTERED", ["REGISTERED"]).tracking_code, "legacy")
+        with self.assertRaises(ValueError):
+            Shipment("legacy", "A", "B", 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,129 @@
+# tests/test_shipment_query.py
+
+import unittest
+from logistica.domain.shipment_query import ShipmentQuery, ORDER_BY_PRIORITY
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.center import Center
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.application.shipment_service import ShipmentService
+
+
+def sample_shipments():
+    """Doce envíos STANDARD/FRAGILE con prioridades 1-3, la mitad asignados a una ruta."""
+    shipments = []
+    for i in range(12):
+        if i % 3 == 0:
+            shipment = FragileShipment(f"FRG{i:03d}", "A", "B", 2 + i % 2)
+        else:
+            shipment = Shipment(f"STD{i:03d}", "A", "B", 1 + (i // 2) % 3)
+        if i % 2 == 0:
+            shipment.assign_route("MAD01-BCN02-STD-001")
+        shipments.append(shipment)
+    return shipments
+
+
+def expected(shipments, query):
+    """Resultado de referencia: filtrar con `matches` y ordenar toda la lista."""
+    matching = [s for s in shipments if query.matches(s)]
+    if query.order_by == ORDER_BY_PRIORITY:
+        matching.sort(key=lambda s: (-s.priority, s.tracking_code))
+    else:
+        matching.sort(key=lambda s: s.tracking_code)
+    return [s.tracking_code for s in matching]
+
+
+def all_pages(repo, query):
+    """Recorre todas las páginas de una consulta siguiendo el cursor."""
+    codes = []
+    while True:
+        page = repo.find(query)
+        codes += [s.tracking_code for s in page]
+        if len(page) < query.limit:
+            return codes
+        query = query.next_page(query.cursor_of(page[-1]))
+
+
+class TestShipmentQuery(unittest.TestCase):
+
+    def test_normalizes_filters(self):
+        query = ShipmentQuery(status=" in_transit ", shipment_type="fragile", route_id="", code_prefix="abc")
+        self.assertEqual(query.status, "IN_TRANSIT")
+        self.assertEqual(query.shipment_type, "FRAGILE")
+        self.assertIsNone(query.route_id)
+        self.assertEqual(query.code_prefix, "ABC")
+
+    def test_invalid_queries_raise(self):
+        with self.assertRaises(ValueError):
+            ShipmentQuery(order_by="sender")
+        with self.assertRaises(ValueError):
+            ShipmentQuery(limit=0)
+        with self.assertRaises(ValueError):
+            ShipmentQuery(min_priority=3, max_priority=1)
+        with self.assertRaises(ValueError):
+            ShipmentQuery(order_by=ORDER_BY_PRIORITY, after="ABC123")
+        with self.assertRaises(ValueError):
+            ShipmentQuery(after=(2, "ABC123"))
+
+    def test_cursor_and_next_page(self):
+        shipment = Shipment("ABC123", "A", "B", 2)
+        self.assertEqual(ShipmentQuery().cursor_of(shipment), "ABC123")
+        query = ShipmentQuery(status="registered", order_by=ORDER_BY_PRIORITY, limit=5)
+        following = query.next_page(query.cursor_of(shipment))
+        self.assertEqual(following.after, (2, "ABC123"))
+        self.assertEqual((following.status, following.limit), ("REGISTERED", 5))
+
+
+class TestShipmentRepositoryMemoryFind(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryMemory()
+        self.shipments = sample_shipments()
+        self.repo.add_many(self.shipments)
+
+    def test_filters_match_reference(self):
+        queries = [
+            ShipmentQuery(),
+            ShipmentQuery(shipment_type="fragile"),
+            ShipmentQuery(route_id="MAD01-BCN02-STD-001", min_priority=2),
+            ShipmentQuery(max_priority=1),
+            ShipmentQuery(code_prefix="std"),
+            ShipmentQuery(shipment_type="express"),
+            ShipmentQuery(order_by=ORDER_BY_PRIORITY),
+            ShipmentQuery(order_by=ORDER_BY_PRIORITY, shipment_type="standard", code_prefix="STD00"),
+        ]
+        for query in queries:
+            self.assertEqual([s.tracking_code for s in self.repo.find(query)], expected(self.shipments, query)[:query.limit])
+
+    def test_cursor_pagination_visits_every_shipment_once(self):
+        for query in (ShipmentQuery(limit=5), ShipmentQuery(order_by=ORDER_BY_PRIORITY, limit=5),
+                      ShipmentQuery(min_priority=2, limit=2)):
+            self.assertEqual(all_pages(self.repo, query), expected(self.shipments, query))
+
+    def test_update_moves_shipment_between_indexes(self):
+        shipment = self.repo.get_by_tracking_code("STD001")
+        shipment.update_status("IN_TRANSIT")
+        self.repo.update(shipment)
+        self.assertEqual([s.tracking_code for s in self.repo.find(ShipmentQuery(status="in_transit"))], ["STD001"])
+        self.assertNotIn("STD001", [s.tracking_code for s in self.repo.find(ShipmentQuery(status="registered"))])
+
+        self.repo.remove("STD001")
+        self.assertEqual(self.repo.find(ShipmentQuery(status="in_transit")), [])
+
+    def test_center_filter_follows_inventory(self):
+        center = Center("MAD01", "Madrid", "Calle A")
+        center.receive_shipment(self.repo.get_by_tracking_code("FRG003"))
+        self.assertEqual([s.tracking_code for s in self.repo.find(ShipmentQuery(center_id="mad01"))], ["FRG003"])
+
+    def test_service_returns_rows_and_next_cursor(self):
+        service = ShipmentService(self.repo)
+        rows, cursor = service.find_shipments(ShipmentQuery(shipment_type="fragile", limit=3))
+        self.assertEqual([row[0] for row in rows], ["FRG000", "FRG003", "FRG006"])
+        self.assertEqual(rows[0], ("FRG000", "REGISTERED", 2, "FRAGILE", "MAD01-BCN02-STD-001"))
+        rows, cursor = service.find_shipments(ShipmentQuery(shipment_type="fragile", limit=3, after=cursor))
+        self.assertEqual([row[0] for row in rows], ["FRG009"])
+        self.assertIsNone(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
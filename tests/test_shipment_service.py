@@ -1,6 +1,8 @@
 import unittest
 from logistica.application.shipment_service import ShipmentService
 from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.domain.center import Center
 from logistica.domain.shipment import Shipment
 from logistica.domain.fragile_shipment import FragileShipment
 from logistica.domain.express_shipment import ExpressShipment
@@ -131,6 +133,22 @@ class TestShipmentService(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.service.decrease_shipment_priority("EXP123")
 
+    def test_priority_change_refreshes_center(self):
+        center_repo = CenterRepositoryMemory()
+        service = ShipmentService(self.repo, center_repo)
+        center = Center("MAD01", "Madrid", "Calle A")
+        center_repo.add(center)
+        service.register_shipment("ABC123", "A", "B", priority=1)
+        service.register_shipment("DEF456", "A", "B", priority=2)
+        for code in ("ABC123", "DEF456"):
+            center.receive_shipment(self.repo.get_by_tracking_code(code))
+        self.assertEqual(self.repo.get_by_tracking_code("ABC123").current_center_id, "MAD01")
+
+        service.increase_shipment_priority("ABC123")
+        service.increase_shipment_priority("ABC123")
+        self.assertEqual(center.count_by_priority(), {2: 1, 3: 1})
+        self.assertEqual(center.dispatch_queue.peek().tracking_code, "ABC123")
+
 
     # Test list_shipments
     def test_list_shipments_order(self):
@@ -153,6 +171,29 @@ class TestShipmentService(unittest.TestCase):
         self.assertIsNone(ruta)
 
 
+    # Test register_shipments
+    def test_register_shipments_reports_each_row(self):
+        self.service.register_shipment("ABC123", "A", "B")
+        report = self.service.register_shipments([
+            {"tracking_code": "DEF456", "sender": "A", "recipient": "B", "priority": 2},
+            ("GHI789", "A", "B", 2, "fragile"),
+            {"tracking_code": "ABC123", "sender": "A", "recipient": "B"},
+            {"tracking_code": "12", "sender": "A", "recipient": "B"},
+            ("JKL012", "A", "B", 1, "unknown"),
+            {"tracking_code": "DEF456", "sender": "C", "recipient": "D"},
+        ])
+        self.assertEqual([code for code, _error in report], ["DEF456", "GHI789", "ABC123", "12", "JKL012", "DEF456"])
+        self.assertIsNone(report[0][1])
+        self.assertIsNone(report[1][1])
+        self.assertIn("Ya existe", report[2][1])
+        self.assertIn("código de seguimiento", report[3][1])
+        self.assertIn("Tipo de envío no válido", report[4][1])
+        self.assertIn("Ya existe", report[5][1])
+
+        self.assertEqual(self.repo.get_by_tracking_code("GHI789").shipment_type, "FRAGILE")
+        self.assertEqual(self.repo.get_by_tracking_code("DEF456").sender, "A")
+        self.assertEqual(len(self.repo.list_all()), 3)
+
     # Test get_shipment
     def test_get_shipment_existing(self):
         self.service.register_shipment("ABC123", "A", "B")
@@ -3,6 +3,26 @@
 import unittest
 from logistica.domain.fragile_shipment import FragileShipment
 from logistica.domain.express_shipment import ExpressShipment
+from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_types import SHIPMENT_TYPES, ShipmentTypeRegistry
+from logistica.infrastructure.columnar_shipment import ShipmentRepositoryColumnar
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.infrastructure.migrations import migrate
+
+
+class RefrigeratedShipment(Shipment):
+    """Tipo de envío de prueba que solo existe en este módulo."""
+
+    __slots__ = ()
+
+    @property
+    def shipment_type(self):
+        return "REFRIGERATED"
+
+
+if "REFRIGERATED" not in SHIPMENT_TYPES:
+    SHIPMENT_TYPES.register("REFRIGERATED", RefrigeratedShipment)
 
 class TestFragileShipment(unittest.TestCase):
 
@@ -55,5 +75,55 @@ class TestExpressShipment(unittest.TestCase):
         with self.assertRaises(TypeError):
             ExpressShipment("EXP002", "Samsung", "Lucía", priority=1)
 
+class TestShipmentTypeRegistry(unittest.TestCase):
+
+    def test_lookup_is_case_insensitive(self):
+        self.assertIs(SHIPMENT_TYPES.get("fragile").shipment_class, FragileShipment)
+        self.assertIs(SHIPMENT_TYPES.get("Express").shipment_class, ExpressShipment)
+        self.assertEqual(SHIPMENT_TYPES.hydrator("STANDARD"), Shipment.from_record)
+        with self.assertRaises(ValueError):
+            SHIPMENT_TYPES.get("pallet")
+        with self.assertRaises(ValueError):
+            Shipment.create("ABC123", "A", "B", 1, "pallet")
+
+    def test_register_duplicate_raises(self):
+        registry = ShipmentTypeRegistry()
+        registry.register("standard", Shipment)
+        with self.assertRaises(ValueError):
+            registry.register("STANDARD", Shipment)
+        self.assertEqual(registry.codes(), ("STANDARD",))
+
+    def test_express_factory_ignores_priority(self):
+        self.assertEqual(Shipment.create("EXP123", "A", "B", 1, "express").priority, 3)
+
+    def test_create_many_reports_each_spec(self):
+        results = SHIPMENT_TYPES.create_many([
+            ("ABC123", "A", "B", 2, "fragile"),
+            {"tracking_code": "ABC124", "sender": "A", "recipient": "B", "shipment_type": "refrigerated"},
+            ("ABC125", "A", "B", 1, "fragile"),
+            ("ABC126", "A", "B", 1, "pallet"),
+        ])
+        self.assertIsInstance(results[0][1], FragileShipment)
+        self.assertIsInstance(results[1][1], RefrigeratedShipment)
+        self.assertEqual([(code, error is None) for code, _shipment, error in results],
+                         [("ABC123", True), ("ABC124", True), ("ABC125", False), ("ABC126", False)])
+
+    def test_new_type_needs_no_repository_changes(self):
+        shipment = Shipment.create("ABC123", "A", "B", 2, "refrigerated")
+
+        columnar = ShipmentRepositoryColumnar()
+        columnar.add(shipment)
+        self.assertIsInstance(columnar.get_by_tracking_code("ABC123"), RefrigeratedShipment)
+        self.assertEqual(columnar.count_by_type(), {"REFRIGERATED": 1})
+
+        connections = SQLiteConnectionManager(":memory:")
+        try:
+            migrate(connections.connection())
+            sqlite_repo = ShipmentRepositorySQLite(":memory:", connections)
+            sqlite_repo.add(shipment)
+            self.assertIsInstance(sqlite_repo.get_by_tracking_code("ABC123"), RefrigeratedShipment)
+        finally:
+            connections.close()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+# tests/test_sqlite_connection.py
+
+import unittest
+import os
+import sqlite3
+import threading
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.infrastructure.migrations import migrate
+from logistica.domain.shipment import Shipment
+
+
+class ConnectionPerCall(SQLiteConnectionManager):
+    """Gestor que abre una conexión nueva en cada llamada, como el de bench_conexiones."""
+
+    def connection(self):
+        return self._open()
+
+class TestSQLiteConnectionManager(unittest.TestCase):
+
+    def setUp(self):
+        self.db_path = "test_conexiones.db"
+        self.manager = SQLiteConnectionManager(self.db_path)
+
+    def tearDown(self):
+        self.manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
+
+    def test_connection_reused_in_same_thread(self):
+        conn1 = self.manager.connection()
+        conn2 = self.manager.connection()
+        self.assertIs(conn1, conn2)
+        self.assertEqual(self.manager.connections_opened, 1)
+
+    def test_pragmas_applied(self):
+        conn = self.manager.connection()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+        # NORMAL = 1
+        self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -16000)
+
+    def test_one_connection_per_thread(self):
+        main_conn = self.manager.connection()
+        other = []
+        thread = threading.Thread(target=lambda: other.append(self.manager.connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(main_conn, other[0])
+        self.assertEqual(self.manager.connections_opened, 2)
+
+    def test_finished_threads_release_their_connection(self):
+        self.manager.connection()
+
+        def request():
+            self.manager.connection().execute("SELECT 1")
+
+        for _ in range(50):
+            thread = threading.Thread(target=request)
+            thread.start()
+            thread.join()
+        self.assertEqual(self.manager.connections_opened, 51)
+        # Solo queda abierta la del hilo principal
+        self.assertEqual(self.manager.open_connections, 1)
+
+    def test_close_closes_all_connections(self):
+        conn = self.manager.connection()
+        self.manager.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        # El gestor sigue siendo utilizable después de cerrar
+        self.assertIsNot(self.manager.connection(), conn)
+
+    def test_nested_transactions_commit_once(self):
+        conn = self.manager.connection()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        with self.manager.transaction():
+            with self.manager.transaction():
+                conn.execute("INSERT INTO t VALUES (1)")
+            # El bloque interno no confirma: la fila aún no es visible desde otra conexión
+            self.assertTrue(conn.in_transaction)
+            conn.execute("INSERT INTO t VALUES (2)")
+        self.assertEqual(self.manager.commits, 1)
+        self.assertFalse(self.manager.in_transaction())
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 2)
+
+    def test_outer_transaction_rolls_back_inner_writes(self):
+        conn = self.manager.connection()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        with self.assertRaises(ValueError):
+            with self.manager.transaction():
+                with self.manager.transaction():
+                    conn.execute("INSERT INTO t VALUES (1)")
+                raise ValueError("fallo a mitad")
+        self.assertEqual(self.manager.commits, 0)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+
+    def test_repositories_write_on_the_transaction_connection(self):
+        manager = ConnectionPerCall(self.db_path)
+        migrate(manager.connection())
+        repo = ShipmentRepositorySQLite(self.db_path, manager)
+        # Si la escritura usara otra conexión que la que confirma transaction(), la segunda
+        # operación encontraría la base de datos bloqueada por la primera
+        repo.add(Shipment("ABC001", "S", "R", 1))
+        shipment = repo.get_by_tracking_code("ABC001")
+        shipment.update_status("IN_TRANSIT")
+        repo.update(shipment)
+        repo.add_many([Shipment("ABC002", "S", "R", 1)])
+        self.assertEqual(repo.get_by_tracking_code("ABC001").current_status, "IN_TRANSIT")
+        self.assertEqual(len(repo.list_all()), 2)
+        manager.close()
+
+if __name__ == '__main__':
+    unittest.main()
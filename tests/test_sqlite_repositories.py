@@ -1,13 +1,26 @@
 import unittest
 import os
-import sqlite3
 from logistica.infrastructure.sqlite_center import CenterRepositorySQLite
 from logistica.infrastructure.sqlite_route import RouteRepositorySQLite
 from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySQLite
+from logistica.infrastructure.sqlite_connection import SQLiteConnectionManager
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.migrations import migrate
 from logistica.domain.center import Center
 from logistica.domain.route import Route
 from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+from logistica.infrastructure.lazy_center import LazyCenter
+from logistica.infrastructure.sqlite_unit_of_work import UnitOfWorkSQLite
+from logistica.infrastructure.identity_map import IdentityMap
+from logistica.application.route_service import RouteService
+from logistica.application.shipment_service import ShipmentService
 from logistica.infrastructure.errores import EntityAlreadyExistsError, EntityNotFoundError
+from logistica.domain.shipment_query import ShipmentQuery, ORDER_BY_PRIORITY
+from logistica.tests.test_shipment_query import sample_shipments, expected, all_pages
 
 class TestSQLiteRepositories(unittest.TestCase):
     
@@ -17,25 +30,19 @@ class TestSQLiteRepositories(unittest.TestCase):
         if os.path.exists(self.db_path):
             os.remove(self.db_path)
             
-        # Crear esquema
-        conn = sqlite3.connect(self.db_path)
-        with conn:
-            cursor = conn.cursor()
-            cursor.execute("PRAGMA foreign_keys = ON")
-            cursor.execute("CREATE TABLE centers (center_id TEXT PRIMARY KEY, name TEXT NOT NULL, location TEXT NOT NULL)")
-            cursor.execute("CREATE TABLE routes (route_id TEXT PRIMARY KEY, origin_center_id TEXT NOT NULL, destination_center_id TEXT NOT NULL, active INTEGER NOT NULL, FOREIGN KEY (origin_center_id) REFERENCES centers(center_id), FOREIGN KEY (destination_center_id) REFERENCES centers(center_id))")
-            cursor.execute("CREATE TABLE shipments (tracking_code TEXT PRIMARY KEY, sender TEXT NOT NULL, recipient TEXT NOT NULL, priority INTEGER NOT NULL, current_status TEXT NOT NULL, shipment_type TEXT NOT NULL, assigned_route_id TEXT, current_center_id TEXT, FOREIGN KEY (assigned_route_id) REFERENCES routes(route_id), FOREIGN KEY (current_center_id) REFERENCES centers(center_id))")
-            cursor.execute("CREATE TABLE shipment_status_history (id INTEGER PRIMARY KEY AUTOINCREMENT, tracking_code TEXT NOT NULL, status TEXT NOT NULL, FOREIGN KEY (tracking_code) REFERENCES shipments(tracking_code))")
-        conn.close()
-        
-        self.center_repo = CenterRepositorySQLite(self.db_path)
-        self.route_repo = RouteRepositorySQLite(self.db_path)
-        self.shipment_repo = ShipmentRepositorySQLite(self.db_path)
+        # Crear esquema con las migraciones versionadas
+        self.connections = SQLiteConnectionManager(self.db_path)
+        migrate(self.connections.connection())
+        self.center_repo = CenterRepositorySQLite(self.db_path, self.connections)
+        self.route_repo = RouteRepositorySQLite(self.db_path, self.connections)
+        self.shipment_repo = ShipmentRepositorySQLite(self.db_path, self.connections)
 
     def tearDown(self):
-        # Limpieza de db tras test
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
+        # Cerrar las conexiones persistentes antes de borrar los ficheros (db y WAL)
+        self.connections.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_path + suffix):
+                os.remove(self.db_path + suffix)
 
     def test_center_crud(self):
         # Create
@@ -82,5 +89,482 @@ class TestSQLiteRepositories(unittest.TestCase):
         with self.assertRaises(EntityNotFoundError):
             self.shipment_repo.get_by_tracking_code("ABC111")
 
+    def test_repositories_share_one_connection(self):
+        self.center_repo.add(Center("MAD01", "Madrid", "Calle 1"))
+        self.shipment_repo.add(Shipment("ABC111", "Sender", "Recipient", 1))
+        self.center_repo.get_by_center_id("MAD01")
+        self.shipment_repo.list_all()
+        self.assertEqual(self.connections.connections_opened, 1)
+
+    def test_shipment_list_all_bulk_hydration(self):
+        self.shipment_repo.add(Shipment("ABC111", "S", "R", 1))
+        self.shipment_repo.add(FragileShipment("FRG222", "S", "R", 3))
+        self.shipment_repo.add(ExpressShipment("EXP333", "S", "R"))
+        s = self.shipment_repo.get_by_tracking_code("ABC111")
+        s.update_status("IN_TRANSIT")
+        self.shipment_repo.update(s)
+
+        statements = []
+        self.connections.connection().set_trace_callback(statements.append)
+        shipments = {s.tracking_code: s for s in self.shipment_repo.list_all()}
+        self.connections.connection().set_trace_callback(None)
+
+        # Número constante de consultas: envíos + historiales
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(shipments["FRG222"].shipment_type, "FRAGILE")
+        self.assertEqual(shipments["FRG222"].priority, 3)
+        self.assertEqual(shipments["EXP333"].shipment_type, "EXPRESS")
+        self.assertEqual(shipments["ABC111"].get_status_history(), ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(shipments["EXP333"].get_status_history(), ["REGISTERED"])
+
+    def test_center_inventory_bulk_hydration(self):
+        mad = Center("MAD01", "Madrid", "Calle 1")
+        bcn = Center("BCN02", "Barcelona", "Calle 2")
+        self.center_repo.add(mad)
+        self.center_repo.add(bcn)
+        for code, center in (("ABC111", mad), ("ABC222", mad), ("ABC333", bcn)):
+            shipment = Shipment(code, "S", "R", 1)
+            self.shipment_repo.add(shipment)
+            center.receive_shipment(shipment)
+        self.center_repo.update(mad)
+        self.center_repo.update(bcn)
+
+        statements = []
+        self.connections.connection().set_trace_callback(statements.append)
+        centers = {c.center_id: c for c in self.center_repo.list_all()}
+        self.connections.connection().set_trace_callback(None)
+
+        # centros + envíos + historiales, sin importar cuántos centros o envíos haya
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(sorted(s.tracking_code for s in centers["MAD01"].list_shipments()), ["ABC111", "ABC222"])
+        self.assertEqual([s.tracking_code for s in centers["BCN02"].list_shipments()], ["ABC333"])
+        self.assertEqual(centers["MAD01"].count_by_type(), {"STANDARD": 2})
+        self.assertEqual(centers["MAD01"].count_by_priority(), {1: 2})
+
+        mad2 = self.center_repo.get_by_center_id("MAD01")
+        self.assertTrue(mad2.has_shipment("ABC222"))
+        self.assertEqual(mad2.list_shipments()[0].get_status_history(), ["REGISTERED"])
+
+    def _create_route_with_shipment(self):
+        mad = Center("MAD01", "Madrid", "Calle 1")
+        bcn = Center("BCN02", "Barcelona", "Calle 2")
+        self.center_repo.add(mad)
+        self.center_repo.add(bcn)
+        self.route_repo.add(Route("MAD01-BCN02-STD-001", mad, bcn))
+        self.shipment_repo.add(Shipment("ABC111", "S", "R", 1))
+        return RouteService(self.route_repo, self.shipment_repo, self.center_repo)
+
+    def test_route_centers_are_lazy(self):
+        service = self._create_route_with_shipment()
+        service.assign_shipment_to_route("ABC111", "MAD01-BCN02-STD-001")
+
+        route = self.route_repo.get_by_route_id("MAD01-BCN02-STD-001")
+        self.assertIsInstance(route.origin_center, LazyCenter)
+        self.assertEqual(route.origin_center.center_id, "MAD01")
+        self.assertEqual(route.destination_center.name, "Barcelona")
+        self.assertFalse(route.origin_center.is_loaded)
+        self.assertEqual(route.list_shipments(), ["ABC111"])
+
+        # Primer acceso real al inventario: se carga desde la base de datos
+        self.assertTrue(route.origin_center.has_shipment("ABC111"))
+        self.assertTrue(route.origin_center.is_loaded)
+        self.assertFalse(route.destination_center.is_loaded)
+
+    def test_route_list_all_does_not_load_inventories(self):
+        self._create_route_with_shipment()
+        routes = self.route_repo.list_all()
+        self.assertEqual(len(routes), 1)
+        self.assertFalse(routes[0].origin_center.is_loaded)
+        self.assertFalse(routes[0].destination_center.is_loaded)
+
+    def test_route_list_by_origin(self):
+        service = self._create_route_with_shipment()
+        service.assign_shipment_to_route("ABC111", "MAD01-BCN02-STD-001")
+        self.route_repo.add(Route("BCN02-MAD01-STD-001", self.center_repo.get_by_center_id("BCN02"),
+                                  self.center_repo.get_by_center_id("MAD01")))
+
+        routes = self.route_repo.list_by_origin("mad01")
+        self.assertEqual([route.route_id for route in routes], ["MAD01-BCN02-STD-001"])
+        self.assertEqual(routes[0].list_shipments(), ["ABC111"])
+        self.assertEqual([route.route_id for route in self.route_repo.list_by_origin("BCN02")], ["BCN02-MAD01-STD-001"])
+        self.assertEqual(self.route_repo.list_by_origin("VAL03"), [])
+
+    def test_route_lifecycle_with_sqlite(self):
+        service = self._create_route_with_shipment()
+        service.assign_shipment_to_route("ABC111", "MAD01-BCN02-STD-001")
+        service.dispatch_route("MAD01-BCN02-STD-001")
+        self.assertFalse(self.center_repo.get_by_center_id("MAD01").has_shipment("ABC111"))
+        service.complete_route("MAD01-BCN02-STD-001")
+
+        shipment = self.shipment_repo.get_by_tracking_code("ABC111")
+        self.assertEqual(shipment.current_status, "DELIVERED")
+        self.assertTrue(self.center_repo.get_by_center_id("BCN02").has_shipment("ABC111"))
+        self.assertFalse(self.route_repo.get_by_route_id("MAD01-BCN02-STD-001").is_active)
+
+    def test_unit_of_work_commits_once_per_use_case(self):
+        self._create_route_with_shipment()
+        self.shipment_repo.add(Shipment("ABC222", "S", "R", 1))
+        service = RouteService(
+            self.route_repo, self.shipment_repo, self.center_repo, UnitOfWorkSQLite(self.connections)
+        )
+        service.assign_shipment_to_route("ABC111", "MAD01-BCN02-STD-001")
+        service.assign_shipment_to_route("ABC222", "MAD01-BCN02-STD-001")
+
+        commits_before = self.connections.commits
+        service.dispatch_route("MAD01-BCN02-STD-001")
+        self.assertEqual(self.connections.commits - commits_before, 1)
+
+        commits_before = self.connections.commits
+        service.complete_route("MAD01-BCN02-STD-001")
+        self.assertEqual(self.connections.commits - commits_before, 1)
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC222").current_status, "DELIVERED")
+
+    def test_unit_of_work_rolls_back_partial_writes(self):
+        self._create_route_with_shipment()
+        unit_of_work = UnitOfWorkSQLite(self.connections)
+        route = self.route_repo.get_by_route_id("MAD01-BCN02-STD-001")
+        shipment = self.shipment_repo.get_by_tracking_code("ABC111")
+        route.add_shipment(shipment)
+
+        with self.assertRaises(EntityNotFoundError):
+            with unit_of_work:
+                self.route_repo.update(route)
+                self.shipment_repo.update(Shipment("ZZZ999", "S", "R", 1))
+
+        # La escritura de la ruta se deshizo junto con la que falló
+        self.assertEqual(self.route_repo.get_by_route_id("MAD01-BCN02-STD-001").list_shipments(), [])
+
+    def test_shipment_add_many_in_chunks(self):
+        self.shipment_repo.add(Shipment("ABC000", "S", "R", 1))
+        shipments = [Shipment(f"ABC{i:03d}", "S", "R", 1) for i in range(25)]
+        shipments.append(FragileShipment("ABC010", "S", "R", 2))
+
+        commits_before = self.connections.commits
+        rejected = self.shipment_repo.add_many(shipments, chunk_size=10)
+        self.assertEqual(self.connections.commits - commits_before, 3)
+
+        # ABC000 ya existía y ABC010 se repite dentro del lote (en otro bloque)
+        self.assertEqual(sorted(rejected), [0, 25])
+        self.assertIsInstance(rejected[25], EntityAlreadyExistsError)
+        stored = self.shipment_repo.list_all()
+        self.assertEqual(len(stored), 25)
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC010").shipment_type, "STANDARD")
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC024").get_status_history(), ["REGISTERED"])
+
+    def _repositories_with_identity_map(self):
+        identity_map = IdentityMap()
+        return (
+            identity_map,
+            RouteRepositorySQLite(self.db_path, self.connections, identity_map),
+            ShipmentRepositorySQLite(self.db_path, self.connections, identity_map),
+            CenterRepositorySQLite(self.db_path, self.connections, identity_map),
+        )
+
+    def test_identity_map_returns_one_instance_per_row(self):
+        self._create_route_with_shipment()
+        identity_map, route_repo, shipment_repo, center_repo = self._repositories_with_identity_map()
+        service = RouteService(route_repo, shipment_repo, center_repo, UnitOfWorkSQLite(self.connections, identity_map))
+        service.assign_shipment_to_route("ABC111", "MAD01-BCN02-STD-001")
+        identity_map.clear()
+
+        route = route_repo.get_by_route_id("MAD01-BCN02-STD-001")
+        shipment = shipment_repo.get_by_tracking_code("ABC111")
+        # El centro de la ruta y el del repositorio son el mismo objeto, y su inventario
+        # contiene el mismo envío que devuelve el repositorio de envíos
+        self.assertIs(center_repo.get_by_center_id("MAD01"), route.origin_center)
+        self.assertIs(route.origin_center.list_shipments()[0], shipment)
+        self.assertIs(route_repo.get_by_route_id("MAD01-BCN02-STD-001"), route)
+
+        statements = []
+        self.connections.connection().set_trace_callback(statements.append)
+        shipment_repo.get_by_tracking_code("ABC111")
+        center_repo.get_by_center_id("MAD01")
+        self.connections.connection().set_trace_callback(None)
+        self.assertEqual(statements, [])
+
+        # Tras despachar, el estado se ve igual desde el centro y desde el repositorio
+        service.dispatch_route("MAD01-BCN02-STD-001")
+        self.assertEqual(shipment.current_status, "IN_TRANSIT")
+        identity_map.clear()
+        self.assertEqual(shipment_repo.get_by_tracking_code("ABC111").current_status, "IN_TRANSIT")
+
+    def test_priority_change_refreshes_only_loaded_centers(self):
+        self._create_route_with_shipment()
+        center = self.center_repo.get_by_center_id("MAD01")
+        center.receive_shipment(self.shipment_repo.get_by_tracking_code("ABC111"))
+        self.center_repo.update(center)
+        identity_map, _route_repo, shipment_repo, center_repo = self._repositories_with_identity_map()
+        service = ShipmentService(shipment_repo, center_repo)
+
+        # El centro no está cargado: no se lee su inventario para corregir una entrada
+        statements = []
+        self.connections.connection().set_trace_callback(statements.append)
+        service.increase_shipment_priority("ABC111")
+        self.connections.connection().set_trace_callback(None)
+        self.assertFalse([sql for sql in statements if "current_center_id = ?" in sql])
+        self.assertIsNone(center_repo.get_if_loaded("MAD01"))
+
+        # Cargado en la petición: el cambio se le comunica
+        center = center_repo.get_by_center_id("MAD01")
+        self.assertEqual(center.count_by_priority(), {2: 1})
+        service.increase_shipment_priority("ABC111")
+        self.assertIs(center_repo.get_if_loaded("MAD01"), center)
+        self.assertEqual(center.count_by_priority(), {3: 1})
+
+    def test_dispatch_wave_writes_once(self):
+        mad = Center("MAD01", "Madrid", "Calle 1")
+        bcn = Center("BCN02", "Barcelona", "Calle 2")
+        self.center_repo.add(mad)
+        self.center_repo.add(bcn)
+        self.shipment_repo.add_many([Shipment(f"ABC{i:03d}", "S", "R", 1) for i in range(20)])
+        service = RouteService(self.route_repo, self.shipment_repo, self.center_repo, UnitOfWorkSQLite(self.connections))
+        for n in range(4):
+            route_id = f"MAD01-BCN02-STD-{n:03d}"
+            service.create_route(route_id, "MAD01", "BCN02")
+            service.assign_shipments_to_route(route_id, [f"ABC{i:03d}" for i in range(5 * n, 5 * n + 5)])
+
+        commits = self.connections.commits
+        report = service.dispatch_wave(center_id="MAD01")
+
+        self.assertEqual([error for _route_id, error in report], [None] * 4)
+        self.assertEqual(self.connections.commits - commits, 1)
+        self.assertEqual({s.current_status for s in self.shipment_repo.list_all()}, {"IN_TRANSIT"})
+        self.assertEqual(self.center_repo.get_by_center_id("MAD01").list_shipments(), [])
+
+    def test_identity_map_cleared_on_rollback(self):
+        self._create_route_with_shipment()
+        identity_map, route_repo, shipment_repo, _center_repo = self._repositories_with_identity_map()
+        unit_of_work = UnitOfWorkSQLite(self.connections, identity_map)
+        shipment = shipment_repo.get_by_tracking_code("ABC111")
+
+        with self.assertRaises(EntityNotFoundError):
+            with unit_of_work:
+                shipment.increase_priority()
+                shipment_repo.update(shipment)
+                route_repo.get_by_route_id("NOEXISTE")
+
+        # El objeto modificado se descarta: la siguiente lectura refleja la base de datos
+        reloaded = shipment_repo.get_by_tracking_code("ABC111")
+        self.assertIsNot(reloaded, shipment)
+        self.assertEqual(reloaded.priority, 1)
+
+    def test_shipment_history_is_append_only(self):
+        self.shipment_repo.add(Shipment("ABC111", "S", "R", 1))
+        conn = self.connections.connection()
+        first_id = conn.execute("SELECT id FROM shipment_status_history WHERE tracking_code = 'ABC111'").fetchone()[0]
+
+        # Un cambio de prioridad no toca la tabla de historial
+        s = self.shipment_repo.get_by_tracking_code("ABC111")
+        s.increase_priority()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        self.shipment_repo.update(s)
+        conn.set_trace_callback(None)
+        self.assertFalse(any("shipment_status_history" in sql for sql in statements))
+
+        # Una transición solo añade su fila, con marca de tiempo, sin reescribir las anteriores
+        s.update_status("IN_TRANSIT")
+        self.shipment_repo.update(s)
+        rows = conn.execute(
+            "SELECT id, status, changed_at FROM shipment_status_history WHERE tracking_code = 'ABC111' ORDER BY id"
+        ).fetchall()
+        self.assertEqual([r[1] for r in rows], ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(rows[0][0], first_id)
+        self.assertIsNotNone(rows[1][2])
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC111").priority, 2)
+
+    def test_status_timeline_round_trip(self):
+        s = Shipment.from_record("ABC111", "S", "R", 1, "IN_TRANSIT", ["REGISTERED", "IN_TRANSIT"],
+                                 status_times=[1000.0, 1060.0])
+        self.shipment_repo.add(s)
+        s.update_status("DELIVERED")
+        self.shipment_repo.update(s)
+        self.shipment_repo.add_many([Shipment.from_record("ABC222", "S", "R", 1, "REGISTERED", ["REGISTERED"],
+                                                          status_times=[2000.0])])
+
+        # Se guarda el momento de cada transición, no el de la escritura
+        reloaded = self.shipment_repo.get_by_tracking_code("ABC111")
+        self.assertEqual(reloaded.get_status_timeline()[:2], [("REGISTERED", 1000.0), ("IN_TRANSIT", 1060.0)])
+        self.assertEqual(reloaded.get_status_timeline()[2], s.get_status_timeline()[2])
+        self.assertAlmostEqual(reloaded.time_in_state("IN_TRANSIT"), s.get_status_timeline()[2][1] - 1060.0, places=3)
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC222").get_status_timeline(), [("REGISTERED", 2000.0)])
+
+        # Las transiciones registradas antes de la migración 3 no tienen hora
+        conn = self.connections.connection()
+        with conn:
+            conn.execute("UPDATE shipment_status_history SET changed_at = NULL WHERE tracking_code = 'ABC222'")
+        self.assertIsNone(self.shipment_repo.get_by_tracking_code("ABC222").time_in_state("REGISTERED"))
+
+    def test_update_many_in_one_transaction(self):
+        shipments = [Shipment(f"ABC{i:03d}", "S", "R", 1) for i in range(600)]
+        self.shipment_repo.add_many(shipments)
+        for shipment in shipments:
+            shipment.update_status("IN_TRANSIT")
+            shipment.increase_priority()
+        self.shipment_repo.update_many(shipments)
+
+        reloaded = self.shipment_repo.get_by_tracking_code("ABC599")
+        self.assertEqual(reloaded.get_status_history(), ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(reloaded.priority, 2)
+
+        # Si falta un envío no se guarda ninguno
+        shipments[0].update_status("DELIVERED")
+        with self.assertRaises(EntityNotFoundError):
+            self.shipment_repo.update_many([shipments[0], Shipment("ZZZ999", "S", "R", 1)])
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC000").current_status, "IN_TRANSIT")
+
+    def test_get_many_preserves_order_and_reports_missing(self):
+        shipments = [Shipment(f"ABC{i:03d}", "S", "R", 1) for i in range(600)]
+        shipments.append(FragileShipment("FRG001", "S", "R", 2))
+        self.shipment_repo.add_many(shipments)
+        shipments[5].update_status("IN_TRANSIT")
+        self.shipment_repo.update(shipments[5])
+
+        # Más códigos que un bloque de la consulta IN, en orden inverso y con un repetido
+        codes = ["FRG001"] + [f"ABC{i:03d}" for i in reversed(range(600))] + ["ABC005"]
+        loaded = self.shipment_repo.get_many(codes)
+        self.assertEqual([s.tracking_code for s in loaded], codes)
+        self.assertIsInstance(loaded[0], FragileShipment)
+        self.assertEqual(loaded[-1].get_status_history(), ["REGISTERED", "IN_TRANSIT"])
+
+        with self.assertRaises(EntityNotFoundError) as cm:
+            self.shipment_repo.get_many(["ABC001", "ZZZ998", "ZZZ999"])
+        self.assertIn("ZZZ998, ZZZ999", str(cm.exception))
+        self.assertEqual([s.tracking_code for s in self.shipment_repo.get_many(["ZZZ998", "ABC001"], ignore_missing=True)],
+                         ["ABC001"])
+
+    def test_assign_shipments_with_mixed_case_codes(self):
+        # Mismo resultado en memoria y en SQLite: cada código se normaliza una sola vez
+        memory = (RouteRepositoryMemory(), ShipmentRepositoryMemory(), CenterRepositoryMemory())
+        for route_repo, shipment_repo, center_repo in (memory, (self.route_repo, self.shipment_repo, self.center_repo)):
+            with self.subTest(repository=type(shipment_repo).__name__):
+                mad = Center("MAD01", "Madrid", "Calle 1")
+                bcn = Center("BCN02", "Barcelona", "Calle 2")
+                shipment_repo.add_many([Shipment(code, "S", "R", 1) for code in ("ABC111", "ABC222", "ABC333")])
+                mad.receive_shipment(shipment_repo.get_by_tracking_code("ABC333"))
+                center_repo.add(mad)
+                center_repo.add(bcn)
+                center_repo.update(mad)
+                route_repo.add(Route("MAD01-BCN02-STD-001", mad, bcn))
+
+                report = RouteService(route_repo, shipment_repo, center_repo).assign_shipments_to_route(
+                    "MAD01-BCN02-STD-001", [" abc111", "Abc222", "aBc111", "abc333"])
+
+                self.assertEqual(report[:2], [("ABC111", None), ("ABC222", None)])
+                self.assertIn("ya está asignado", report[2][1])
+                self.assertIn("ya se encuentra en el centro", report[3][1])
+                self.assertEqual(route_repo.get_by_route_id("MAD01-BCN02-STD-001").list_shipments(), ["ABC111", "ABC222"])
+                self.assertTrue(center_repo.get_by_center_id("MAD01").has_shipment("ABC222"))
+                self.assertEqual([s.tracking_code for s in shipment_repo.get_many(["abc222", " Abc111 "])],
+                                 ["ABC222", "ABC111"])
+                self.assertEqual(shipment_repo.get_by_tracking_code(" abc222").tracking_code, "ABC222")
+
+    def test_find_filters_sorts_and_paginates_in_sql(self):
+        center = Center("MAD01", "Madrid", "Calle A")
+        bcn = Center("BCN02", "Barcelona", "Calle B")
+        self.center_repo.add(center)
+        self.center_repo.add(bcn)
+        self.route_repo.add(Route("MAD01-BCN02-STD-001", center, bcn))
+        shipments = sample_shipments()
+        self.shipment_repo.add_many(shipments)
+        center.receive_shipment(shipments[3])
+        self.center_repo.update(center)
+
+        for query in (ShipmentQuery(shipment_type="fragile"), ShipmentQuery(code_prefix="std", max_priority=2),
+                      ShipmentQuery(route_id="MAD01-BCN02-STD-001", order_by=ORDER_BY_PRIORITY)):
+            self.assertEqual([s.tracking_code for s in self.shipment_repo.find(query)], expected(shipments, query))
+        for query in (ShipmentQuery(limit=5), ShipmentQuery(order_by=ORDER_BY_PRIORITY, min_priority=2, limit=3)):
+            self.assertEqual(all_pages(self.shipment_repo, query), expected(shipments, query))
+        self.assertEqual([s.tracking_code for s in self.shipment_repo.find(ShipmentQuery(center_id="MAD01"))], ["FRG003"])
+
+        plan = self.connections.connection().execute(
+            "EXPLAIN QUERY PLAN SELECT tracking_code FROM shipments WHERE current_status = ? "
+            "AND tracking_code > ? ORDER BY tracking_code LIMIT 10", ("REGISTERED", "ABC")).fetchall()
+        self.assertIn("idx_shipments_status_code", " ".join(row[-1] for row in plan))
+
+    def test_counts_maintained_by_triggers(self):
+        service = self._create_route_with_shipment()
+        self.shipment_repo.add_many([FragileShipment("FRG001", "S", "R", 3), Shipment("ABC222", "S", "R", 2)])
+        service.assign_shipments_to_route("MAD01-BCN02-STD-001", ["ABC111", "FRG001"])
+        service.dispatch_route("MAD01-BCN02-STD-001")
+        self.shipment_repo.remove("ABC222")
+
+        self.assertEqual(self.shipment_repo.count_by("status", "type"),
+                         {("IN_TRANSIT", "STANDARD"): 1, ("IN_TRANSIT", "FRAGILE"): 1})
+        self.assertEqual(self.shipment_repo.count_by("route"), {"MAD01-BCN02-STD-001": 2})
+        self.assertEqual(self.center_repo.shipment_counts(), {"MAD01": 0, "BCN02": 0})
+
+        # La tabla de recuentos coincide con agrupar la tabla de envíos
+        conn = self.connections.connection()
+        grouped = conn.execute("""
+            SELECT current_status, shipment_type, priority, COALESCE(assigned_route_id, ''),
+                   COALESCE(current_center_id, ''), COUNT(*)
+            FROM shipments GROUP BY 1, 2, 3, 4, 5 ORDER BY 1, 2, 3, 4, 5""").fetchall()
+        self.assertEqual(conn.execute("SELECT * FROM shipment_counts ORDER BY 1, 2, 3, 4, 5").fetchall(), grouped)
+
+    def test_center_shipment_counts_do_not_load_inventories(self):
+        center = Center("MAD01", "Madrid", "Calle 1")
+        self.center_repo.add(center)
+        self.center_repo.add(Center("BCN02", "Barcelona", "Calle 2"))
+        for i in range(3):
+            shipment = Shipment(f"ABC{i:03d}", "S", "R", 1)
+            self.shipment_repo.add(shipment)
+            center.receive_shipment(shipment)
+        self.center_repo.update(center)
+        self.assertEqual(self.center_repo.shipment_counts(), {"MAD01": 3, "BCN02": 0})
+
+    def test_get_many_reuses_identity_map(self):
+        identity_map = IdentityMap()
+        repo = ShipmentRepositorySQLite(self.db_path, self.connections, identity_map)
+        repo.add_many([Shipment("ABC001", "S", "R", 1), Shipment("ABC002", "S", "R", 1)])
+        loaded = repo.get_by_tracking_code("ABC001")
+        self.assertIs(repo.get_many(["ABC002", "ABC001"])[1], loaded)
+        # Las búsquedas individual y en bloque normalizan igual el código: mismo objeto
+        self.assertIs(repo.get_by_tracking_code(" abc002 "), repo.get_many(["Abc002"])[0])
+
+    def test_center_update_writes_only_membership_delta(self):
+        self.center_repo.add(Center("MAD01", "Madrid", "Calle 1"))
+        center = self.center_repo.get_by_center_id("MAD01")
+        for i in range(50):
+            shipment = Shipment(f"ABC{i:03d}", "S", "R", 1)
+            self.shipment_repo.add(shipment)
+            center.receive_shipment(shipment)
+        self.center_repo.update(center)
+
+        center = self.center_repo.get_by_center_id("MAD01")
+        newcomer = Shipment("NEW001", "S", "R", 1)
+        self.shipment_repo.add(newcomer)
+        center.receive_shipment(newcomer)
+        center.dispatch_shipment(center.list_shipments()[0])
+
+        conn = self.connections.connection()
+        changes_before = conn.total_changes
+        self.center_repo.update(center)
+        # Fila del centro + un envío que entra + uno que sale; los triggers de shipment_counts
+        # mueven cada envío de su grupo de recuento al nuevo (una resta y una suma por envío)
+        self.assertEqual(conn.total_changes - changes_before, 3 + 2 * 2)
+
+        stored = self.center_repo.get_by_center_id("MAD01")
+        self.assertEqual(len(stored.list_shipments()), 50)
+        self.assertTrue(stored.has_shipment("NEW001"))
+        self.assertFalse(stored.has_shipment("ABC000"))
+
+    def test_route_update_writes_only_membership_delta(self):
+        service = self._create_route_with_shipment()
+        service.assign_shipment_to_route("ABC111", "MAD01-BCN02-STD-001")
+        self.shipment_repo.add(Shipment("ABC222", "S", "R", 1))
+
+        route = self.route_repo.get_by_route_id("MAD01-BCN02-STD-001")
+        route._restore_shipments(["ABC222"])
+        conn = self.connections.connection()
+        changes_before = conn.total_changes
+        self.route_repo.update(route)
+        # Fila de la ruta + el envío añadido; ABC111 no se reescribe. El recuento de ABC222 resta
+        # en su grupo anterior (que queda vacío y se borra) y crea el nuevo
+        self.assertEqual(conn.total_changes - changes_before, 2 + 3)
+        self.assertEqual(
+            sorted(self.route_repo.get_by_route_id("MAD01-BCN02-STD-001").list_shipments()), ["ABC111", "ABC222"]
+        )
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+# tests/test_statistics_service.py
+
+import unittest
+from collections import Counter
+from logistica.application.statistics_service import StatisticsService
+from logistica.application.route_service import RouteService
+from logistica.application.center_service import CenterService
+from logistica.application.shipment_service import ShipmentService
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+
+
+def brute_force(shipments, *fields):
+    """Recuento de referencia recorriendo los envíos uno a uno."""
+    getters = {
+        "status": lambda s: s.current_status,
+        "type": lambda s: s.shipment_type,
+        "priority": lambda s: s.priority,
+        "route": lambda s: s.assigned_route,
+    }
+    keys = (tuple(getters[field](s) for field in fields) for s in shipments)
+    return dict(Counter(key if len(fields) > 1 else key[0] for key in keys))
+
+
+class TestStatisticsService(unittest.TestCase):
+
+    def setUp(self):
+        self.shipment_repo = ShipmentRepositoryMemory()
+        self.center_repo = CenterRepositoryMemory()
+        self.shipment_service = ShipmentService(self.shipment_repo)
+        self.center_service = CenterService(self.center_repo, self.shipment_repo)
+        self.route_service = RouteService(RouteRepositoryMemory(), self.shipment_repo, self.center_repo)
+        self.service = StatisticsService(self.shipment_repo, self.center_repo)
+
+        self.center_service.register_center("MAD01", "Madrid", "Calle A")
+        self.center_service.register_center("BCN02", "Barcelona", "Calle B")
+        self.shipment_service.register_shipments([
+            ("STD001", "A", "B", 1, "standard"),
+            ("STD002", "A", "B", 2, "standard"),
+            ("FRG001", "A", "B", 3, "fragile"),
+            ("EXP001", "A", "B", 1, "express"),
+        ])
+        self.route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.route_service.assign_shipments_to_route("MAD01-BCN02-STD-001", ["STD001", "FRG001"])
+
+    def test_counts_follow_writes_through_services(self):
+        self.assertEqual(self.service.counts_by_status(), {"REGISTERED": 4})
+        self.assertEqual(self.service.counts_by_route(), {"MAD01-BCN02-STD-001": 2, None: 2})
+        self.assertEqual(self.service.counts_by_center(), {"MAD01": 2, "BCN02": 0})
+
+        self.route_service.dispatch_route("MAD01-BCN02-STD-001")
+        self.shipment_service.increase_shipment_priority("STD002")
+        self.assertEqual(self.service.counts_by_type(status="in_transit"), {"STANDARD": 1, "FRAGILE": 1})
+        self.assertEqual(self.service.counts_by_priority(), {3: 3, 1: 1})
+        self.assertEqual(self.service.counts_by_center(), {"MAD01": 0, "BCN02": 0})
+
+        self.route_service.complete_route("MAD01-BCN02-STD-001")
+        self.center_service.receive_shipment("EXP001", "MAD01")
+        self.assertEqual(self.service.counts_by_status(), {"DELIVERED": 2, "REGISTERED": 2})
+        self.assertEqual(self.service.counts_by_center(), {"MAD01": 1, "BCN02": 2})
+
+        shipments = self.shipment_repo.list_all()
+        for fields in (("status",), ("type",), ("route",), ("status", "type", "priority", "route")):
+            self.assertEqual(self.service.count_by(*fields), brute_force(shipments, *fields))
+
+        self.shipment_repo.remove("STD002")
+        self.assertEqual(self.service.counts_by_status(), {"DELIVERED": 2, "REGISTERED": 1})
+
+    def test_snapshot(self):
+        self.route_service.dispatch_route("MAD01-BCN02-STD-001")
+        snapshot = self.service.snapshot()
+        self.assertEqual(snapshot["total"], 4)
+        self.assertEqual(snapshot["by_status"], {"REGISTERED": 2, "IN_TRANSIT": 2})
+        self.assertEqual(snapshot["by_type"], {"STANDARD": 2, "FRAGILE": 1, "EXPRESS": 1})
+        self.assertEqual(snapshot["by_priority"], {1: 1, 2: 1, 3: 2})
+        self.assertEqual(snapshot["by_route"], {"MAD01-BCN02-STD-001": 2, None: 2})
+        self.assertEqual(snapshot["by_center"], {"MAD01": 0, "BCN02": 0})
+        self.assertEqual(snapshot["by_status_and_type"],
+                         {"IN_TRANSIT": {"STANDARD": 1, "FRAGILE": 1}, "REGISTERED": {"STANDARD": 1, "EXPRESS": 1}})
+
+    def test_invalid_fields_raise(self):
+        with self.assertRaises(ValueError):
+            self.service.count_by()
+        with self.assertRaises(ValueError):
+            self.service.count_by("status", "sender")
+
+
+if __name__ == "__main__":
+    unittest.main()